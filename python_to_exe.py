@@ -12,22 +12,55 @@
 
 import sys
 import os
+import ast
 import json
+import re
+import shlex
+import struct
+import time
+import shutil
+import sqlite3
+import hashlib
+import importlib.util
+import mmap
+import marshal
+import zipfile
+import argparse
 import subprocess
+import tempfile
 import threading
+import uuid
+import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 
+try:
+    import tomllib
+except ImportError:
+    tomllib = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    from packaging.specifiers import SpecifierSet, InvalidSpecifier
+except ImportError:
+    SpecifierSet = None
+
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QLabel, QPushButton, QLineEdit, QTextEdit, QFileDialog,
     QComboBox, QCheckBox, QGroupBox, QTabWidget, QListWidget,
     QListWidgetItem, QProgressBar, QMessageBox, QFrame,
     QSplitter, QToolButton, QMenu, QAction, QStatusBar,
-    QGridLayout, QSpinBox, QDialog, QDialogButtonBox
+    QGridLayout, QSpinBox, QDialog, QDialogButtonBox, QScrollArea,
+    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer
-from PyQt5.QtGui import QFont, QIcon, QColor, QPalette, QPixmap
+from PyQt5.QtGui import QFont, QIcon, QColor, QPalette, QPixmap, QPainter, QPen
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -40,14 +73,39 @@ DEVELOPER = "عبدالكريم العبود"
 EMAIL = "abo.saleh.g@gmail.com"
 COPYRIGHT = "© 2025 [Python to EXE] - All Rights Reserved"
 
+# الموقع القديم لملف الإعدادات (المجلد الحالي) - يُنقل تلقائياً إلى مجلد بيانات التطبيق
 SETTINGS_FILE = "py2exe_settings.json"
 
+
+def get_app_data_dir():
+    """مجلد بيانات البرنامج الخاص بالمستخدم"""
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~\\AppData\\Local")
+    elif sys.platform == "darwin":
+        base = os.path.expanduser("~/Library/Application Support")
+    else:
+        base = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    return os.path.join(base, "py2exe")
+
+
+APP_DATA_DIR = get_app_data_dir()
+
+# إعدادات الواجهة: مسار ثابت لكل مستخدم، والكتابة مؤجلة بهذه المدة (ثوانٍ)
+SETTINGS_PATH = os.path.join(APP_DATA_DIR, "settings.json")
+SETTINGS_SAVE_DELAY = 0.5
+
+# طبقات التشغيل المشتركة (وضع المجلد)
+RUNTIME_LAYERS_DIR = os.path.join(APP_DATA_DIR, "runtime_layers")
+RUNTIME_MANIFEST = "runtime_layer.json"
+
 # القوالب الجاهزة
 TEMPLATES = {
     "تطبيق GUI (PyQt5/Tkinter)": {
         "windowed": True,
         "onefile": True,
         "hidden_imports": ["PyQt5", "PyQt5.QtWidgets", "PyQt5.QtCore", "PyQt5.QtGui"],
+        "match": ["PyQt5"],
+        "prune_payload": True,
         "description": "مناسب لتطبيقات الواجهة الرسومية"
     },
     "تطبيق Console": {
@@ -60,18 +118,24 @@ TEMPLATES = {
         "windowed": False,
         "onefile": False,
         "hidden_imports": ["flask", "jinja2", "werkzeug"],
+        "match": ["flask"],
         "description": "مناسب لتطبيقات الويب"
     },
     "تطبيق بيانات (Pandas/NumPy)": {
         "windowed": False,
         "onefile": True,
         "hidden_imports": ["pandas", "numpy", "openpyxl"],
+        "excludes": ["pandas.tests", "numpy.tests"],
+        "collect_submodules": ["pandas._libs"],
+        "match": ["pandas"],
+        "prune_payload": True,
         "description": "مناسب لتطبيقات معالجة البيانات"
     },
     "لعبة (Pygame)": {
         "windowed": True,
         "onefile": False,
         "hidden_imports": ["pygame"],
+        "match": ["pygame"],
         "description": "مناسب للألعاب"
     },
     "إعدادات مخصصة": {
@@ -82,6 +146,5598 @@ TEMPLATES = {
     }
 }
 
+# ملفات تعريف المستخدم (JSON أو TOML) - تُضاف إلى القوالب الجاهزة
+PROFILES_DIR = os.path.join(APP_DATA_DIR, "profiles")
+
+# القوائم التي يضيفها ملف التعريف إلى الإعدادات عند تطابقه مع استيرادات المشروع
+PROFILE_LIST_KEYS = ("hidden_imports", "excludes", "collect_submodules", "hookspath")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# بناء الأمر من الإعدادات
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build_command_from_config(config):
+    """بناء أمر أداة التجميد المختارة من قاموس الإعدادات"""
+    source = config.get("source", "")
+
+    if not source or not os.path.isfile(source):
+        return None, "اختر ملف المصدر أولاً!"
+
+    for level, msg in check_backend_config(config):
+        if level == "error":
+            return None, msg
+    return get_backend(config).build_command(config)
+
+
+def build_pyinstaller_command(config):
+    """بناء أمر PyInstaller من قاموس الإعدادات"""
+    source = config.get("source", "")
+
+    # ملف .spec يحدده المستخدم
+    if config.get("spec_file"):
+        if not os.path.isfile(config["spec_file"]):
+            return None, f"ملف .spec غير موجود: {config['spec_file']}"
+        return build_spec_command(config, config["spec_file"]), None
+    
+    # ملف .spec مولَّد ومخزن حسب بصمة الإعدادات (ضروري لعدة نقاط دخول)
+    spec_compatible = is_spec_compatible(config)
+    needs_spec = (
+        config.get("extra_entries") or get_archive_mode(config) != "compressed"
+        or config.get("prune_payload") or config.get("analysis_cache")
+    )
+    if needs_spec and not spec_compatible:
+        return None, (
+            "الأوامر الإضافية تحتوي خيارات لا تعمل مع نقاط الدخول المتعددة أو وضع الأرشيف "
+            "أو تقليم الملحقات أو ذاكرة التحليل (ملف .spec)"
+        )
+    if needs_spec or (config.get("use_spec", True) and spec_compatible):
+        return build_spec_command(config, write_spec(config)), None
+
+    cmd = [sys.executable, "-m", "PyInstaller"]
+
+    # الخيارات الأساسية
+    if config.get("onefile", True):
+        cmd.append("--onefile")
+
+    if config.get("windowed", False):
+        cmd.append("--windowed")
+
+    if config.get("noconsole", False):
+        cmd.append("--noconsole")
+
+    if config.get("clean", True):
+        cmd.append("--clean")
+
+    if config.get("noconfirm", True):
+        cmd.append("--noconfirm")
+
+    if config.get("strip", False):
+        cmd.append("--strip")
+
+    # اسم الملف
+    if config.get("output_name"):
+        cmd.extend(["--name", config["output_name"]])
+
+    # الأيقونة
+    icon = config.get("icon", "")
+    if icon and os.path.isfile(icon):
+        cmd.extend(["--icon", icon])
+
+    # مجلد الإخراج (وملفات البناء في مجلد التجهيز المحلي إن فُعّل)
+    output_dir = config.get("output_dir", "")
+    if output_dir or config.get("scratch_build"):
+        cmd.extend(["--distpath", get_build_dist_dir(config)])
+        cmd.extend(["--workpath", os.path.join(get_build_root(config), "build")])
+    if output_dir:
+        cmd.extend(["--specpath", output_dir])
+
+    # الملفات الإضافية
+    sep = ";" if sys.platform == "win32" else ":"
+    for path in config.get("extra_files", []):
+        if os.path.exists(path):
+            dest = os.path.basename(path)
+            cmd.extend(["--add-data", f"{path}{sep}{dest}"])
+
+    # المكتبات المخفية
+    for imp in config.get("hidden_imports", []):
+        cmd.extend(["--hidden-import", imp])
+
+    # إضافات ملفات التعريف
+    for name in config.get("excludes", []):
+        cmd.extend(["--exclude-module", name])
+    for package in config.get("collect_submodules", []):
+        cmd.extend(["--collect-submodules", package])
+    for path in config.get("hookspath", []):
+        cmd.extend(["--additional-hooks-dir", path])
+    for path in get_runtime_hooks(config):
+        cmd.extend(["--runtime-hook", path])
+
+    # مستوى التحسين
+    opt_level = config.get("optimize", 0)
+    if opt_level > 0:
+        cmd.append(f"-O{opt_level}")
+
+    # UPX
+    if config.get("upx", False):
+        cmd.append("--upx-dir=upx")
+        if config.get("upx_level", 0) > 0:
+            cmd.append(f"--upx-level={config['upx_level']}")
+    else:
+        cmd.append("--noupx")
+
+    # أوامر إضافية
+    if config.get("extra_args"):
+        cmd.extend(shlex.split(config["extra_args"], posix=sys.platform != "win32"))
+
+    # ملف المصدر
+    cmd.append(source)
+
+    return cmd, None
+
+
+def get_work_dir(config):
+    """مجلد العمل الذي يُشغَّل منه PyInstaller"""
+    return config.get("output_dir") or os.path.dirname(config.get("source", ""))
+
+
+def get_app_name(config):
+    """اسم التطبيق الناتج (كما يسميه PyInstaller)"""
+    name = config.get("output_name")
+    if name:
+        return name
+    return os.path.splitext(os.path.basename(config.get("source", "")))[0]
+
+
+def get_dist_dir(config):
+    """مجلد dist النهائي للناتج"""
+    return os.path.join(get_work_dir(config), "dist")
+
+
+def get_build_root(config):
+    """المجلد الذي تُكتب فيه build و dist أثناء البناء: مجلد العمل أو مجلد التجهيز المحلي"""
+    if config.get("scratch_build"):
+        return get_staging_dir(config)
+    return get_work_dir(config)
+
+
+def get_build_dist_dir(config):
+    """مجلد dist الذي تكتب فيه أداة التجميد (يُنقل منه الناتج عند التجهيز المحلي)"""
+    return os.path.join(get_build_root(config), "dist")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# توليد ملف .spec
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# يتغير عند تعديل قالب الملف حتى لا تُستخدم ملفات مولدة بقالب قديم
+SPEC_FORMAT_VERSION = 6
+
+# مفاتيح الإعدادات التي يعتمد عليها محتوى ملف .spec
+SPEC_KEYS = (
+    "source", "extra_entries", "output_name", "onefile", "windowed", "noconsole",
+    "strip", "upx", "icon", "extra_files", "hidden_imports", "optimize",
+    "excludes", "extra_datas", "extra_binaries", "collect_submodules", "hookspath",
+    "import_profile", "lazy_modules", "archive_mode", "prune_payload", "prune_languages",
+    "prune_keep", "payload_usage", "cached_toc",
+)
+
+# الخيارات التي يقبلها PyInstaller مع ملف .spec (البقية خاصة بتوليد الملف)
+SPEC_ALLOWED_ARGS = {
+    "--distpath", "--workpath", "--noconfirm", "-y", "--upx-dir",
+    "--clean", "--log-level", "--ascii", "-a",
+}
+
+# طريقة تخزين وحدات Python في الناتج: الضغط يصغّر الحجم، وفك ضغط كل وحدة عند
+# استيرادها يبطئ التشغيل في التطبيقات التي تستورد آلاف الوحدات
+ARCHIVE_MODES = {
+    "compressed": "مضغوط (zlib 6)",
+    "fast": "ضغط سريع (zlib 1)",
+    "stored": "مخزن دون ضغط",
+    "loose": "ملفات منفصلة دون أرشيف",
+}
+
+# مستوى zlib لأرشيفات PyInstaller في كل وضع (None = الافتراضي)
+ARCHIVE_ZLIB_LEVELS = {"fast": 1, "stored": 0}
+
+# يُنفَّذ داخل ملف .spec قبل بناء الأرشيفات (الاسم يختلف بين إصدارات PyInstaller).
+# إصدار لا يحمل أياً من الاسمين يوقف البناء بدلاً من إخراج أرشيف بالضغط الافتراضي بصمت
+SPEC_ARCHIVE_BLOCK = """
+import sys
+import PyInstaller.archive.writers as archive_writers
+archive_unpatched = []
+for writer in (archive_writers.ZlibArchiveWriter, archive_writers.CArchiveWriter):
+    for attribute in ("_COMPRESSION_LEVEL", "COMPRESSION_LEVEL"):
+        if hasattr(writer, attribute):
+            setattr(writer, attribute, {level!r})
+            break
+    else:
+        archive_unpatched.append(writer.__name__)
+if len(archive_unpatched) == 2:
+    raise SystemExit("❌ وضع الأرشيف غير مدعوم في إصدار PyInstaller هذا: لا يوجد مستوى ضغط قابل للتعديل")
+if archive_unpatched:
+    print("⚠️ تعذر ضبط مستوى الضغط في: " + ", ".join(archive_unpatched), file=sys.stderr)
+"""
+
+# مدخلات ذاكرة التحليل للحزم المستثناة من Analysis
+SPEC_CACHE_BLOCK = """
+for name, path, typecode in {toc!r}:
+    if typecode == "PYMODULE":
+        a.pure.append((name, path, typecode))
+    elif typecode == "DATA":
+        a.datas.append((name, path, typecode))
+    else:
+        a.binaries.append((name, path, typecode))
+"""
+
+SPEC_HEADER = """# -*- mode: python ; coding: utf-8 -*-
+# مولَّد بواسطة {app} v{version} - يمكن تعديله، وسيُستخدم كما هو في البناءات التالية
+# config-hash: {config_hash}
+# content-hash: {content_hash}
+"""
+
+SPEC_BODY_PREFIX = """import os
+from PyInstaller.utils.hooks import collect_submodules
+"""
+
+# تحليل واحد مشترك لكل نقاط الدخول، ثم ملف تنفيذي لكل نقطة دخول يحمل
+# خطافات التشغيل المشتركة وسكربته فقط
+SPEC_TEMPLATE = """
+entries = {entries!r}
+
+a = Analysis(
+    [script for name, script in entries],
+    pathex={pathex!r},
+    binaries={binaries!r},
+    datas={datas!r},
+    hiddenimports={hiddenimports!r} + [
+        name for package in {collect_submodules!r} for name in collect_submodules(package)
+    ],
+    hookspath={hookspath!r},
+    hooksconfig={{}},
+    runtime_hooks={runtime_hooks!r},
+    excludes={excludes!r},
+    noarchive={noarchive!r},
+)
+{cache_block}{archive_block}{prune_block}pyz = PYZ(a.pure)
+
+entry_scripts = {{os.path.splitext(os.path.basename(script))[0] for name, script in entries}}
+common_scripts = [s for s in a.scripts if s[0] not in entry_scripts]
+options = {options!r}
+
+exes = []
+for name, script in entries:
+    script_name = os.path.splitext(os.path.basename(script))[0]
+    scripts = common_scripts + [s for s in a.scripts if s[0] == script_name]
+{exe_block}
+"""
+
+SPEC_ONEFILE_EXE = """    exes.append(EXE(
+        pyz,
+        scripts,
+        options,
+        a.binaries,
+        a.datas,
+        [],
+        name=name,
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip={strip!r},
+        upx={upx!r},
+        upx_exclude=[],
+        runtime_tmpdir=None,
+        console={console!r},
+        disable_windowed_traceback=False,
+        icon={icon!r},
+    ))
+"""
+
+SPEC_ONEDIR_EXE = """    exes.append(EXE(
+        pyz,
+        scripts,
+        options,
+        exclude_binaries=True,
+        name=name,
+        debug=False,
+        bootloader_ignore_signals=False,
+        strip={strip!r},
+        upx={upx!r},
+        console={console!r},
+        disable_windowed_traceback=False,
+        icon={icon!r},
+    ))
+
+coll = COLLECT(
+    *exes,
+    a.binaries,
+    a.datas,
+    strip={strip!r},
+    upx={upx!r},
+    upx_exclude=[],
+    name={app_name!r},
+)
+"""
+
+
+def get_entries(config):
+    """نقاط الدخول: (اسم الملف التنفيذي، السكربت) - الأولى هي ملف المصدر"""
+    entries = [(get_app_name(config), config.get("source", ""))]
+    for script in config.get("extra_entries", []):
+        entries.append((os.path.splitext(os.path.basename(script))[0], script))
+    return entries
+
+
+def generate_spec(config):
+    """توليد محتوى ملف .spec من الإعدادات"""
+    entries = [(name, os.path.abspath(script)) for name, script in get_entries(config)]
+    pathex = sorted({os.path.dirname(script) for name, script in entries})
+    datas, icon = get_spec_files(config)
+    datas += [tuple(item) for item in config.get("extra_datas", [])]
+    binaries = [tuple(item) for item in config.get("extra_binaries", [])]
+    
+    values = {
+        "strip": bool(config.get("strip", False)),
+        "upx": bool(config.get("upx", False)),
+        "console": not (config.get("windowed", False) or config.get("noconsole", False)),
+        "icon": icon,
+        "app_name": get_app_name(config),
+    }
+    template = SPEC_ONEFILE_EXE if config.get("onefile", True) else SPEC_ONEDIR_EXE
+    archive_mode = get_archive_mode(config)
+    level = ARCHIVE_ZLIB_LEVELS.get(archive_mode)
+    prune = config.get("prune_payload", False)
+    cached_toc = [tuple(item) for item in config.get("cached_toc", [])]
+    
+    body = SPEC_BODY_PREFIX + SPEC_TEMPLATE.format(
+        entries=entries,
+        pathex=pathex,
+        binaries=binaries,
+        datas=datas,
+        hiddenimports=sorted(set(config.get("hidden_imports", []))),
+        excludes=sorted(set(config.get("excludes", []))),
+        collect_submodules=sorted(set(config.get("collect_submodules", []))),
+        hookspath=[os.path.abspath(path) for path in config.get("hookspath", [])],
+        runtime_hooks=get_runtime_hooks(config),
+        options=[("O", None, "OPTION")] * config.get("optimize", 0),
+        noarchive=archive_mode == "loose",
+        cache_block=SPEC_CACHE_BLOCK.format(toc=cached_toc) if cached_toc else "",
+        archive_block=SPEC_ARCHIVE_BLOCK.format(level=level) if level is not None else "",
+        prune_block=SPEC_PRUNE_BLOCK.format(plan=get_prune_plan(config)) if prune else "",
+        exe_block=template.format(**values),
+    )
+    header = SPEC_HEADER.format(
+        app=APP_NAME, version=APP_VERSION,
+        config_hash=get_spec_hash(config),
+        content_hash=hashlib.sha256(body.encode("utf-8")).hexdigest()[:16],
+    )
+    return header + body
+
+
+def get_spec_files(config):
+    """الملفات الإضافية والأيقونة الموجودة فعلاً (ما يدخل ملف .spec منها)"""
+    datas = [
+        (os.path.abspath(path), os.path.basename(path))
+        for path in config.get("extra_files", []) if os.path.exists(path)
+    ]
+    icon = config.get("icon", "")
+    icon = [os.path.abspath(icon)] if icon and os.path.isfile(icon) else None
+    return datas, icon
+
+
+def get_archive_mode(config):
+    """وضع أرشيف الوحدات (مضغوط افتراضياً)"""
+    mode = config.get("archive_mode") or "compressed"
+    return mode if mode in ARCHIVE_MODES else "compressed"
+
+
+def get_spec_hash(config):
+    """بصمة الإعدادات التي يعتمد عليها ملف .spec"""
+    relevant = {key: config.get(key) for key in SPEC_KEYS}
+    relevant["format"] = SPEC_FORMAT_VERSION
+    # ملف إضافي أو أيقونة تظهر بعد أول بناء تغيّر محتوى الملف فتغيّر بصمته
+    relevant["files"] = get_spec_files(config)
+    # الخطة تتغير بتغير نصوص المشروع أيضاً فلا يُعاد استخدام ملف .spec قديم
+    if config.get("prune_payload"):
+        relevant["prune_plan"] = get_prune_plan(config)
+    data = json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:12]
+
+
+def get_spec_path(config):
+    """مسار ملف .spec المولَّد (مُرقّم ببصمة الإعدادات)"""
+    return os.path.join(
+        get_work_dir(config), "specs", f"{get_app_name(config)}-{get_spec_hash(config)}.spec"
+    )
+
+
+def is_spec_edited(spec_path):
+    """هل عُدِّل ملف .spec يدوياً بعد توليده (أو لم يولده البرنامج أصلاً)"""
+    with open(spec_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+    match = re.search(r"^# content-hash: (\w+)\n", content, re.MULTILINE)
+    if not match:
+        return True
+    body = content[match.end():]
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()[:16] != match.group(1)
+
+
+def is_spec_compatible(config):
+    """هل يمكن تمرير الأوامر الإضافية مع ملف .spec"""
+    try:
+        args = shlex.split(config.get("extra_args", ""), posix=sys.platform != "win32")
+    except ValueError:
+        return False
+    return all(
+        arg.split("=")[0] in SPEC_ALLOWED_ARGS
+        for arg in args if arg.startswith("-")
+    )
+
+
+def build_spec_command(config, spec_path):
+    """أمر PyInstaller لبناء ملف .spec (الخيارات المسموحة مع ملفات spec فقط)"""
+    cmd = [sys.executable, "-m", "PyInstaller"]
+    if config.get("clean", True):
+        cmd.append("--clean")
+    if config.get("noconfirm", True):
+        cmd.append("--noconfirm")
+    
+    cmd.extend(["--distpath", get_build_dist_dir(config)])
+    cmd.extend(["--workpath", os.path.join(get_build_root(config), "build")])
+    
+    if config.get("upx", False):
+        cmd.append("--upx-dir=upx")
+    
+    if config.get("extra_args"):
+        cmd.extend(shlex.split(config["extra_args"], posix=sys.platform != "win32"))
+    
+    cmd.append(spec_path)
+    return cmd
+
+
+def write_spec(config):
+    """كتابة ملف .spec وإرجاع مساره (ملف بنفس البصمة يُعاد استخدامه كما هو بتعديلاته اليدوية)"""
+    spec_path = get_spec_path(config)
+    if os.path.exists(spec_path):
+        return spec_path
+    os.makedirs(os.path.dirname(spec_path), exist_ok=True)
+    tmp_path = f"{spec_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(generate_spec(config))
+    os.replace(tmp_path, spec_path)
+    return spec_path
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# تقليم إضافات Qt وملفات البيانات غير المستخدمة
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# خطافات PyInstaller تجمع كل منصات العرض وصيغ الصور وملفات الترجمة لكل اللغات؛
+# التقليم يحذف من شجرة التجميع ما لا يستخدمه التطبيق حسب التحليل الساكن والتتبع
+PRUNE_QT_BINDINGS = ("PyQt5", "PyQt6", "PySide2", "PySide6")
+
+# فئة إضافات Qt -> وحدة Qt التي تحمّلها (تُحذف الفئة إن لم تُستورد الوحدة)
+PRUNE_QT_PLUGIN_MODULES = {
+    "sqldrivers": "QtSql",
+    "mediaservice": "QtMultimedia",
+    "audio": "QtMultimedia",
+    "playlistformats": "QtMultimedia",
+    "multimedia": "QtMultimedia",
+    "printsupport": "QtPrintSupport",
+    "position": "QtPositioning",
+    "geoservices": "QtLocation",
+    "sensors": "QtSensors",
+    "sensorgestures": "QtSensors",
+    "texttospeech": "QtTextToSpeech",
+    "bearer": "QtNetwork",
+    "networkinformation": "QtNetwork",
+    "tls": "QtNetwork",
+    "canbus": "QtSerialBus",
+    "gamepads": "QtGamepad",
+    "webview": "QtWebView",
+    "designer": "QtDesigner",
+    "qmltooling": "QtQml",
+    "sceneparsers": "Qt3DCore",
+    "renderers": "Qt3DCore",
+    "geometryloaders": "Qt3DCore",
+    "renderplugins": "Qt3DCore",
+    "assetimporters": "Qt3DCore",
+}
+
+# منصات العرض المطلوبة لكل نظام (eglfs و linuxfb و vnc للأجهزة المدمجة)
+PRUNE_QT_PLATFORMS = {
+    "win32": ["windows", "minimal", "offscreen"],
+    "darwin": ["cocoa", "minimal", "offscreen"],
+    "linux": ["xcb", "wayland", "minimal", "offscreen"],
+}
+
+# إضافة صيغة الصور -> امتدادات الملفات التي تحتاجها (PNG مدمجة في QtGui)
+PRUNE_QT_IMAGE_FORMATS = {
+    "gif": [".gif"],
+    "ico": [".ico"],
+    "jpeg": [".jpg", ".jpeg"],
+    "svg": [".svg", ".svgz"],
+    "tiff": [".tif", ".tiff"],
+    "webp": [".webp"],
+    "icns": [".icns"],
+    "tga": [".tga"],
+    "wbmp": [".wbmp"],
+    "pdf": [".pdf"],
+    "jp2": [".jp2"],
+    "macjp2": [".jp2"],
+    "macheif": [".heic", ".heif"],
+}
+
+# صيغ تحتاجها وحدة Qt نفسها مهما كانت ملفات المشروع
+PRUNE_QT_IMAGE_MODULES = {"svg": "QtSvg", "pdf": "QtPdf"}
+
+PRUNE_DEFAULT_LANGUAGES = ["ar", "en"]
+
+# نصوص في المشروع تدل على صيغ الملفات والمناطق الزمنية والمعادلات
+PRUNE_EXTENSION_RE = re.compile(r"(\.[A-Za-z0-9]{2,5})\b")
+PRUNE_ZONE_RE = re.compile(
+    r"^(?:Africa|America|Antarctica|Arctic|Asia|Atlantic|Australia|Brazil|Canada|Chile|"
+    r"Etc|Europe|Indian|Mexico|Pacific|US)/[A-Za-z0-9_+\-/]+$"
+)
+PRUNE_MATHTEXT_RE = re.compile(r"\$[^$\n]+\$")
+
+# استخدام يختار المنطقة الزمنية أثناء التشغيل فلا تُقلَّم بيانات tzdata
+PRUNE_TZ_DYNAMIC_NAMES = {
+    "available_timezones", "all_timezones", "all_timezones_set",
+    "common_timezones", "common_timezones_set", "get_localzone",
+}
+PRUNE_TZ_DYNAMIC_MODULES = {"tzlocal"}
+
+PRUNE_VECTOR_EXTENSIONS = {".pdf", ".ps", ".eps", ".pgf"}
+
+# يُنفَّذ داخل ملف .spec بعد التحليل: يحذف مدخلات a.binaries و a.datas غير
+# المستخدمة ويكتب تقرير الحجم قبل التقليم وبعده بجانب warn-<name>.txt
+SPEC_PRUNE_BLOCK = r"""
+import json, re, fnmatch
+prune_plan = {plan!r}
+
+prune_used = set(prune_plan["modules"])
+prune_used.update(name for name, path, typecode in a.pure)
+for name, path, typecode in a.binaries:
+    if typecode == "EXTENSION":
+        parts = name.replace("\\", "/").split("/")
+        parts[-1] = parts[-1].split(".")[0]
+        prune_used.add(".".join(parts))
+prune_qt_modules = set(
+    name.split(".")[1] for name in prune_used
+    if "." in name and name.split(".")[0] in prune_plan["qt_bindings"]
+)
+prune_extensions = set(prune_plan["extensions"])
+prune_files = set(prune_plan["files"])
+
+def prune_image_needed(fmt):
+    if prune_plan["image_modules"].get(fmt) in prune_qt_modules:
+        return True
+    return fmt not in prune_plan["image_formats"] or bool(prune_extensions & set(prune_plan["image_formats"][fmt]))
+
+def prune_platform_kept(name):
+    platforms = prune_plan["platforms"]
+    return not platforms or any(name == p or name.startswith(p + "-") for p in platforms)
+
+def prune_qt_reason(parts, lower):
+    file_name = lower[-1]
+    if file_name.startswith("qtwebengine") or file_name == "icudtl.dat" or "qtwebengine_locales" in lower:
+        return None if any(m.startswith("QtWebEngine") for m in prune_qt_modules) else "qt-webengine"
+    if "plugins" in lower[:-2]:
+        category = lower[lower.index("plugins") + 1]
+        stem = re.sub(r"^(lib)?q", "", file_name.split(".")[0])
+        if category == "platforms":
+            return None if prune_platform_kept(stem) else "qt-platforms"
+        if category.startswith("wayland"):
+            return None if prune_platform_kept("wayland") else "qt-platforms"
+        if category == "xcbglintegrations":
+            return None if prune_platform_kept("xcb") else "qt-platforms"
+        if category == "egldeviceintegrations":
+            return None if prune_platform_kept("eglfs") else "qt-platforms"
+        if category == "imageformats":
+            return None if prune_image_needed(stem) else "qt-imageformats"
+        if category == "iconengines" and stem.startswith("svg"):
+            return None if prune_image_needed("svg") else "qt-imageformats"
+        module = prune_plan["plugin_modules"].get(category)
+        return "qt-plugins" if module and module not in prune_qt_modules else None
+    if "translations" in lower[:-1]:
+        match = re.search(r"_([a-z]{{2,3}})(_[a-z]{{2}})?\.qm$", file_name)
+        return "qt-translations" if match and match.group(1) not in prune_plan["languages"] else None
+    if "qml" in lower[:-1] and not prune_qt_modules & set(["QtQml", "QtQuick"]):
+        return "qt-qml"
+    return None
+
+def prune_reason(dest):
+    parts = dest.replace("\\", "/").split("/")
+    lower = [part.lower() for part in parts]
+    if parts[0] in prune_plan["qt_bindings"]:
+        return prune_qt_reason(parts, lower)
+    if lower[0] in ("tzdata", "pytz") and "zoneinfo" in lower[:-1] and prune_plan["prune_zones"]:
+        zone = "/".join(parts[lower.index("zoneinfo") + 1:])
+        if "/" in zone and not zone.startswith("Etc/") and zone not in prune_plan["zones"] and not zone.endswith(".py"):
+            return "tzdata"
+    if lower[0] == "matplotlib" and "mpl-data" in lower[:-1]:
+        folder = lower[lower.index("mpl-data") + 1:-1]
+        if folder[:1] == ["sample_data"]:
+            return "matplotlib-data"
+        if folder[:2] in (["fonts", "afm"], ["fonts", "pdfcorefonts"]) and not prune_plan["vector_output"]:
+            return "matplotlib-fonts"
+        if folder[:2] == ["fonts", "ttf"] and not lower[-1].startswith("dejavu") and not prune_plan["mathtext"]:
+            return "matplotlib-fonts"
+    return None
+
+def prune_size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+def prune_totals(*tocs):
+    return [sum(len(toc) for toc in tocs), sum(prune_size(entry[1]) for toc in tocs for entry in toc)]
+
+prune_removed = dict()
+prune_protected = [0]
+
+def prune_toc(toc):
+    kept = []
+    for entry in toc:
+        dest = entry[0].replace("\\", "/")
+        reason = prune_reason(dest)
+        if reason and (any(fnmatch.fnmatch(dest, p) for p in prune_plan["keep"])
+                       or (prune_files and os.path.realpath(entry[1]) in prune_files)):
+            prune_protected[0] += 1
+            reason = None
+        if reason is None:
+            kept.append(entry)
+            continue
+        stats = prune_removed.setdefault(reason, [0, 0])
+        stats[0] += 1
+        stats[1] += prune_size(entry[1])
+    return type(toc)(kept)
+
+prune_before = prune_totals(a.binaries, a.datas)
+a.binaries = prune_toc(a.binaries)
+a.datas = prune_toc(a.datas)
+with open(os.path.join(workpath, "prune-" + specnm + ".json"), "w", encoding="utf-8") as prune_file:
+    json.dump(dict(
+        before=prune_before, after=prune_totals(a.binaries, a.datas), removed=prune_removed,
+        protected=prune_protected[0], qt_modules=sorted(prune_qt_modules),
+    ), prune_file, indent=2)
+"""
+
+
+def get_prune_languages(config):
+    """لغات ترجمات Qt التي تبقى في الناتج"""
+    languages = config.get("prune_languages") or PRUNE_DEFAULT_LANGUAGES
+    return sorted({
+        language.strip().lower().replace("-", "_").split("_")[0]
+        for language in languages if language.strip()
+    })
+
+
+def get_prune_data_names(config):
+    """أسماء ملفات البيانات المضافة للمشروع (للتعرف على صيغ الصور المطلوبة)"""
+    paths = list(config.get("extra_files", [])) + [item[0] for item in config.get("extra_datas", [])]
+    names = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                names.extend(files)
+        else:
+            names.append(os.path.basename(path))
+    return names
+
+
+# تحليل PyInstaller نفسه يُضاف داخل ملف .spec
+def get_prune_plan(config):
+    """خطة التقليم: القواعد وما يستخدمه التطبيق حسب التحليل الساكن ونتيجة التتبع"""
+    modules = set()
+    literals = []
+    names = set()
+    for path, tree, imports in iter_project_trees(config):
+        modules.update(imports)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Constant) and isinstance(node.value, str):
+                literals.append(node.value)
+            elif isinstance(node, ast.Name):
+                names.add(node.id)
+            elif isinstance(node, ast.Attribute):
+                names.add(node.attr)
+            elif isinstance(node, ast.keyword) and node.arg:
+                names.add(node.arg)
+    usage = config.get("payload_usage") or {}
+    modules.update(usage.get("modules", []))
+    
+    extensions = set()
+    for text in literals + get_prune_data_names(config):
+        extensions.update(ext.lower() for ext in PRUNE_EXTENSION_RE.findall(text))
+    dynamic_tz = bool(names & PRUNE_TZ_DYNAMIC_NAMES) or any(
+        module.split(".")[0] in PRUNE_TZ_DYNAMIC_MODULES for module in modules
+    )
+    platform = "linux" if sys.platform.startswith("linux") else sys.platform
+    return {
+        "qt_bindings": list(PRUNE_QT_BINDINGS),
+        "plugin_modules": PRUNE_QT_PLUGIN_MODULES,
+        "platforms": PRUNE_QT_PLATFORMS.get(platform, []),
+        "image_formats": PRUNE_QT_IMAGE_FORMATS,
+        "image_modules": PRUNE_QT_IMAGE_MODULES,
+        "languages": get_prune_languages(config),
+        "keep": list(config.get("prune_keep", [])),
+        "modules": sorted(modules),
+        "files": sorted(usage.get("files", [])),
+        "extensions": sorted(extensions),
+        "zones": sorted({text for text in literals if PRUNE_ZONE_RE.match(text)}),
+        "prune_zones": not dynamic_tz,
+        "mathtext": "usetex" in names or any(
+            PRUNE_MATHTEXT_RE.search(text) or "usetex" in text for text in literals
+        ),
+        "vector_output": bool(extensions & PRUNE_VECTOR_EXTENSIONS) or "PdfPages" in names,
+    }
+
+
+def format_prune_report(report, onefile):
+    """أسطر تقرير التقليم: عدد الملفات والحجم قبل وبعد، والمحذوف حسب الفئة"""
+    mb = 1024 * 1024
+    (files_before, bytes_before), (files_after, bytes_after) = report["before"], report["after"]
+    lines = [
+        f"\n✂️ تقليم الملحقات: {files_before} → {files_after} ملف، "
+        f"{bytes_before / mb:.1f} → {bytes_after / mb:.1f} MB "
+        f"(-{(bytes_before - bytes_after) / mb:.1f} MB)"
+    ]
+    for reason, (count, size) in sorted(report["removed"].items(), key=lambda item: -item[1][1]):
+        lines.append(f"   {reason:<20} {count:>6} ملف {size / mb:>9.1f} MB")
+    if report.get("protected"):
+        lines.append(f"   أُبقي {report['protected']} ملف لأن التتبع استخدمها أو تطابق أنماط الإبقاء")
+    if onefile:
+        lines.append(
+            f"   ⏱️ الملف الواحد يستخرج عند كل تشغيل {files_after} ملف بدل {files_before} "
+            f"({bytes_after / mb:.1f} MB بدل {bytes_before / mb:.1f} MB)"
+        )
+    lines.append("   لقياس زمن التشغيل قبل التقليم وبعده فعّل «قبل/بعد التقليم» في مقارنة أدوات التجميد")
+    return lines
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ملفات التعريف (القوالب) ومطابقتها مع استيرادات المشروع
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def read_profile_file(path):
+    """قراءة ملف تعريف واحد (JSON أو TOML) - قد يحتوي تعريفاً واحداً أو قائمة profiles"""
+    if path.endswith(".toml"):
+        if tomllib is None:
+            raise ValueError("ملفات TOML تتطلب Python 3.11+")
+        with open(path, 'rb') as f:
+            data = tomllib.load(f)
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    
+    items = data.get("profiles", [data]) if isinstance(data, dict) else data
+    profiles = {}
+    base_dir = os.path.dirname(os.path.abspath(path))
+    for item in items:
+        if not isinstance(item, dict) or not item.get("name"):
+            raise ValueError("كل ملف تعريف يحتاج مفتاح name")
+        profile = {
+            "windowed": bool(item.get("windowed", False)),
+            "onefile": bool(item.get("onefile", True)),
+            "prune_payload": bool(item.get("prune_payload", False)),
+            "match": [str(name) for name in item.get("match", [])],
+            "description": str(item.get("description", "")),
+        }
+        for key in PROFILE_LIST_KEYS:
+            profile[key] = [str(value) for value in item.get(key, [])]
+        # مسارات الخطافات نسبية إلى ملف التعريف
+        profile["hookspath"] = [os.path.join(base_dir, path) for path in profile["hookspath"]]
+        profiles[str(item["name"])] = profile
+    return profiles
+
+
+def load_profiles(profiles_dir=PROFILES_DIR):
+    """القوالب الجاهزة مع ملفات تعريف المستخدم: (التعريفات، أخطاء القراءة)"""
+    profiles = {name: dict(template) for name, template in TEMPLATES.items()}
+    errors = []
+    if not os.path.isdir(profiles_dir):
+        return profiles, errors
+    
+    for file_name in sorted(os.listdir(profiles_dir)):
+        if not file_name.endswith((".json", ".toml")):
+            continue
+        try:
+            profiles.update(read_profile_file(os.path.join(profiles_dir, file_name)))
+        except (OSError, ValueError) as e:
+            errors.append(f"{file_name}: {e}")
+    return profiles, errors
+
+
+def build_profile_index(profiles):
+    """فهرس عكسي: اسم الوحدة المستوردة -> أسماء التعريفات التي تطابقها"""
+    index = {}
+    for name, profile in profiles.items():
+        for module in profile.get("match", []):
+            index.setdefault(module, []).append(name)
+    return index
+
+
+# يُبحث عن كل بادئة من اسم الوحدة (a و a.b و a.b.c) في الفهرس،
+# فلا تتأثر السرعة بعدد التعريفات
+def match_profiles(index, imports):
+    """التعريفات المطابقة لمجموعة استيرادات"""
+    matched = set()
+    for module in imports:
+        parts = module.split(".")
+        for i in range(1, len(parts) + 1):
+            matched.update(index.get(".".join(parts[:i]), ()))
+    return sorted(matched)
+
+
+def iter_project_trees(config):
+    """ملفات المشروع تباعاً من نقاط الدخول ووحداتها المحلية: (المسار، الشجرة، الاستيرادات)"""
+    visited = set()
+    pending = [os.path.abspath(script) for name, script in get_entries(config)]
+    while pending:
+        path = pending.pop()
+        if path in visited or not os.path.isfile(path):
+            continue
+        visited.add(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                tree = ast.parse(f.read(), filename=path)
+        except (OSError, SyntaxError, UnicodeDecodeError, ValueError):
+            continue
+        
+        imports = get_source_imports(tree)
+        yield path, tree, imports
+        base_dir = os.path.dirname(path)
+        for module in imports:
+            local = os.path.join(base_dir, *module.split("."))
+            pending.append(local + ".py")
+            pending.append(os.path.join(local, "__init__.py"))
+
+
+def get_project_imports(config):
+    """رسم الاستيرادات الساكن للمشروع"""
+    imports = set()
+    for path, tree, file_imports in iter_project_trees(config):
+        imports.update(file_imports)
+    return imports
+
+
+def apply_profile(config, profile):
+    """نسخة من الإعدادات مضافاً إليها قوائم ملف التعريف بلا تكرار"""
+    merged = dict(config)
+    for key in PROFILE_LIST_KEYS:
+        values = list(config.get(key, []))
+        seen = set(values)
+        for value in profile.get(key, []):
+            if value not in seen:
+                seen.add(value)
+                values.append(value)
+        merged[key] = values
+    return merged
+
+
+def resolve_profiles(config, profiles=None):
+    """تطبيق التعريفات المختارة والمطابقة للمشروع: (الإعدادات، أسماء المطابقة تلقائياً)"""
+    if profiles is None:
+        profiles, errors = load_profiles()
+    matched = []
+    if config.get("auto_profiles", True):
+        matched = match_profiles(build_profile_index(profiles), get_project_imports(config))
+    
+    names = list(config.get("profiles", []))
+    names += [name for name in matched if name not in names]
+    for name in names:
+        if name in profiles:
+            config = apply_profile(config, profiles[name])
+    return config, matched
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# طبقة التشغيل المشتركة
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def file_sha256(path):
+    """حساب بصمة SHA-256 لملف"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_runtime_layer_id(python_exe):
+    """معرّف نسخة طبقة التشغيل: إصدار بايثون + المنصة + إصدار PyInstaller"""
+    code = (
+        "import sys, platform, PyInstaller;"
+        "print('py%d%d-%s-%s-pyi%s' % (sys.version_info[0], sys.version_info[1], "
+        "sys.platform, platform.machine().lower(), PyInstaller.__version__))"
+    )
+    result = subprocess.run(
+        [python_exe, "-c", code],
+        capture_output=True, text=True, check=True
+    )
+    return result.stdout.strip()
+
+
+def load_layer_index(layer_dir):
+    """فهرس بصمات ملفات الطبقة (لتجنب إعادة حسابها)"""
+    return read_json_file(os.path.join(layer_dir, "layer_index.json"), {})
+
+
+def save_layer_index(layer_dir, index):
+    """حفظ فهرس بصمات الطبقة"""
+    write_json_atomic(os.path.join(layer_dir, "layer_index.json"), index)
+
+
+# الملفات التنفيذية والملفات الخاصة بالتطبيق تبقى، وكل ملف آخر يُنقل إلى الطبقة أو يُحذف
+# إن كانت فيها نسخة مطابقة (والمختلف يبقى داخل التطبيق)، ثم يُكتب بيان يشير إلى الطبقة
+def extract_runtime_layer(app_dir, layers_root, layer_id, exe_names, keep=()):
+    """نقل الملفات المشتركة من مجلد التطبيق إلى طبقة التشغيل المشتركة"""
+    layer_dir = os.path.join(layers_root, layer_id)
+    os.makedirs(layer_dir, exist_ok=True)
+    exe_files = set(exe_names) | {name + ".exe" for name in exe_names}
+    manifest_files = {}
+    stats = {"shared": 0, "added": 0, "kept": 0, "shared_bytes": 0}
+
+    # بناءان متوازيان يشتركان في الطبقة: القراءة والنقل والحفظ تحت قفل واحد
+    # وإلا ضاعت إضافات أحدهما من الفهرس أو نُقل ملف فوق آخر
+    with FileLock(os.path.join(layer_dir, ".lock")):
+        index = load_layer_index(layer_dir)
+
+        for root, dirs, files in os.walk(app_dir):
+            for file_name in files:
+                path = os.path.join(root, file_name)
+                rel = os.path.relpath(path, app_dir).replace(os.sep, "/")
+
+                if rel in exe_files or rel == RUNTIME_MANIFEST:
+                    continue
+
+                parts = rel.split("/")
+                if parts[0] == "_internal":
+                    parts = parts[1:]
+                if parts[0] in keep:
+                    stats["kept"] += 1
+                    continue
+
+                digest = file_sha256(path)
+                size = os.path.getsize(path)
+                layer_path = os.path.join(layer_dir, *rel.split("/"))
+
+                if rel in index and os.path.exists(layer_path):
+                    if index[rel] != digest:
+                        # نسخة مختلفة في الطبقة - يبقى الملف داخل التطبيق
+                        stats["kept"] += 1
+                        continue
+                    os.remove(path)
+                else:
+                    os.makedirs(os.path.dirname(layer_path), exist_ok=True)
+                    shutil.move(path, layer_path)
+                    index[rel] = digest
+                    stats["added"] += 1
+
+                manifest_files[rel] = digest
+                stats["shared"] += 1
+                stats["shared_bytes"] += size
+
+        save_layer_index(layer_dir, index)
+
+    # حذف المجلدات الفارغة
+    for root, dirs, files in os.walk(app_dir, topdown=False):
+        if root != app_dir and not os.listdir(root):
+            os.rmdir(root)
+
+    manifest = {
+        "layer_id": layer_id,
+        "layers_root": os.path.abspath(layers_root),
+        "files": manifest_files
+    }
+    write_json_atomic(os.path.join(app_dir, RUNTIME_MANIFEST), manifest)
+
+    return stats
+
+
+def link_runtime_layer(app_dir, layers_root=None):
+    """تركيب مجلد التطبيق من الطبقة بروابط صلبة أو بالنسخ: (عدد المربوطة، المفقودة)"""
+    with open(os.path.join(app_dir, RUNTIME_MANIFEST), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    layers_root = layers_root or manifest.get("layers_root") or RUNTIME_LAYERS_DIR
+    layer_dir = os.path.join(layers_root, manifest["layer_id"])
+
+    linked = 0
+    missing = []
+    for rel in manifest["files"]:
+        src = os.path.join(layer_dir, *rel.split("/"))
+        dst = os.path.join(app_dir, *rel.split("/"))
+        if os.path.exists(dst):
+            continue
+        if not os.path.exists(src):
+            missing.append(rel)
+            continue
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        try:
+            os.link(src, dst)
+        except OSError:
+            shutil.copy2(src, dst)
+        linked += 1
+
+    return linked, missing
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# حزم التحديث التفاضلية (وضع المجلد)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+DELTA_FORMAT_VERSION = 2
+
+# الملفات الأكبر من هذا الحد تُرسل كفروق على مستوى الكتل بدل الملف كاملاً
+DELTA_BLOCK_THRESHOLD = 1024 * 1024
+
+# تقسيم حسب المحتوى: حدود الكتل عند ظهور هذا التسلسل (مرة كل 64 KB تقريباً في
+# البيانات المضغوطة)، فإضافة بايتات في وسط الأرشيف لا تُزيح حدود بقية الكتل
+DELTA_CHUNK_ANCHOR = re.compile(b"\xa5\x5a")
+DELTA_MIN_CHUNK = 4 * 1024
+DELTA_MAX_CHUNK = 256 * 1024
+
+# إذا تجاوزت البيانات الجديدة هذه النسبة من حجم الملف يُرسل الملف كاملاً
+DELTA_MAX_PATCH_RATIO = 0.5
+
+# أداة التطبيق: سكربت مستقل (المكتبة القياسية فقط) يُرفق مع كل حزمة تحديث،
+# ويستخدمه البرنامج نفسه في أمر apply-delta
+DELTA_APPLY_SCRIPT = r"""
+# أداة تطبيق حزمة تحديث تفاضلية - مولَّدة بواسطة Python to EXE Converter
+# الاستخدام: python apply_delta.py <مجلد التطبيق> <حزمة التحديث.zip>
+import sys, os, json, zipfile, hashlib
+
+SUPPORTED_FORMAT = 2
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def safe_path(app_dir, rel):
+    path = os.path.normpath(os.path.join(app_dir, *rel.split("/")))
+    if os.path.commonpath([path, os.path.normpath(app_dir)]) != os.path.normpath(app_dir):
+        raise ValueError("مسار غير آمن في حزمة التحديث: %s" % rel)
+    return path
+
+
+def apply_delta(app_dir, delta_path):
+    app_dir = os.path.abspath(app_dir)
+    with zipfile.ZipFile(delta_path) as z:
+        info = json.loads(z.read("delta.json").decode("utf-8"))
+        if info.get("format", 1) > SUPPORTED_FORMAT:
+            raise ValueError("صيغة حزمة التحديث أحدث من هذه الأداة")
+        
+        # التحقق من أن كل ملف يُستبدل أو يُحذف يطابق الإصدار الذي بُنيت عليه الحزمة
+        # (None = ملف جديد لم يكن في ذلك الإصدار)، فلا يُخلط إصداران في مجلد واحد
+        for rel, expected in info["base"].items():
+            path = safe_path(app_dir, rel)
+            if expected is None:
+                if os.path.exists(path):
+                    raise ValueError("الملف %s لم يكن في الإصدار السابق - الحزمة لا تناسب هذا التطبيق" % rel)
+            elif not os.path.isfile(path) or file_sha256(path) != expected:
+                raise ValueError("الملف %s لا يطابق الإصدار السابق - الحزمة لا تناسب هذا التطبيق" % rel)
+        
+        # كتابة الملفات الجديدة بجانب القديمة ثم الاستبدال بعد نجاح الكل
+        staged = []
+        try:
+            for rel, entry in sorted(info["files"].items()):
+                path = safe_path(app_dir, rel)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp_path = path + ".delta-new"
+                with open(tmp_path, "wb") as out:
+                    if entry["type"] == "full":
+                        with z.open("files/" + rel) as src:
+                            for chunk in iter(lambda: src.read(1024 * 1024), b""):
+                                out.write(chunk)
+                    else:
+                        blob = z.read("blocks/" + rel)
+                        with open(path, "rb") as old:
+                            for op, offset, length in entry["ops"]:
+                                if op == "c":
+                                    old.seek(offset)
+                                    out.write(old.read(length))
+                                else:
+                                    out.write(blob[offset:offset + length])
+                staged.append((tmp_path, path))
+                if file_sha256(tmp_path) != entry["sha256"]:
+                    raise ValueError("فشل التحقق من الملف بعد التطبيق: %s" % rel)
+        except BaseException:
+            for tmp_path, path in staged:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            raise
+        
+        for tmp_path, path in staged:
+            os.replace(tmp_path, path)
+        for rel in info["removed"]:
+            path = safe_path(app_dir, rel)
+            if os.path.exists(path):
+                os.remove(path)
+    return len(staged), len(info["removed"])
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("الاستخدام: python apply_delta.py <مجلد التطبيق> <حزمة التحديث.zip>")
+        sys.exit(2)
+    updated, removed = apply_delta(sys.argv[1], sys.argv[2])
+    print("تم التحديث: %d ملف معدل، %d ملف محذوف" % (updated, removed))
+"""
+
+
+def get_releases_dir(config):
+    """مجلد الإصدارات: نسخة آخر إصدار وحزم التحديث"""
+    return config.get("releases_dir") or os.path.join(get_work_dir(config), "releases")
+
+
+def build_tree_manifest(root):
+    """بصمة وحجم كل ملف في مجلد (مسارات نسبية بفواصل /)"""
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for file_name in sorted(filenames):
+            path = os.path.join(dirpath, file_name)
+            rel = os.path.relpath(path, root).replace(os.sep, "/")
+            manifest[rel] = {"sha256": file_sha256(path), "size": os.path.getsize(path)}
+    return manifest
+
+
+def get_manifest_id(manifest):
+    """معرّف إصدار من بيانه"""
+    data = json.dumps({rel: entry["sha256"] for rel, entry in manifest.items()}, sort_keys=True)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:12]
+
+
+def chunk_data(data):
+    """تقسيم البيانات إلى كتل حسب المحتوى. يُرجع قائمة (الموضع، الطول)"""
+    chunks = []
+    start = 0
+    for match in DELTA_CHUNK_ANCHOR.finditer(data):
+        end = match.end()
+        if end - start < DELTA_MIN_CHUNK:
+            continue
+        while end - start > DELTA_MAX_CHUNK:
+            chunks.append((start, DELTA_MAX_CHUNK))
+            start += DELTA_MAX_CHUNK
+        chunks.append((start, end - start))
+        start = end
+    while len(data) - start > DELTA_MAX_CHUNK:
+        chunks.append((start, DELTA_MAX_CHUNK))
+        start += DELTA_MAX_CHUNK
+    if len(data) > start:
+        chunks.append((start, len(data) - start))
+    return chunks
+
+
+# الكتلة الموجودة في القديم تُنسخ منه ("c"، موضعها فيه) والبقية تُرسل ("d"، موضعها في البيانات)
+def compute_block_delta(old_path, new_path):
+    """فروق ملف على مستوى الكتل: (العمليات، البيانات الجديدة)"""
+    with open(old_path, 'rb') as old_file, open(new_path, 'rb') as new_file:
+        old = mmap.mmap(old_file.fileno(), 0, access=mmap.ACCESS_READ)
+        new = mmap.mmap(new_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            index = {}
+            for offset, length in chunk_data(old):
+                index.setdefault(hashlib.sha1(old[offset:offset + length]).digest(), offset)
+            
+            ops = []
+            blob = bytearray()
+            for offset, length in chunk_data(new):
+                piece = new[offset:offset + length]
+                old_offset = index.get(hashlib.sha1(piece).digest())
+                if old_offset is not None:
+                    last = ops[-1] if ops else None
+                    if last and last[0] == "c" and last[1] + last[2] == old_offset:
+                        last[2] += length
+                    else:
+                        ops.append(["c", old_offset, length])
+                else:
+                    last = ops[-1] if ops else None
+                    if last and last[0] == "d":
+                        last[2] += length
+                    else:
+                        ops.append(["d", len(blob), length])
+                    blob += piece
+            return ops, bytes(blob)
+        finally:
+            old.close()
+            new.close()
+
+
+def create_delta_package(new_dir, base_dir, base_manifest, new_manifest, out_path):
+    """كتابة حزمة تحديث من الإصدار السابق إلى الجديد. يُرجع إحصاءات"""
+    changed = sorted(
+        rel for rel, entry in new_manifest.items()
+        if base_manifest.get(rel, {}).get("sha256") != entry["sha256"]
+    )
+    removed = sorted(set(base_manifest) - set(new_manifest))
+    info = {
+        "format": DELTA_FORMAT_VERSION,
+        "from": get_manifest_id(base_manifest),
+        "to": get_manifest_id(new_manifest),
+        "base": {},
+        "files": {},
+        "removed": removed,
+    }
+    # بصمة كل ملف متغير أو محذوف في الإصدار السابق: أداة التطبيق ترفض أي اختلاف
+    for rel in changed + removed:
+        info["base"][rel] = base_manifest.get(rel, {}).get("sha256")
+    stats = {"changed": len(changed), "removed": len(removed), "patched": 0, "full_bytes": 0}
+    
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    tmp_path = f"{out_path}.{os.getpid()}.tmp"
+    with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_DEFLATED) as z:
+        for rel in changed:
+            new_path = os.path.join(new_dir, *rel.split("/"))
+            old_path = os.path.join(base_dir, *rel.split("/"))
+            entry = new_manifest[rel]
+            stats["full_bytes"] += entry["size"]
+            
+            if (entry["size"] >= DELTA_BLOCK_THRESHOLD and os.path.isfile(old_path)
+                    and base_manifest.get(rel, {}).get("size", 0) >= DELTA_MIN_CHUNK):
+                ops, blob = compute_block_delta(old_path, new_path)
+                if len(blob) <= entry["size"] * DELTA_MAX_PATCH_RATIO:
+                    z.writestr(f"blocks/{rel}", blob)
+                    info["files"][rel] = {"type": "patch", "sha256": entry["sha256"], "ops": ops}
+                    stats["patched"] += 1
+                    continue
+            
+            z.write(new_path, f"files/{rel}")
+            info["files"][rel] = {"type": "full", "sha256": entry["sha256"]}
+        
+        z.writestr("delta.json", json.dumps(info, ensure_ascii=False, indent=1))
+        z.writestr("apply_delta.py", DELTA_APPLY_SCRIPT.lstrip())
+    os.replace(tmp_path, out_path)
+    stats["delta_bytes"] = os.path.getsize(out_path)
+    stats["from"], stats["to"] = info["from"], info["to"]
+    return stats
+
+
+def update_release_baseline(new_dir, base_dir, base_manifest, new_manifest):
+    """جعل الإصدار الجديد هو الإصدار السابق للمقارنة التالية (نسخ الملفات المتغيرة فقط)"""
+    for rel, entry in new_manifest.items():
+        if base_manifest.get(rel, {}).get("sha256") == entry["sha256"]:
+            continue
+        target = os.path.join(base_dir, *rel.split("/"))
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        shutil.copy2(os.path.join(new_dir, *rel.split("/")), target)
+    for rel in set(base_manifest) - set(new_manifest):
+        target = os.path.join(base_dir, *rel.split("/"))
+        if os.path.exists(target):
+            os.remove(target)
+    write_json_atomic(os.path.join(os.path.dirname(base_dir), "manifest.json"), new_manifest)
+
+
+# لا يصبح الناتج أساساً للحزم التالية إلا مع "release" (إصدار منشور فعلاً على الأجهزة)
+def create_release_delta(config):
+    """حزمة تحديث من آخر إصدار منشور: (الإحصاءات أو None، هل اعتُمد الناتج إصداراً)"""
+    app_name = get_app_name(config)
+    new_dir = os.path.join(get_dist_dir(config), app_name)
+    release_root = os.path.join(get_releases_dir(config), app_name)
+    base_dir = os.path.join(release_root, "baseline")
+    base_manifest = read_json_file(os.path.join(release_root, "manifest.json"), None)
+    new_manifest = build_tree_manifest(new_dir)
+    
+    stats = None
+    if base_manifest is not None and os.path.isdir(base_dir):
+        if get_manifest_id(base_manifest) == get_manifest_id(new_manifest):
+            return {"changed": 0, "removed": 0}, False
+        out_path = os.path.join(
+            release_root, "deltas",
+            f"{app_name}-{get_manifest_id(base_manifest)}-to-{get_manifest_id(new_manifest)}.zip"
+        )
+        stats = create_delta_package(new_dir, base_dir, base_manifest, new_manifest, out_path)
+        stats["path"] = out_path
+        with open(os.path.join(release_root, "deltas", "apply_delta.py"), 'w', encoding='utf-8') as f:
+            f.write(DELTA_APPLY_SCRIPT.lstrip())
+    else:
+        base_manifest = {}
+    
+    if not config.get("release"):
+        return stats, False
+    update_release_baseline(new_dir, base_dir, base_manifest, new_manifest)
+    return stats, True
+
+
+def apply_delta(app_dir, delta_path):
+    """تطبيق حزمة تحديث على مجلد تطبيق. يُرجع (ملفات معدلة، ملفات محذوفة)"""
+    namespace = {"__name__": "apply_delta"}
+    exec(DELTA_APPLY_SCRIPT, namespace)
+    return namespace["apply_delta"](app_dir, delta_path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# التحقق قبل البناء
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# يُنفَّذ داخل مفسر البناء: يتحقق من المكتبات المخفية والأوامر الإضافية دون
+# استيراد أي حزمة (البحث عن المواصفات فقط)
+VALIDATION_PROBE = r'''
+import sys, json, io, contextlib
+import importlib.util, importlib.machinery
+
+request = json.loads(sys.stdin.read())
+result = {"missing": [], "unverified": [], "args_error": None, "pyinstaller": True}
+
+for name in request["imports"]:
+    parts = name.split(".")
+    try:
+        spec = importlib.util.find_spec(parts[0])
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None:
+        result["missing"].append(name)
+        continue
+    for part in parts[1:]:
+        locations = spec.submodule_search_locations
+        if not locations:
+            spec = None
+            break
+        spec = importlib.machinery.PathFinder.find_spec(part, list(locations))
+        if spec is None:
+            break
+    if spec is None:
+        result["unverified"].append(name)
+
+# استيراد PyInstaller.__main__ ثقيل، فلا يُستورد إلا عند وجود أوامر لفحصها
+if importlib.util.find_spec("PyInstaller") is None:
+    result["pyinstaller"] = False
+elif request["args"]:
+    try:
+        from PyInstaller.__main__ import generate_parser
+    except Exception:
+        result["pyinstaller"] = False
+    else:
+        stderr = io.StringIO()
+        try:
+            with contextlib.redirect_stderr(stderr):
+                generate_parser().parse_args(request["args"] + ["__probe__.py"])
+        except SystemExit:
+            lines = stderr.getvalue().strip().splitlines()
+            result["args_error"] = lines[-1] if lines else "?"
+
+print(json.dumps(result))
+'''
+
+# دوال الاستيراد الديناميكي التي لا يتتبعها محلل PyInstaller
+DYNAMIC_IMPORT_CALLS = {
+    "__import__", "import_module", "importlib.import_module",
+    "importlib.__import__", "load_entry_point", "iter_entry_points",
+    "entry_points", "spec_from_file_location", "iter_modules",
+}
+
+
+def get_call_name(node):
+    """الاسم المنقّط للدالة المستدعاة (مثل importlib.import_module)"""
+    func = node.func
+    parts = []
+    while isinstance(func, ast.Attribute):
+        parts.append(func.attr)
+        func = func.value
+    if isinstance(func, ast.Name):
+        parts.append(func.id)
+    return ".".join(reversed(parts))
+
+
+def find_dynamic_imports(tree):
+    """البحث عن أنماط الاستيراد الديناميكي في شجرة AST"""
+    found = []
+    for node in ast.walk(tree):
+        if not isinstance(node, ast.Call):
+            continue
+        name = get_call_name(node)
+        if name in DYNAMIC_IMPORT_CALLS or name.endswith(".import_module"):
+            first = node.args[0] if node.args else None
+            if isinstance(first, ast.Constant) and isinstance(first.value, str):
+                found.append((node.lineno, name, first.value))
+            else:
+                found.append((node.lineno, name, None))
+        elif name in ("exec", "eval") and node.args:
+            first = node.args[0]
+            if not (isinstance(first, ast.Constant) and isinstance(first.value, str)):
+                continue
+            if "import" in first.value:
+                found.append((node.lineno, name, None))
+    return found
+
+
+def check_icon_file(path):
+    """التحقق من صيغة ملف الأيقونة من ترويسته. يُرجع رسالة خطأ أو None"""
+    try:
+        with open(path, 'rb') as f:
+            header = f.read(8)
+    except OSError as e:
+        return f"تعذر قراءة الأيقونة: {e}"
+    
+    if header[:4] == b"\x00\x00\x01\x00":
+        return None
+    if header[:4] == b"icns":
+        return None if sys.platform == "darwin" else "أيقونة .icns تعمل على macOS فقط"
+    if header[:2] == b"MZ":
+        return None
+    if header[:8] == b"\x89PNG\r\n\x1a\n":
+        return "PNG"
+    return "صيغة الأيقونة غير صحيحة (المطلوب .ico)"
+
+
+def validate_config(config, python_exe=None, timings=None):
+    """فحص الإعدادات قبل البناء: قائمة (error أو warning، الرسالة)، و timings تُملأ بزمن كل فحص"""
+    problems = []
+    timings = {} if timings is None else timings
+    python_exe = python_exe or sys.executable
+    
+    # ═══ ملف المصدر ═══
+    source = config.get("source", "")
+    tree = None
+    if not source or not os.path.isfile(source):
+        problems.append(("error", "ملف المصدر غير موجود"))
+    else:
+        try:
+            with open(source, 'rb') as f:
+                tree = ast.parse(f.read(), filename=source)
+        except SyntaxError as e:
+            problems.append(("error", f"خطأ نحوي في ملف المصدر (سطر {e.lineno}): {e.msg}"))
+        except (OSError, ValueError) as e:
+            problems.append(("error", f"تعذر قراءة ملف المصدر: {e}"))
+    
+    # ═══ نقاط الدخول الإضافية ═══
+    names = {}
+    for name, script in get_entries(config)[1:]:
+        if not os.path.isfile(script):
+            problems.append(("error", f"نقطة دخول غير موجودة: {script}"))
+    for name, script in get_entries(config):
+        if name in names:
+            problems.append(("error", f"نقطتا دخول بنفس الاسم '{name}': {names[name]} و {script}"))
+        names[name] = script
+    
+    # ═══ الملفات الإضافية ═══
+    for path in config.get("extra_files", []):
+        if not os.path.exists(path):
+            problems.append(("error", f"ملف إضافي غير موجود (سيتم تجاهله بصمت): {path}"))
+    
+    # ═══ الأيقونة ═══
+    icon = config.get("icon", "")
+    if icon:
+        if not os.path.isfile(icon):
+            problems.append(("error", f"ملف الأيقونة غير موجود: {icon}"))
+        else:
+            icon_error = check_icon_file(icon)
+            if icon_error == "PNG":
+                problems.append(("warning", "الأيقونة بصيغة PNG - يتطلب تحويلها تثبيت Pillow"))
+            elif icon_error:
+                problems.append(("error", icon_error))
+    
+    # ═══ مجلد الإخراج ═══
+    output_dir = config.get("output_dir", "")
+    if output_dir and not os.path.isdir(output_dir):
+        parent = os.path.dirname(os.path.abspath(output_dir))
+        if not os.path.isdir(parent):
+            problems.append(("error", f"مجلد الإخراج غير موجود: {output_dir}"))
+    
+    # ═══ الأوامر الإضافية ═══
+    try:
+        extra_args = shlex.split(config.get("extra_args", ""), posix=sys.platform != "win32")
+    except ValueError as e:
+        extra_args = []
+        problems.append(("error", f"الأوامر الإضافية غير صالحة: {e}"))
+    
+    # ═══ المكتبات المخفية + الأوامر (داخل مفسر البناء) ═══
+    # محلل أوامر PyInstaller لا يصلح لفحص أوامر الأدوات الأخرى
+    is_pyinstaller = get_backend(config).name == "pyinstaller"
+    request = {"imports": config.get("hidden_imports", []), "args": extra_args if is_pyinstaller else []}
+    started = time.perf_counter()
+    try:
+        result = subprocess.run(
+            [python_exe, "-c", VALIDATION_PROBE],
+            input=json.dumps(request), capture_output=True, text=True, timeout=30
+        )
+        probe = json.loads(result.stdout)
+    except Exception as e:
+        problems.append(("warning", f"تعذر فحص المكتبات داخل مفسر البناء: {e}"))
+        probe = None
+    timings["probe"] = time.perf_counter() - started
+    
+    if probe:
+        for name in probe["missing"]:
+            problems.append(("error", f"المكتبة المخفية غير موجودة في مفسر البناء: {name}"))
+        for name in probe["unverified"]:
+            problems.append(("warning", f"تعذر العثور على الوحدة الفرعية (قد تكون افتراضية): {name}"))
+        if probe["args_error"]:
+            problems.append(("error", f"خطأ في أوامر PyInstaller الإضافية: {probe['args_error']}"))
+        if not probe["pyinstaller"] and is_pyinstaller:
+            problems.append(("warning", "PyInstaller غير مثبت - لم يتم فحص الأوامر الإضافية"))
+    
+    # ═══ أداة التجميد ═══
+    problems.extend(check_backend_config(config))
+    
+    # ═══ الاستيراد الديناميكي (كل نقاط الدخول والوحدات المحلية التي تستوردها) ═══
+    started = time.perf_counter()
+    hidden = set(config.get("hidden_imports", []))
+    for path, file_tree, imports in (iter_project_trees(config) if tree is not None else ()):
+        where = os.path.basename(path)
+        for lineno, call, target in find_dynamic_imports(file_tree):
+            if target is None:
+                problems.append((
+                    "warning",
+                    f"استيراد ديناميكي لن يكتشفه PyInstaller ({where} سطر {lineno}: {call}) - "
+                    f"أضف الوحدات المطلوبة كمكتبات مخفية"
+                ))
+            elif target not in hidden:
+                problems.append((
+                    "warning",
+                    f"استيراد ديناميكي للوحدة '{target}' ({where} سطر {lineno}) - يُنصح بإضافتها كمكتبة مخفية"
+                ))
+    timings["scan"] = time.perf_counter() - started
+    
+    return problems
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# تتبع الاستيرادات أثناء التشغيل
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# يُشغّل السكربت تحت خطاف يسجل كل وحدة تُحمَّل وكل ملف يُفتح، ويكتب النتيجة عند
+# الخروج أو عند انتهاء المهلة (مهم لتطبيقات الواجهة التي لا تنتهي من تلقاء نفسها)
+TRACE_BOOTSTRAP = r'''
+import sys, os, threading, runpy
+
+out_path, timeout, script = sys.argv[1], float(sys.argv[2]), sys.argv[3]
+baseline = set(sys.modules)
+found = set()
+opened = set()
+lock = threading.Lock()
+done = []
+
+class _TraceFinder:
+    def find_spec(self, fullname, path=None, target=None):
+        found.add(fullname)
+        return None
+
+def dump():
+    with lock:
+        if done:
+            return
+        done.append(True)
+        loaded = dict(sys.modules)
+        modules = (set(loaded) - baseline) | (found & set(loaded))
+        # وحدات وهمية مثل typing.io لا تملك مواصفات استيراد
+        modules = [m for m in modules if getattr(loaded[m], "__spec__", None) is not None]
+        with open(out_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(sorted(modules)))
+        with open(out_path + ".files", "w", encoding="utf-8") as f:
+            f.write("\n".join(sorted(opened)))
+
+def audit(event, args):
+    if event == "open" and args and isinstance(args[0], str):
+        opened.add(args[0])
+
+def on_timeout():
+    dump()
+    os._exit(0)
+
+sys.meta_path.insert(0, _TraceFinder())
+if hasattr(sys, "addaudithook"):
+    sys.addaudithook(audit)
+timer = threading.Timer(timeout, on_timeout)
+timer.daemon = True
+timer.start()
+
+sys.argv = sys.argv[3:]
+sys.path[0] = os.path.dirname(os.path.abspath(script))
+try:
+    runpy.run_path(script, run_name="__main__")
+finally:
+    dump()
+'''
+
+# وحدات يضمّنها PyInstaller دائماً أو لا معنى لإضافتها كمكتبات مخفية
+TRACE_IGNORED_PREFIXES = ("__main__", "_frozen_importlib", "encodings", "__mp_main__")
+
+EXTENSION_SUFFIXES = (".so", ".pyd", ".dylib")
+
+# مع QT_DEBUG_PLUGINS=1 يطبع Qt مسار كل إضافة يحمّلها فعلاً
+QT_PLUGIN_LOADED_RE = re.compile(r'loaded library "([^"]+)"')
+
+
+def toc_name_to_module(name, typecode):
+    """تحويل اسم مدخل TOC إلى اسم وحدة (الامتدادات تُسجَّل كمسارات في PyInstaller 6)"""
+    if typecode == "EXTENSION" and ("/" in name or "\\" in name or name.endswith(EXTENSION_SUFFIXES)):
+        parts = name.replace("\\", "/").split("/")
+        parts[-1] = parts[-1].split(".")[0]
+        return ".".join(parts)
+    return name
+
+
+def read_toc_entries(toc_path):
+    """قراءة مدخلات (الاسم، المسار، النوع) من ملف TOC يكتبه PyInstaller"""
+    with open(toc_path, 'r', encoding='utf-8') as f:
+        data = ast.literal_eval(f.read())
+    
+    entries = []
+    stack = [data]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, (list, tuple)):
+            if (len(item) == 3 and all(isinstance(x, str) or x is None for x in item)
+                    and isinstance(item[2], str) and item[2].isupper()):
+                entries.append(tuple(item))
+            else:
+                stack.extend(item)
+        elif isinstance(item, dict):
+            stack.extend(item.values())
+    return entries
+
+
+def get_build_work_dir(config):
+    """مجلد build/<name> الذي يكتب فيه PyInstaller ملفات التحليل"""
+    return os.path.join(get_build_root(config), "build", get_app_name(config))
+
+
+def get_analyzed_modules(config, script=None):
+    """وحدات تحليل PyInstaller: من ملفات TOC لآخر بناء، وإلا من modulefinder تقريبياً"""
+    work_dir = get_build_work_dir(config)
+    modules = set()
+    if os.path.isdir(work_dir):
+        for file_name in os.listdir(work_dir):
+            if not file_name.endswith(".toc"):
+                continue
+            try:
+                entries = read_toc_entries(os.path.join(work_dir, file_name))
+            except Exception:
+                continue
+            for name, path, typecode in entries:
+                if typecode in ("PYMODULE", "EXTENSION", "PYSOURCE"):
+                    modules.add(toc_name_to_module(name, typecode))
+    if modules:
+        return modules, "toc"
+    
+    import modulefinder
+    finder = modulefinder.ModuleFinder(path=[os.path.dirname(os.path.abspath(script))] + sys.path)
+    finder.run_script(script)
+    return set(finder.modules), "modulefinder"
+
+
+def trace_imports(python_exe, script, timeout, args=()):
+    """تشغيل السكربت تحت خطاف التتبع: (الوحدات المحمّلة، ملفات البيانات وإضافات Qt المحمّلة)"""
+    fd, out_path = tempfile.mkstemp(suffix=".json", prefix="py2exe_trace_")
+    os.close(fd)
+    files_path = out_path + ".files"
+    try:
+        result = subprocess.run(
+            [python_exe, "-c", TRACE_BOOTSTRAP, out_path, str(timeout), script, *args],
+            cwd=os.path.dirname(os.path.abspath(script)),
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            env=dict(os.environ, QT_DEBUG_PLUGINS="1"),
+            timeout=timeout + 30
+        )
+        with open(out_path, 'r', encoding='utf-8') as f:
+            modules = {line for line in f.read().splitlines() if line}
+        files = set(QT_PLUGIN_LOADED_RE.findall(result.stderr.decode("utf-8", "replace")))
+        if os.path.exists(files_path):
+            with open(files_path, 'r', encoding='utf-8') as f:
+                files.update(
+                    line for line in f.read().splitlines()
+                    if line and not line.startswith(out_path) and not line.endswith((".py", ".pyc"))
+                    and os.path.isfile(line)
+                )
+        return modules, {os.path.realpath(path) for path in files}
+    finally:
+        for path in (out_path, files_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+# الحزمة الأم تُحذف إذا كانت إحدى وحداتها الفرعية في القائمة (استيراد الفرعية يضمّنها)
+def compute_hidden_imports(traced, analyzed, existing):
+    """أصغر قائمة مكتبات مخفية للوحدات المحمّلة خارج التحليل، والمخفية غير المحمّلة"""
+    builtins = set(sys.builtin_module_names)
+    missing = {
+        name for name in traced
+        if name not in analyzed and name not in builtins and name not in existing
+        and not name.startswith(TRACE_IGNORED_PREFIXES)
+    }
+    minimal = sorted(
+        name for name in missing
+        if not any(other.startswith(name + ".") for other in missing)
+    )
+    
+    # وحدات المكتبة القياسية قد تكون محمّلة مسبقاً قبل التتبع فلا يُحكم عليها
+    stdlib = set(getattr(sys, "stdlib_module_names", ()))
+    traced_roots = {name.split(".")[0] for name in traced}
+    unused = sorted(
+        name for name in existing
+        if name.split(".")[0] not in traced_roots and name.split(".")[0] not in stdlib
+    )
+    return minimal, unused
+
+
+class ValidationThread(QThread):
+    """خيط التحقق قبل البناء (فحص مفسر البناء قد يستغرق ثوانٍ)"""
+    
+    finished_signal = pyqtSignal(list, dict)
+    
+    def __init__(self, config):
+        super().__init__()
+        self.config = config
+    
+    def run(self):
+        timings = {}
+        started = time.perf_counter()
+        try:
+            problems = validate_config(self.config, timings=timings)
+        except Exception as e:
+            problems = [("error", f"تعذر التحقق من الإعدادات: {str(e)}")]
+        timings["total"] = time.perf_counter() - started
+        self.finished_signal.emit(problems, timings)
+
+
+class TraceImportsThread(QThread):
+    """خيط تتبع الاستيرادات أثناء تشغيل السكربت"""
+    
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(list, list)
+    usage_signal = pyqtSignal(dict)
+    
+    def __init__(self, config, script, timeout):
+        super().__init__()
+        self.config = config
+        self.script = script
+        self.timeout = timeout
+    
+    def run(self):
+        try:
+            self.log_signal.emit(f"🧪 جاري تشغيل {os.path.basename(self.script)} تحت التتبع (المهلة {self.timeout} ث)...")
+            traced, files = trace_imports(sys.executable, self.script, self.timeout)
+            self.log_signal.emit(f"   وحدات محمّلة أثناء التشغيل: {len(traced)} - ملفات بيانات وإضافات: {len(files)}")
+            self.usage_signal.emit({"modules": sorted(traced), "files": sorted(files)})
+            
+            analyzed, origin = get_analyzed_modules(self.config, self.config.get("source") or self.script)
+            origin_text = "ملفات TOC لآخر بناء" if origin == "toc" else "تحليل ساكن (لا يوجد بناء سابق)"
+            self.log_signal.emit(f"   وحدات في التحليل: {len(analyzed)} ({origin_text})")
+            
+            minimal, unused = compute_hidden_imports(
+                traced, analyzed, set(self.config.get("hidden_imports", []))
+            )
+            self.finished_signal.emit(minimal, unused)
+        except subprocess.TimeoutExpired:
+            self.log_signal.emit("❌ تجاوز السكربت المهلة ولم يتم إنهاؤه")
+            self.finished_signal.emit([], [])
+        except Exception as e:
+            self.log_signal.emit(f"❌ خطأ في التتبع: {str(e)}")
+            self.finished_signal.emit([], [])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# تنحيف وحدات المشروع قبل التجميد
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# مكتبات وأسماء تقرأ النصوص التوثيقية أو تعليقات الأنواع أثناء التشغيل: ظهورها
+# في المشروع يوقف حذف ما تعتمد عليه
+SLIM_DOC_NAMES = {"__doc__", "getdoc"}
+SLIM_DOC_LIBRARIES = {"click", "typer", "docopt", "fire"}
+SLIM_ANNOTATION_NAMES = {
+    "__annotations__", "get_type_hints", "get_annotations", "signature",
+    "singledispatch", "singledispatchmethod",
+}
+SLIM_ANNOTATION_LIBRARIES = {"typer", "pydantic", "fastapi", "attr", "attrs", "cattrs", "msgspec", "fire"}
+
+# وحدة تستدعي هذه الدوال قد تصل إلى دوالها بالاسم فلا تُحذف منها دوال
+SLIM_DYNAMIC_SCOPE_CALLS = {"globals", "vars", "locals"}
+
+# عدد مرات فك ترميز الشيفرة المجمعة عند قياس زمن التحميل
+SLIM_TIMING_ROUNDS = 20
+
+
+def find_local_module(root, name):
+    """ملف الوحدة المحلية: .py أو __init__.py أو امتداد مترجم (أو None)"""
+    base = os.path.join(root, *name.split("."))
+    for path in (base + ".py", os.path.join(base, "__init__.py")):
+        if os.path.isfile(path):
+            return path
+    folder, stem = os.path.split(base)
+    if os.path.isdir(folder):
+        for item in os.listdir(folder):
+            if item.startswith(stem + ".") and item.endswith(EXTENSION_SUFFIXES):
+                return os.path.join(folder, item)
+    return None
+
+
+def walk_outside(tree, skip):
+    """عقد الشجرة عدا الأشجار الفرعية للعقد المستثناة"""
+    pending = [tree]
+    while pending:
+        node = pending.pop()
+        yield node
+        pending.extend(child for child in ast.iter_child_nodes(node) if child not in skip)
+
+
+def get_node_imports(nodes, module_name, is_package):
+    """الوحدات التي تحتاجها العقد: الاستيراد المطلق والنسبي والديناميكي الثابت"""
+    package = module_name if is_package else module_name.rpartition(".")[0]
+    found = set()
+    for node in nodes:
+        if isinstance(node, ast.Import):
+            found.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module
+            if node.level:
+                parts = package.split(".") if package else []
+                if node.level - 1 > len(parts):
+                    continue
+                base = ".".join(parts[:len(parts) - node.level + 1] + ([node.module] if node.module else []))
+            if not base:
+                continue
+            found.add(base)
+            found.update(f"{base}.{alias.name}" for alias in node.names if alias.name != "*")
+        elif isinstance(node, ast.Call):
+            for lineno, call, target in find_dynamic_imports(node):
+                if target:
+                    found.add(target)
+    return found
+
+
+def get_node_names(nodes):
+    """كل المعرّفات المذكورة في العقد (أسماء، سمات، أسماء مستوردة، وكلمات النصوص)"""
+    names = set()
+    for node in nodes:
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, ast.alias):
+            names.add(node.name.split(".")[0])
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            names.update(re.findall(r"[A-Za-z_]\w*", node.value))
+    return names
+
+
+def load_slim_module(root, name, path):
+    """تحليل وحدة محلية: استيراداتها ومعرّفاتها داخل دوالها الكبرى وخارجها"""
+    info = {"name": name, "path": path, "tree": None, "functions": {}, "imports": set(),
+            "names": set(), "function_imports": {}, "function_names": {}}
+    if not path.endswith((".py", ".pyw")):
+        return info
+    with open(path, 'rb') as f:
+        info["source"] = f.read()
+    try:
+        tree = ast.parse(info["source"], filename=path)
+    except (SyntaxError, ValueError):
+        return info
+    info["tree"] = tree
+    is_package = os.path.basename(path) == "__init__.py"
+    
+    all_nodes = list(ast.walk(tree))
+    calls = {get_call_name(node) for node in all_nodes if isinstance(node, ast.Call)}
+    # الدوال المرشحة للحذف: دوال المستوى الأعلى غير المزخرفة
+    if not calls & SLIM_DYNAMIC_SCOPE_CALLS:
+        info["functions"] = {
+            node.name: node for node in tree.body
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+            and not node.decorator_list and not node.name.startswith("__")
+        }
+    skip = set(info["functions"].values())
+    outside = list(walk_outside(tree, skip))
+    info["imports"] = get_node_imports(outside, name, is_package)
+    info["names"] = get_node_names(outside)
+    for fname, node in info["functions"].items():
+        nodes = list(ast.walk(node))
+        info["function_imports"][fname] = get_node_imports(nodes, name, is_package)
+        info["function_names"][fname] = get_node_names(nodes)
+    
+    # getattr(وحدة, اسم متغير) يجعل دوال تلك الوحدة متاحة بالاسم
+    aliases = {}
+    for node in all_nodes:
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                aliases[alias.asname or alias.name.split(".")[0]] = alias.name if alias.asname else alias.name.split(".")[0]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            for alias in node.names:
+                aliases[alias.asname or alias.name] = f"{node.module}.{alias.name}"
+    info["dynamic_targets"] = {
+        aliases[node.args[0].id] for node in all_nodes
+        if isinstance(node, ast.Call) and get_call_name(node) == "getattr" and len(node.args) >= 2
+        and isinstance(node.args[0], ast.Name) and node.args[0].id in aliases
+        and not isinstance(node.args[1], ast.Constant)
+    }
+    info["all_names"] = info["names"].union(*info["function_names"].values())
+    info["all_imports"] = info["imports"].union(*info["function_imports"].values())
+    return info
+
+
+def find_reachable_modules(root, modules, roots, dead):
+    """الوحدات المحلية التي تصل إليها نقاط الدخول (دون المرور بالدوال المحذوفة)"""
+    reachable = set()
+    pending = list(roots)
+    while pending:
+        name = pending.pop()
+        if name in reachable:
+            continue
+        if name not in modules:
+            path = find_local_module(root, name)
+            modules[name] = load_slim_module(root, name, path) if path else None
+        info = modules[name]
+        if info is None:
+            continue
+        reachable.add(name)
+        
+        imports = set(info["imports"])
+        for fname, found in info["function_imports"].items():
+            if (name, fname) not in dead:
+                imports.update(found)
+        for module in imports:
+            parts = module.split(".")
+            pending.extend(".".join(parts[:i]) for i in range(1, len(parts) + 1))
+        if "." in name:
+            pending.append(name.rpartition(".")[0])
+    return reachable
+
+
+def find_dead_functions(modules, reachable):
+    """دوال المستوى الأعلى التي لا يُذكر اسمها في أي شيفرة حية من المشروع"""
+    protected = set()
+    for name in reachable:
+        protected.update(modules[name].get("dynamic_targets", ()))
+    
+    live = set()
+    by_name = {}
+    for name in reachable:
+        info = modules[name]
+        live.update(info["names"])
+        for fname in info["functions"]:
+            by_name.setdefault(fname, []).append(info["function_names"][fname])
+    
+    pending = list(live)
+    while pending:
+        for refs in by_name.get(pending.pop(), ()):
+            new = refs - live
+            live.update(new)
+            pending.extend(new)
+    
+    return {
+        (name, fname)
+        for name in reachable if name not in protected
+        for fname in modules[name]["functions"] if fname not in live
+    }
+
+
+def slim_module_source(info, dead, strip_docs, strip_annotations):
+    """تنحيف نص الوحدة في مواضعه مع بقاء أرقام الأسطر: (النص الجديد، الإحصاءات)"""
+    source = info["source"]
+    tree = info["tree"]
+    line_starts = [0]
+    for line in source.splitlines(keepends=True):
+        line_starts.append(line_starts[-1] + len(line))
+    
+    def offset(lineno, col):
+        return line_starts[lineno - 1] + col
+    
+    def span(node):
+        return offset(node.lineno, node.col_offset), offset(node.end_lineno, node.end_col_offset)
+    
+    edits = []
+    stats = {"functions": 0, "docstrings": 0, "annotations": 0, "debug_blocks": 0}
+    
+    def remove(start, end, replacement=b"", continuation=False):
+        # الأسطر المحذوفة تُستبدل بأسطر فارغة، أو بأسطر متصلة داخل التعليمة
+        newline = b" \\\n" if continuation else b"\n"
+        edits.append((start, end, replacement + newline * source.count(b"\n", start, end)))
+    
+    for fname, node in info["functions"].items():
+        if (info["name"], fname) in dead:
+            remove(*span(node))
+            stats["functions"] += 1
+    
+    for node in ast.walk(tree):
+        body_owner = isinstance(node, (ast.Module, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef))
+        if strip_docs and body_owner and node.body:
+            first = node.body[0]
+            if (isinstance(first, ast.Expr) and isinstance(first.value, ast.Constant)
+                    and isinstance(first.value.value, str)):
+                # pass لا يُنتج شيفرة، ولا يجوز قبل from __future__ في أول الوحدة
+                remove(*span(first), b"" if isinstance(node, ast.Module) else b"pass")
+                stats["docstrings"] += 1
+        
+        if strip_annotations and isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            args = node.args
+            for arg in args.posonlyargs + args.args + args.kwonlyargs + [args.vararg, args.kwarg]:
+                if arg is not None and arg.annotation is not None:
+                    name_end = offset(arg.lineno, arg.col_offset) + len(arg.arg.encode("utf-8"))
+                    remove(name_end, span(arg.annotation)[1])
+                    stats["annotations"] += 1
+            if node.returns is not None:
+                start, end = span(node.returns)
+                remove(source.rfind(b"->", offset(node.lineno, node.col_offset), start), end, continuation=True)
+                stats["annotations"] += 1
+        
+        if isinstance(node, ast.If):
+            test = node.test.operand if isinstance(node.test, ast.UnaryOp) and isinstance(node.test.op, ast.Not) else node.test
+            if isinstance(test, ast.Name) and test.id == "__debug__":
+                # المترجم يحذف فرع if False كاملاً
+                edits.append((*span(test), b"False"))
+                stats["debug_blocks"] += 1
+    
+    # تعليقات الأنواع للمتغيرات على مستوى الوحدة (متغيرات الأصناف تبقى لـ dataclass وأمثالها)
+    if strip_annotations:
+        for node in tree.body:
+            if isinstance(node, ast.AnnAssign) and node.simple:
+                if node.value is None:
+                    remove(*span(node))
+                else:
+                    remove(span(node.target)[1], span(node.value)[0], b" = ", continuation=True)
+                stats["annotations"] += 1
+    
+    result = []
+    position = 0
+    for start, end, replacement in sorted(edits, key=lambda edit: (edit[0], -edit[1])):
+        if start < position:
+            continue  # داخل تعديل أكبر (مثل دالة محذوفة)
+        result.append(source[position:start])
+        result.append(replacement)
+        position = end
+    result.append(source[position:])
+    return b"".join(result), stats
+
+
+def measure_code(sources, optimize):
+    """(حجم الشيفرة المجمعة بالبايت، زمن فك ترميزها بالثانية)"""
+    blobs = []
+    for path, source in sources:
+        try:
+            blobs.append(marshal.dumps(compile(source, path, "exec", optimize=optimize)))
+        except (SyntaxError, ValueError):
+            continue
+    started = time.perf_counter()
+    for _ in range(SLIM_TIMING_ROUNDS):
+        for blob in blobs:
+            marshal.loads(blob)
+    return sum(len(blob) for blob in blobs), (time.perf_counter() - started) / SLIM_TIMING_ROUNDS
+
+
+def write_if_changed(path, data):
+    """الكتابة فقط عند تغير المحتوى (للحفاظ على وقت التعديل وذاكرة البناء)"""
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def get_slim_dir(config):
+    """مجلد النسخة المنحّفة من وحدات المشروع"""
+    return os.path.join(get_work_dir(config), "build", "slim", get_app_name(config))
+
+
+# تُحذف النصوص التوثيقية وتعليقات الأنواع وكتل __debug__ وغير المستخدم؛ الأصل لا يُعدَّل
+def slim_project(config):
+    """نسخة منحّفة من وحدات المشروع في build/slim: (إعدادات تشير إليها، الإحصاءات)"""
+    root = os.path.dirname(os.path.abspath(config["source"]))
+    entries = [os.path.abspath(script) for name, script in get_entries(config)]
+    outside = [script for script in entries if os.path.commonpath([root, script]) != root]
+    if outside:
+        raise ValueError(f"نقاط دخول خارج مجلد ملف المصدر: {', '.join(outside)}")
+    
+    modules = {}
+    roots = []
+    for script in entries:
+        name = os.path.splitext(os.path.relpath(script, root))[0].replace(os.sep, ".")
+        modules[name] = load_slim_module(root, name, script)
+        roots.append(name)
+    # ما يُضاف صراحة للبناء يبقى حتى لو لم يُستورد
+    for name in config.get("hidden_imports", []):
+        roots.append(name)
+    for package in config.get("collect_submodules", []):
+        path = find_local_module(root, package)
+        if path and os.path.basename(path) == "__init__.py":
+            for folder, dirs, files in os.walk(os.path.dirname(path)):
+                prefix = os.path.relpath(folder, root).replace(os.sep, ".")
+                roots.extend(f"{prefix}.{os.path.splitext(item)[0]}" for item in files if item.endswith(".py"))
+    
+    original = find_reachable_modules(root, modules, roots, set())
+    dead = set()
+    reachable = original
+    # حذف الدوال قد يجعل وحدات غير مستخدمة، وحذف الوحدات قد يجعل دوالاً غير مستخدمة
+    while True:
+        dead = find_dead_functions(modules, reachable)
+        next_reachable = find_reachable_modules(root, modules, roots, dead)
+        if next_reachable == reachable:
+            break
+        reachable = next_reachable
+    
+    all_names = set().union(*(modules[name].get("all_names", set()) for name in reachable))
+    all_roots = {module.split(".")[0] for name in reachable for module in modules[name].get("all_imports", ())}
+    strip_docs = not (all_names & SLIM_DOC_NAMES or all_roots & SLIM_DOC_LIBRARIES)
+    strip_annotations = not (all_names & SLIM_ANNOTATION_NAMES or all_roots & SLIM_ANNOTATION_LIBRARIES)
+    
+    stats = {"functions": 0, "docstrings": 0, "annotations": 0, "debug_blocks": 0, "failed": []}
+    stats.update(
+        modules=len(reachable), dropped=sorted(original - reachable),
+        strip_docs=strip_docs, strip_annotations=strip_annotations,
+    )
+    slim_dir = get_slim_dir(config)
+    before, after, written = [], [], set()
+    for name in sorted(original):
+        info = modules[name]
+        if info.get("tree") is not None:
+            before.append((info["path"], info["source"]))
+        if name not in reachable:
+            continue
+        target = os.path.join(slim_dir, os.path.relpath(info["path"], root))
+        written.add(os.path.normcase(target))
+        if info.get("tree") is None:
+            # امتداد مترجم أو ملف لم يُحلَّل: يُنسخ كما هو
+            with open(info["path"], 'rb') as f:
+                write_if_changed(target, f.read())
+            continue
+        data, module_stats = slim_module_source(info, dead, strip_docs, strip_annotations)
+        try:
+            compile(data, info["path"], "exec")
+        except (SyntaxError, ValueError):
+            data = info["source"]
+            stats["failed"].append(name)
+        else:
+            for key, value in module_stats.items():
+                stats[key] += value
+        write_if_changed(target, data)
+        after.append((info["path"], data))
+    
+    # حذف ملفات بقيت من بناء سابق
+    for folder, dirs, files in os.walk(slim_dir):
+        for item in files:
+            path = os.path.join(folder, item)
+            if os.path.normcase(path) not in written:
+                os.remove(path)
+    
+    optimize = config.get("optimize", 0)
+    stats["bytes_before"], stats["load_before"] = measure_code(before, optimize)
+    stats["bytes_after"], stats["load_after"] = measure_code(after, optimize)
+    
+    staged = lambda script: os.path.join(slim_dir, os.path.relpath(os.path.abspath(script), root))
+    slim_config = dict(
+        config,
+        source=staged(config["source"]),
+        extra_entries=[staged(script) for script in config.get("extra_entries", [])],
+        output_dir=get_work_dir(config),
+    )
+    return slim_config, stats
+
+
+def format_slim_report(stats):
+    """أسطر تقرير التنحيف"""
+    kb = 1024
+    saved = stats["bytes_before"] - stats["bytes_after"]
+    percent = saved / stats["bytes_before"] * 100 if stats["bytes_before"] else 0
+    lines = [
+        f"✂️ تنحيف وحدات المشروع: {stats['modules']} وحدة - حُذف: "
+        f"{len(stats['dropped'])} وحدة و{stats['functions']} دالة غير مستخدمة، "
+        f"{stats['docstrings']} نص توثيقي، {stats['annotations']} تعليق نوع، {stats['debug_blocks']} كتلة __debug__",
+        f"   الشيفرة المجمعة: {stats['bytes_before'] / kb:.1f} KB ← {stats['bytes_after'] / kb:.1f} KB "
+        f"(وفر {saved / kb:.1f} KB، {percent:.0f}%) - زمن فك الترميز: "
+        f"{stats['load_before'] * 1000:.2f} ← {stats['load_after'] * 1000:.2f} ms",
+    ]
+    if stats["dropped"]:
+        lines.append(f"   وحدات غير مستخدمة: {', '.join(stats['dropped'])}")
+    if not stats["strip_docs"]:
+        lines.append("   ℹ️ أُبقيت النصوص التوثيقية (المشروع يقرؤها أثناء التشغيل)")
+    if not stats["strip_annotations"]:
+        lines.append("   ℹ️ أُبقيت تعليقات الأنواع (المشروع يقرؤها أثناء التشغيل)")
+    if stats["failed"]:
+        lines.append(f"   ⚠️ نُسخت كما هي لتعذر تنحيفها: {', '.join(stats['failed'])}")
+    return lines
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# زمن الاستيراد داخل التطبيق المجمّع وخطافات التأجيل
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# خطاف تشغيل للبناء التشخيصي: يقيس زمن تحميل كل وحدة (مثل -X importtime)
+# ويكتب التقرير عند الخروج، أو بعد مهلة لتطبيقات الواجهة التي لا تنتهي
+IMPORT_PROFILE_HOOK = r'''
+# خطاف تشغيل مولَّد بواسطة Python to EXE Converter: قياس زمن الاستيراد
+import sys, os, time, json, atexit, tempfile, threading, builtins, importlib, importlib.util
+
+_started = time.perf_counter()
+_original_import = builtins.__import__
+_original_import_module = importlib.import_module
+_stack = []
+_records = []
+_written = threading.Lock()
+
+
+def _timed(load, name, fromlist=()):
+    needs_load = name not in sys.modules or any(
+        "%s.%s" % (name, item) not in sys.modules for item in fromlist or () if item != "*"
+    )
+    if not needs_load:
+        return load()
+    before = set(sys.modules)
+    _stack.append(0.0)
+    started = time.perf_counter()
+    try:
+        return load()
+    finally:
+        elapsed = time.perf_counter() - started
+        children = _stack.pop()
+        if _stack:
+            _stack[-1] += elapsed
+        new = sorted(set(sys.modules) - before)
+        if new:
+            key = name if name in new else new[-1]
+            _records.append({
+                "module": key, "self_us": int((elapsed - children) * 1e6),
+                "cumulative_us": int(elapsed * 1e6), "depth": len(_stack), "loaded": len(new),
+            })
+
+
+def _import(name, globals=None, locals=None, fromlist=(), level=0):
+    absolute = name
+    if level and globals:
+        try:
+            absolute = importlib.util.resolve_name("." * level + name, globals.get("__package__") or "")
+        except (ImportError, ValueError):
+            pass
+    return _timed(lambda: _original_import(name, globals, locals, fromlist, level), absolute, fromlist)
+
+
+def _import_module(name, package=None):
+    absolute = importlib.util.resolve_name(name, package) if name.startswith(".") else name
+    return _timed(lambda: _original_import_module(name, package), absolute)
+
+
+def _write_report():
+    if not _written.acquire(False):
+        return
+    stem = os.path.splitext(os.path.basename(sys.executable))[0]
+    report = {
+        "executable": sys.executable,
+        "elapsed_seconds": time.perf_counter() - _started,
+        "records": _records,
+    }
+    paths = [os.environ.get("PY2EXE_IMPORT_PROFILE") or
+             os.path.join(os.path.dirname(sys.executable), stem + ".importtime.json")]
+    paths.append(os.path.join(tempfile.gettempdir(), stem + ".importtime.json"))
+    for path in paths:
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=1)
+        except OSError:
+            continue
+        sys.stderr.write("import profile: %s\n" % path)
+        break
+    _written.release()
+
+
+builtins.__import__ = _import
+importlib.import_module = _import_module
+atexit.register(_write_report)
+_timer = threading.Timer(float(os.environ.get("PY2EXE_IMPORT_PROFILE_SECONDS", "20")), _write_report)
+_timer.daemon = True
+_timer.start()
+'''
+
+# خطاف تشغيل يؤجل تحميل وحدات محددة حتى أول وصول إلى سماتها
+LAZY_IMPORT_HOOK = r'''
+# خطاف تشغيل مولَّد بواسطة Python to EXE Converter: تأجيل الوحدات الثقيلة حتى أول استخدام
+import sys
+import importlib.machinery
+import importlib.util
+
+LAZY_MODULES = %r
+
+
+class _LazyFinder:
+    def find_spec(self, name, path=None, target=None):
+        if name not in LAZY_MODULES:
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(name, path, target)
+            if spec is None:
+                continue
+            # الامتدادات المترجمة تُهيَّأ في create_module فلا يفيد تأجيلها
+            origin = spec.origin or ""
+            if spec.loader is not None and hasattr(spec.loader, "exec_module") \
+                    and not origin.endswith(tuple(importlib.machinery.EXTENSION_SUFFIXES)):
+                spec.loader = importlib.util.LazyLoader(spec.loader)
+            return spec
+        return None
+
+
+sys.meta_path.insert(0, _LazyFinder())
+'''
+
+# الحد الأدنى لزمن الاستيراد التراكمي (ms) الذي يُقترح عنده التأجيل
+LAZY_SUGGEST_THRESHOLD_MS = 20
+
+
+def get_hooks_dir(config):
+    """مجلد خطافات التشغيل المولَّدة للمشروع"""
+    return os.path.join(get_work_dir(config), "build", "hooks")
+
+
+def get_runtime_hooks(config):
+    """كتابة خطافات التشغيل المطلوبة في الإعدادات وإرجاع مساراتها"""
+    hooks = []
+    if config.get("import_profile"):
+        hooks.append(("import_profile.py", IMPORT_PROFILE_HOOK))
+    if config.get("lazy_modules"):
+        hooks.append(("lazy_imports.py", LAZY_IMPORT_HOOK % sorted(set(config["lazy_modules"]))))
+    paths = []
+    for name, content in hooks:
+        path = os.path.join(get_hooks_dir(config), name)
+        write_if_changed(path, content.lstrip().encode("utf-8"))
+        paths.append(path)
+    return paths
+
+
+def load_import_profile(path):
+    """قراءة تقرير زمن الاستيراد الذي يكتبه التطبيق التشخيصي"""
+    with open(path, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    if not isinstance(report.get("records"), list):
+        raise ValueError("ليس تقرير زمن استيراد")
+    return report
+
+
+def get_import_styles(config):
+    """طريقة استيراد المشروع لكل وحدة على مستوى الوحدة: import أو from"""
+    root = os.path.dirname(os.path.abspath(config["source"]))
+    modules = {}
+    roots = []
+    for name, script in get_entries(config):
+        module = os.path.splitext(os.path.relpath(os.path.abspath(script), root))[0].replace(os.sep, ".")
+        modules[module] = load_slim_module(root, module, os.path.abspath(script))
+        roots.append(module)
+    
+    styles = {}
+    for name in find_reachable_modules(root, modules, roots, set()):
+        tree = modules[name]["tree"]
+        if tree is None:
+            continue
+        # الاستيراد داخل الدوال مؤجل أصلاً
+        skip = {node for node in ast.walk(tree) if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda))}
+        for node in walk_outside(tree, skip):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    styles.setdefault(alias.name, set()).add("import")
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                styles.setdefault(node.module, set()).add("from")
+    return styles
+
+
+# التأجيل يفيد مع import X فقط، أما from X import Y فيصل إلى X فوراً
+def suggest_lazy_modules(report, styles, threshold_ms=LAZY_SUGGEST_THRESHOLD_MS):
+    """الوحدات الثقيلة التي يستوردها المشروع مباشرة: [(الوحدة، ms، قابلة للتأجيل)]"""
+    suggestions = []
+    seen = set()
+    for record in sorted(report["records"], key=lambda r: -r["cumulative_us"]):
+        module = record["module"]
+        ms = record["cumulative_us"] / 1000
+        if ms < threshold_ms or module in seen or module not in styles:
+            continue
+        seen.add(module)
+        suggestions.append((module, ms, styles[module] == {"import"}))
+    return suggestions
+
+
+def format_import_profile(report, suggestions, top=15):
+    """أسطر تقرير زمن الاستيراد والاقتراحات"""
+    records = sorted(report["records"], key=lambda r: -r["cumulative_us"])
+    total = sum(r["self_us"] for r in records) / 1000
+    lines = [
+        f"⏱️ زمن الاستيراد: {total:.0f} ms في {len(records)} عملية استيراد "
+        f"(مدة القياس {report.get('elapsed_seconds', 0):.1f} ث)",
+        f"   {'ذاتي ms':>10} {'تراكمي ms':>10}  الوحدة",
+    ]
+    for record in records[:top]:
+        lines.append(
+            f"   {record['self_us'] / 1000:>10.1f} {record['cumulative_us'] / 1000:>10.1f}  "
+            f"{'  ' * record['depth']}{record['module']}"
+        )
+    if not suggestions:
+        lines.append("✅ لا توجد وحدات ثقيلة يستوردها المشروع مباشرة")
+        return lines
+    lines.append("💡 وحدات مقترح تأجيلها:")
+    for module, ms, lazy_ok in suggestions:
+        note = "" if lazy_ok else " - ⚠️ تُستورد بـ from ... import فلن يفيد التأجيل إلا بتغيير الاستيراد"
+        lines.append(f"   {module}: {ms:.0f} ms{note}")
+    return lines
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# ذاكرة تخزين نتائج التحليل للحزم الخارجية
+# ═══════════════════════════════════════════════════════════════════════════════
+
+ANALYSIS_CACHE_DIR = os.path.join(APP_DATA_DIR, "analysis_cache")
+ANALYSIS_TIMES_FILE = os.path.join(ANALYSIS_CACHE_DIR, "analysis_times.json")
+
+# أنواع مدخلات TOC التي تُخزَّن لكل حزمة وتُحقن في a.pure و a.binaries و a.datas
+CACHED_TOC_TYPES = ("PYMODULE", "EXTENSION", "BINARY", "DATA")
+
+# خطافات تشغيل لا يطابق اسمها اسم الحزمة التي تتبع لها
+RUNTIME_HOOK_OWNERS = {
+    "mplconfig": "matplotlib",
+    "pkgres": "pkg_resources",
+    "gtk": "gi",
+    "gio": "gi",
+    "glib": "gi",
+    "gstreamer": "gi",
+    "win32comgenpy": "win32com",
+    "pywintypes": "pywin32_system32",
+    "pythoncom": "pywin32_system32",
+}
+
+# سطر سجل PyInstaller: "1234 INFO: ..." (الرقم بالمللي ثانية منذ البدء)
+PYINSTALLER_LOG_RE = re.compile(r"^\s*(\d+) (DEBUG|INFO|WARNING|ERROR|CRITICAL|FATAL):")
+
+# يُنفَّذ داخل مفسر البناء: إصدار كل حزمة ومجلدها وبصمة ملفات الخطافات الخاصة بها
+PACKAGE_PROBE = r'''
+import sys, os, json, glob, hashlib, sysconfig
+import importlib.util, importlib.metadata
+
+packages = json.loads(sys.stdin.read())
+stdlib = set(getattr(sys, "stdlib_module_names", ()))
+try:
+    distributions = importlib.metadata.packages_distributions()
+except Exception:
+    distributions = {}
+
+hook_dirs = []
+try:
+    import PyInstaller
+    pyi_version = PyInstaller.__version__
+    hook_dirs.append(os.path.join(os.path.dirname(PyInstaller.__file__), "hooks"))
+except Exception:
+    pyi_version = None
+try:
+    import _pyinstaller_hooks_contrib as contrib
+    base = os.path.dirname(contrib.__file__)
+    hook_dirs += [os.path.join(base, "stdhooks"), os.path.join(base, "hooks", "stdhooks")]
+except Exception:
+    pass
+
+# نتائج التحليل صالحة لهذا المفسر وهذه البيئة فقط (الامتدادات مبنية لإصدار ومنصة محددين)
+interpreter = {
+    "version": sys.version,
+    "cache_tag": sys.implementation.cache_tag,
+    "platform": sysconfig.get_platform(),
+    "prefix": sys.prefix,
+}
+result = {"pyinstaller": pyi_version, "interpreter": interpreter, "packages": {}}
+for name in packages:
+    if name in stdlib or name in sys.builtin_module_names:
+        continue
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or not spec.submodule_search_locations:
+        continue
+    dists = distributions.get(name, [])
+    if not dists:
+        continue
+    try:
+        version = importlib.metadata.version(dists[0])
+    except Exception:
+        continue
+    hooks = hashlib.sha256((pyi_version or "").encode())
+    for hook_dir in hook_dirs:
+        for path in sorted(glob.glob(os.path.join(hook_dir, "hook-%s.py" % name)) +
+                           glob.glob(os.path.join(hook_dir, "hook-%s.*.py" % name))):
+            with open(path, "rb") as f:
+                hooks.update(os.path.basename(path).encode() + f.read())
+    result["packages"][name] = {
+        "dist": dists[0],
+        "version": version,
+        "hook_hash": hooks.hexdigest()[:16],
+        "package_dir": list(spec.submodule_search_locations)[0],
+    }
+
+print(json.dumps(result))
+'''
+
+
+def get_source_imports(tree):
+    """أسماء الوحدات المستوردة استيراداً مطلقاً في شجرة AST"""
+    imports = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                imports.add(alias.name)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            imports.add(node.module)
+            for alias in node.names:
+                if alias.name != "*":
+                    imports.add(f"{node.module}.{alias.name}")
+    return imports
+
+
+def detect_source_imports(source):
+    """أسماء المكتبات الجذرية في أسطر import و from لملف المصدر (كشف سريع بلا تحليل)"""
+    with open(source, 'r', encoding='utf-8') as f:
+        content = f.read()
+    
+    imports = set()
+    for line in content.split('\n'):
+        line = line.strip()
+        if line.startswith('import '):
+            parts = line[7:].split(',')
+            for part in parts:
+                module = part.strip().split(' as ')[0].split('.')[0]
+                if module:
+                    imports.add(module)
+        elif line.startswith('from '):
+            module = line[5:].split(' import')[0].strip().split('.')[0]
+            if module:
+                imports.add(module)
+    return imports
+
+
+def probe_packages(python_exe, names):
+    """معلومات الحزم (الإصدار، المجلد، بصمة الخطافات) من مفسر البناء"""
+    result = subprocess.run(
+        [python_exe, "-c", PACKAGE_PROBE],
+        input=json.dumps(sorted(names)), capture_output=True, text=True,
+        timeout=60, check=True
+    )
+    return json.loads(result.stdout)
+
+
+def get_cache_key(name, info, interpreter):
+    """مفتاح الذاكرة: اسم الحزمة + إصدارها + بصمة خطافاتها + المفسر والبيئة"""
+    data = json.dumps(interpreter, sort_keys=True)
+    env_id = hashlib.sha256(data.encode("utf-8")).hexdigest()[:12]
+    return f"{name}=={info['version']}@{info['hook_hash']}/{env_id}"
+
+
+def to_cache_path(path, site_dir):
+    """مسار ملف نسبياً إلى مجلد الحزم (يُربط بمجلد البيئة الحالية عند الاستخدام)"""
+    path = os.path.abspath(path)
+    if path.startswith(site_dir + os.sep):
+        return os.path.relpath(path, site_dir).replace(os.sep, "/")
+    return path
+
+
+def load_analysis_cache():
+    """تحميل فهرس ذاكرة التحليل"""
+    return read_json_file(os.path.join(ANALYSIS_CACHE_DIR, "index.json"), {})
+
+
+def save_analysis_cache(cache):
+    """حفظ فهرس ذاكرة التحليل"""
+    write_json_atomic(os.path.join(ANALYSIS_CACHE_DIR, "index.json"), cache)
+
+
+def get_package_imports(package_dir, package):
+    """الوحدات الخارجية التي تستوردها ملفات الحزمة (خارج الحزمة نفسها)"""
+    imports = set()
+    for root, dirs, files in os.walk(package_dir):
+        dirs[:] = [d for d in dirs if d != "__pycache__"]
+        for file_name in files:
+            if not file_name.endswith(".py"):
+                continue
+            try:
+                with open(os.path.join(root, file_name), 'rb') as f:
+                    tree = ast.parse(f.read())
+            except (SyntaxError, ValueError, OSError):
+                continue
+            imports |= get_source_imports(tree)
+    return {name for name in imports if name != package and not name.startswith(package + ".")}
+
+
+def get_toc_owner(name, typecode, dist_dirs):
+    """الحزمة العليا التي يتبع لها مدخل TOC"""
+    if typecode in ("PYMODULE", "EXTENSION"):
+        return toc_name_to_module(name, typecode).split(".")[0]
+    first = name.replace("\\", "/").split("/")[0]
+    if first.endswith(".dist-info"):
+        return dist_dirs.get(first.split("-")[0].lower().replace("_", "-"))
+    if first.endswith(".libs"):
+        return first[:-len(".libs")]
+    return first
+
+
+def update_analysis_cache(config, python_exe):
+    """تخزين مدخلات TOC لكل حزمة خارجية غير مخزنة والوحدات الخارجية التي تحتاجها (تُرجع المضافة)"""
+    toc_path = os.path.join(get_build_work_dir(config), "Analysis-00.toc")
+    if not os.path.exists(toc_path):
+        return []
+    entries = read_toc_entries(toc_path)
+    
+    modules = {}
+    runtime_hooks = set()
+    for name, path, typecode in entries:
+        if typecode in ("PYMODULE", "EXTENSION"):
+            modules[toc_name_to_module(name, typecode)] = path
+        elif typecode == "PYSOURCE" and name.startswith("pyi_rth_"):
+            hook = name[len("pyi_rth_"):].lower()
+            runtime_hooks.add(RUNTIME_HOOK_OWNERS.get(hook, hook))
+    
+    tops = {name.split(".")[0] for name in modules}
+    probe = probe_packages(python_exe, tops)
+    packages = probe["packages"]
+    source_dir = os.path.dirname(os.path.abspath(config.get("source", "")))
+    dist_dirs = {info["dist"].lower().replace("_", "-"): name for name, info in packages.items()}
+    
+    grouped = {}
+    for name, path, typecode in entries:
+        owner = get_toc_owner(name, typecode, dist_dirs)
+        if owner in packages:
+            grouped.setdefault(owner, []).append((name, path, typecode))
+    
+    cache = load_analysis_cache()
+    added = []
+    for package, info in packages.items():
+        key = get_cache_key(package, info, probe["interpreter"])
+        package_dir = info["package_dir"]
+        # الحزم المحلية أو التي لها خطاف تشغيل لا تُخزَّن
+        if key in cache or package.lower() in runtime_hooks:
+            continue
+        if os.path.abspath(package_dir).startswith(source_dir + os.sep):
+            continue
+        
+        site_dir = os.path.dirname(os.path.abspath(package_dir))
+        own = grouped.get(package, [])
+        requires = sorted(get_package_imports(package_dir, package) & set(modules))
+        cache[key] = {
+            "package": package,
+            "version": info["version"],
+            "hook_hash": info["hook_hash"],
+            # مدخلات TOC كما أخرجها التحليل (المسارات نسبية لمجلد الحزم)، تُحقن في البناء
+            # التالي بدلاً من تحليل الحزمة
+            "toc": [[name, to_cache_path(path, site_dir), typecode] for name, path, typecode in own
+                    if typecode in CACHED_TOC_TYPES and path and os.path.isabs(path)],
+            "requires": requires,
+            "created": datetime.now().isoformat(timespec="seconds"),
+        }
+        added.append((package, key))
+    
+    if added:
+        # بناءات متوازية تحدّث الفهرس نفسه: إعادة القراءة والدمج تحت القفل
+        with FileLock(os.path.join(ANALYSIS_CACHE_DIR, ".lock")):
+            merged = load_analysis_cache()
+            merged.update({key: cache[key] for package, key in added})
+            save_analysis_cache(merged)
+    return [package for package, key in added]
+
+
+def apply_analysis_cache(config, python_exe):
+    """إضافات البناء للحزم المخزنة: (الإضافات، الحزم المطابقة، الحزم غير المطابقة)"""
+    wanted = set()
+    for name, script in get_entries(config):
+        with open(script, 'rb') as f:
+            tree = ast.parse(f.read())
+        wanted |= {imp.split(".")[0] for imp in get_source_imports(tree)}
+    wanted |= {name.split(".")[0] for name in config.get("hidden_imports", [])}
+    
+    cache = load_analysis_cache()
+    probe = probe_packages(python_exe, wanted)
+    packages = probe["packages"]
+    
+    hits, misses = [], []
+    cached_toc = []
+    requires = set()
+    pending = sorted(packages)
+    seen = set()
+    while pending:
+        package = pending.pop()
+        if package in seen:
+            continue
+        seen.add(package)
+        info = packages.get(package)
+        entry = cache.get(get_cache_key(package, info, probe["interpreter"])) if info else None
+        site_dir = os.path.dirname(os.path.abspath(info["package_dir"])) if info else ""
+        toc = [[name, os.path.join(site_dir, path), typecode]
+               for name, path, typecode in entry.get("toc", [])] if entry else []
+        if not toc or not all(os.path.exists(path) for name, path, typecode in toc):
+            misses.append(package)
+            continue
+        
+        hits.append(package)
+        cached_toc.extend(toc)
+        requires |= set(entry["requires"])
+        
+        # الحزم التي تحتاجها حزمة مخزنة قد تكون مخزنة أيضاً
+        new_tops = {name.split(".")[0] for name in entry["requires"]} - seen - set(packages)
+        if new_tops:
+            packages.update(probe_packages(python_exe, new_tops)["packages"])
+            pending.extend(sorted(new_tops & set(packages)))
+    
+    # الحزم المطابقة تُستثنى من التحليل (فلا يُبنى رسمها ولا تُشغَّل خطافاتها)
+    # وتُحقن مدخلاتها في ملف .spec، وما تحتاجه من حزم أخرى يُحلَّل كالمعتاد
+    overrides = {
+        "excludes": sorted(hits),
+        "cached_toc": cached_toc,
+        "hidden_imports": sorted(name for name in requires if name.split(".")[0] not in hits),
+    }
+    return overrides, sorted(hits), sorted(misses)
+
+
+def record_analysis_time(config, seconds, cold):
+    """حفظ زمن تحليل آخر بناء بدون ذاكرة التحليل؛ تُرجع الزمن المحفوظ لهذه الإعدادات"""
+    with FileLock(os.path.join(ANALYSIS_CACHE_DIR, ".lock")):
+        times = read_json_file(ANALYSIS_TIMES_FILE, {})
+        key = get_config_hash(config)
+        if cold:
+            times[key] = round(seconds, 2)
+            write_json_atomic(ANALYSIS_TIMES_FILE, times)
+        return times.get(key)
+
+
+def merge_build_overrides(config, overrides):
+    """نسخة من الإعدادات مضافاً إليها قوائم إضافية (استثناءات، بيانات، ...)"""
+    merged = dict(config)
+    for key, values in overrides.items():
+        merged[key] = list(config.get(key, [])) + [v for v in values if v not in config.get(key, [])]
+    return merged
+
+
+def overrides_to_args(overrides):
+    """تحويل الإضافات إلى معاملات سطر أوامر PyInstaller"""
+    sep = ";" if sys.platform == "win32" else ":"
+    args = []
+    for name in overrides.get("excludes", []):
+        args += ["--exclude-module", name]
+    for src, dest in overrides.get("extra_datas", []):
+        args += ["--add-data", f"{src}{sep}{dest}"]
+    for src, dest in overrides.get("extra_binaries", []):
+        args += ["--add-binary", f"{src}{sep}{dest}"]
+    for name in overrides.get("hidden_imports", []):
+        args += ["--hidden-import", name]
+    return args
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# فحص الاعتماديات الثنائية (ELF / PE)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+BINARY_DEPS_CACHE = os.path.join(APP_DATA_DIR, "binary_deps.json")
+BINARY_DEPS_LOCK = os.path.join(APP_DATA_DIR, "binary_deps.lock")
+
+# يتغير عند تعديل المحلل حتى لا تُستخدم نتائج قديمة
+BINARY_SCAN_VERSION = 1
+
+BINARY_SUFFIXES = (".so", ".pyd", ".dll")
+
+# مكتبات نظام ويندوز الافتراضية (API sets) التي لا توجد كملفات فعلية
+WINDOWS_API_SET_PREFIXES = ("api-ms-win-", "ext-ms-")
+
+ELF_DT_NEEDED = 1
+ELF_DT_SONAME = 14
+ELF_DT_RPATH = 15
+ELF_DT_RUNPATH = 29
+ELF_SHT_DYNAMIC = 6
+
+
+def read_at(f, offset, size):
+    """قراءة عدد محدد من البايتات من موضع في الملف"""
+    f.seek(offset)
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("ملف ثنائي مقطوع")
+    return data
+
+
+def read_c_string(f, offset, limit=4096):
+    """قراءة نص منتهٍ بصفر من موضع في الملف"""
+    f.seek(offset)
+    data = f.read(limit)
+    return data.split(b"\0", 1)[0].decode("utf-8", "replace")
+
+
+def parse_elf_dependencies(f):
+    """قراءة DT_NEEDED و RPATH/RUNPATH من قسم .dynamic في ملف ELF"""
+    ident = read_at(f, 0, 16)
+    is_64 = ident[4] == 2
+    endian = "<" if ident[5] == 1 else ">"
+    
+    if is_64:
+        shoff, = struct.unpack(endian + "Q", read_at(f, 0x28, 8))
+        shentsize, shnum = struct.unpack(endian + "HH", read_at(f, 0x3A, 4))
+        section_format, dyn_format = endian + "IIQQQQIIQQ", endian + "qQ"
+    else:
+        shoff, = struct.unpack(endian + "I", read_at(f, 0x20, 4))
+        shentsize, shnum = struct.unpack(endian + "HH", read_at(f, 0x2E, 4))
+        section_format, dyn_format = endian + "IIIIIIIIII", endian + "iI"
+    
+    sections = [
+        struct.unpack(section_format, read_at(f, shoff + i * shentsize, struct.calcsize(section_format)))
+        for i in range(shnum)
+    ]
+    result = {"format": "elf", "needed": [], "rpath": [], "soname": None}
+    dyn_size = struct.calcsize(dyn_format)
+    for section in sections:
+        if section[1] != ELF_SHT_DYNAMIC:
+            continue
+        offset, size, link = section[4], section[5], section[6]
+        strtab_offset = sections[link][4]
+        data = read_at(f, offset, size)
+        for i in range(0, size - dyn_size + 1, dyn_size):
+            tag, value = struct.unpack_from(dyn_format, data, i)
+            if tag == 0:
+                break
+            if tag == ELF_DT_NEEDED:
+                result["needed"].append(read_c_string(f, strtab_offset + value))
+            elif tag in (ELF_DT_RPATH, ELF_DT_RUNPATH):
+                result["rpath"] += read_c_string(f, strtab_offset + value).split(":")
+            elif tag == ELF_DT_SONAME:
+                result["soname"] = read_c_string(f, strtab_offset + value)
+    return result
+
+
+def parse_pe_dependencies(f):
+    """قراءة جداول الاستيراد (العادية والمؤجلة) من ملف PE"""
+    pe_offset, = struct.unpack("<I", read_at(f, 0x3C, 4))
+    if read_at(f, pe_offset, 4) != b"PE\0\0":
+        raise ValueError("توقيع PE غير صالح")
+    section_count, = struct.unpack("<H", read_at(f, pe_offset + 6, 2))
+    optional_size, = struct.unpack("<H", read_at(f, pe_offset + 20, 2))
+    optional = pe_offset + 24
+    magic, = struct.unpack("<H", read_at(f, optional, 2))
+    if magic == 0x20B:
+        image_base, = struct.unpack("<Q", read_at(f, optional + 24, 8))
+        directories = optional + 112
+    else:
+        image_base, = struct.unpack("<I", read_at(f, optional + 28, 4))
+        directories = optional + 96
+    
+    sections = []
+    for i in range(section_count):
+        entry = read_at(f, optional + optional_size + i * 40, 40)
+        virtual_size, virtual_address, raw_size, raw_offset = struct.unpack_from("<IIII", entry, 8)
+        sections.append((virtual_address, max(virtual_size, raw_size), raw_offset))
+    
+    def rva_to_offset(rva):
+        for virtual_address, size, raw_offset in sections:
+            if virtual_address <= rva < virtual_address + size:
+                return rva - virtual_address + raw_offset
+        raise ValueError("عنوان خارج أقسام الملف")
+    
+    result = {"format": "pe", "needed": [], "rpath": [], "soname": None}
+    
+    # جدول الاستيراد (الدليل 1): واصفات بطول 20 بايت تنتهي بواصف فارغ
+    import_rva, import_size = struct.unpack("<II", read_at(f, directories + 8, 8))
+    if import_rva:
+        offset = rva_to_offset(import_rva)
+        while True:
+            descriptor = struct.unpack("<IIIII", read_at(f, offset, 20))
+            if not any(descriptor):
+                break
+            result["needed"].append(read_c_string(f, rva_to_offset(descriptor[3])))
+            offset += 20
+    
+    # جدول الاستيراد المؤجل (الدليل 13): واصفات بطول 32 بايت
+    delay_rva, delay_size = struct.unpack("<II", read_at(f, directories + 13 * 8, 8))
+    if delay_rva:
+        offset = rva_to_offset(delay_rva)
+        while True:
+            attributes, name = struct.unpack("<II", read_at(f, offset, 8))
+            if not name:
+                break
+            # الإصدار الأول من الواصف يخزن عناوين مطلقة بدل RVA
+            rva = name if attributes & 1 else name - image_base
+            result["needed"].append(read_c_string(f, rva_to_offset(rva)))
+            offset += 32
+    return result
+
+
+def parse_binary_dependencies(path):
+    """المكتبات التي يعتمد عليها ملف ثنائي، أو None إن لم يكن ELF أو PE"""
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+        if magic == b"\x7fELF":
+            return parse_elf_dependencies(f)
+        if magic[:2] == b"MZ":
+            return parse_pe_dependencies(f)
+    return None
+
+
+def is_binary_file(name):
+    """هل اسم الملف لمكتبة ثنائية (.so و .so.1.2 و .pyd و .dll)"""
+    lower = name.lower()
+    return lower.endswith(BINARY_SUFFIXES) or ".so." in lower
+
+
+def get_system_library_dirs():
+    """مجلدات البحث الافتراضية عن المكتبات المشتركة في النظام"""
+    if sys.platform == "win32":
+        system_root = os.environ.get("SystemRoot", r"C:\Windows")
+        dirs = [os.path.join(system_root, "System32"), sys.base_prefix]
+        dirs += os.environ.get("PATH", "").split(os.pathsep)
+    else:
+        import glob
+        dirs = os.environ.get("LD_LIBRARY_PATH", "").split(os.pathsep)
+        dirs += ["/lib", "/usr/lib", "/lib64", "/usr/lib64", "/usr/local/lib"]
+        dirs += glob.glob("/lib/*-linux-gnu") + glob.glob("/usr/lib/*-linux-gnu")
+        dirs.append(os.path.join(sys.base_prefix, "lib"))
+    return [d for d in dict.fromkeys(dirs) if d and os.path.isdir(d)]
+
+
+# فهرس (المسار، الحجم، وقت التعديل) يتجنب إعادة حساب البصمة لملف لم يتغير
+class BinaryDependencyScanner:
+    """رسم الاعتماديات بين المكتبات الثنائية مع تخزين تحليل كل ملف حسب بصمته"""
+    
+    def __init__(self, cache_path=BINARY_DEPS_CACHE):
+        self.cache_path = cache_path
+        cache = read_json_file(cache_path, {})
+        if cache.get("version") != BINARY_SCAN_VERSION:
+            cache = {}
+        self.files = cache.get("files", {})
+        self.binaries = cache.get("binaries", {})
+        self.new_files = {}
+        self.new_binaries = {}
+        self.hits = 0
+        self.misses = 0
+        self.system_dirs = get_system_library_dirs()
+    
+    def get_file_hash(self, path):
+        """بصمة الملف من الفهرس إن لم يتغير حجمه ووقت تعديله"""
+        st = os.stat(path)
+        known = self.files.get(path)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+        digest = file_sha256(path)
+        self.new_files[path] = self.files[path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+    
+    def get_dependencies(self, path):
+        """تحليل ملف ثنائي (من الذاكرة إن وُجد). يُرجع (البصمة، النتيجة)"""
+        digest = self.get_file_hash(path)
+        if digest in self.binaries:
+            self.hits += 1
+            return digest, self.binaries[digest]
+        self.misses += 1
+        try:
+            info = parse_binary_dependencies(path)
+        except (OSError, ValueError, struct.error, IndexError) as e:
+            info = {"format": "error", "error": str(e), "needed": [], "rpath": [], "soname": None}
+        info = info or {"format": "other", "needed": [], "rpath": [], "soname": None}
+        self.new_binaries[digest] = self.binaries[digest] = info
+        return digest, info
+    
+    def resolve(self, name, binary_path, info, local_index):
+        """البحث عن مكتبة: RPATH، مجلد الملف، الملفات المفحوصة، ثم مجلدات النظام"""
+        origin = os.path.dirname(binary_path)
+        dirs = [d.replace("$ORIGIN", origin).replace("${ORIGIN}", origin) for d in info["rpath"]]
+        dirs.append(origin)
+        for folder in dirs:
+            candidate = os.path.join(folder, name)
+            if os.path.isfile(candidate):
+                return os.path.normpath(candidate)
+        
+        key = name.lower() if sys.platform == "win32" else name
+        if key in local_index:
+            return local_index[key][0]
+        for folder in self.system_dirs:
+            candidate = os.path.join(folder, name)
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+    
+    def scan(self, roots):
+        """فحص المكتبات الثنائية ومتابعة اعتمادياتها: الرسم والمفقودة والمكررة بمحتوى مختلف"""
+        pending = []
+        for root in roots:
+            if os.path.isfile(root):
+                pending.append(os.path.abspath(root))
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                pending += [os.path.join(dirpath, n) for n in filenames if is_binary_file(n)]
+        
+        local_index = {}
+        for path in pending:
+            key = os.path.basename(path)
+            local_index.setdefault(key.lower() if sys.platform == "win32" else key, []).append(path)
+        
+        graph, hashes, missing = {}, {}, {}
+        while pending:
+            path = pending.pop()
+            if path in graph:
+                continue
+            digest, info = self.get_dependencies(path)
+            hashes[path] = digest
+            graph[path] = []
+            for name in info["needed"]:
+                if name.lower().startswith(WINDOWS_API_SET_PREFIXES):
+                    continue
+                resolved = self.resolve(name, path, info, local_index)
+                if resolved is None:
+                    missing.setdefault(name, []).append(path)
+                    continue
+                graph[path].append(resolved)
+                if resolved not in graph:
+                    pending.append(resolved)
+        
+        by_name = {}
+        for path, digest in hashes.items():
+            by_name.setdefault(os.path.basename(path).lower(), {}).setdefault(digest, []).append(path)
+        duplicates = {
+            name: sorted(p for paths in variants.values() for p in paths)
+            for name, variants in by_name.items() if len(variants) > 1
+        }
+        return {
+            "graph": graph,
+            "missing": {name: sorted(users) for name, users in sorted(missing.items())},
+            "duplicates": duplicates,
+            "binaries": len(graph),
+        }
+    
+    def save(self):
+        """حفظ النتائج الجديدة في الذاكرة المشتركة (دمج مع ما كتبته عمليات أخرى)"""
+        if not self.new_files and not self.new_binaries:
+            return
+        with FileLock(BINARY_DEPS_LOCK):
+            cache = read_json_file(self.cache_path, {})
+            if cache.get("version") != BINARY_SCAN_VERSION:
+                cache = {"version": BINARY_SCAN_VERSION, "files": {}, "binaries": {}}
+            cache["files"].update(self.new_files)
+            cache["binaries"].update(self.new_binaries)
+            write_json_atomic(self.cache_path, cache)
+        self.new_files = {}
+        self.new_binaries = {}
+
+
+def get_binary_scan_roots(config, python_exe):
+    """مجلدات الحزم الخارجية التي يستوردها المشروع والملفات الثنائية الإضافية"""
+    probe = probe_packages(python_exe, get_third_party_roots(config))
+    roots = [info["package_dir"] for info in probe["packages"].values()]
+    roots += [src for src, dest in config.get("extra_binaries", [])]
+    return roots
+
+
+def scan_project_binaries(config, python_exe):
+    """فحص المكتبات الثنائية للمشروع وحفظ النتائج. يُرجع (التقرير، الماسح)"""
+    scanner = BinaryDependencyScanner()
+    report = scanner.scan(get_binary_scan_roots(config, python_exe))
+    scanner.save()
+    return report, scanner
+
+
+def format_binary_report(report, scanner, seconds):
+    """أسطر سجل لنتيجة الفحص"""
+    lines = [
+        f"🔬 فحص الاعتماديات الثنائية: {report['binaries']} ملف في {seconds:.2f} ث "
+        f"({scanner.hits} من الذاكرة، {scanner.misses} فحص جديد)"
+    ]
+    for name, users in report["missing"].items():
+        lines.append(f"❌ مكتبة مفقودة: {name} (تحتاجها: {', '.join(os.path.basename(u) for u in users[:3])})")
+    for name, paths in report["duplicates"].items():
+        lines.append(f"⚠️ مكتبة مكررة بنسخ مختلفة: {name}")
+        lines += [f"   {path}" for path in paths]
+    if not report["missing"] and not report["duplicates"]:
+        lines.append("✅ لا توجد مكتبات مفقودة أو مكررة")
+    return lines
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# حدود الموارد وقبول البناء
+# ═══════════════════════════════════════════════════════════════════════════════
+
+BUILD_HISTORY_FILE = os.path.join(APP_DATA_DIR, "build_history.json")
+ACTIVE_BUILDS_FILE = os.path.join(APP_DATA_DIR, "active_builds.json")
+ACTIVE_BUILDS_LOCK = os.path.join(APP_DATA_DIR, "active_builds.lock")
+
+# الذاكرة المتوقعة لبناء بلا سجل سابق، وهامش الأمان فوق أعلى ذروة مسجلة
+DEFAULT_BUILD_MEMORY_MB = 1500
+MEMORY_PREDICTION_MARGIN = 1.15
+MEMORY_HISTORY_SIZE = 5
+ADMISSION_POLL_SECONDS = 2
+
+# مفاتيح لا تؤثر على ناتج البناء فلا تدخل في بصمة الإعدادات
+NON_BUILD_KEYS = {
+    "validate", "trace_entry", "trace_timeout", "memory_limit_mb",
+    "cpu_limit_seconds", "admission_control", "memory_budget_mb",
+    "metrics_file", "metrics_port", "compare_backends", "benchmark_command", "benchmark_runs",
+    "compare_archive_modes", "scratch_build", "scratch_dir", "log_store", "compare_prune",
+    "release",
+}
+
+
+def get_config_hash(config):
+    """بصمة ثابتة لإعدادات البناء"""
+    relevant = {k: v for k, v in config.items() if k not in NON_BUILD_KEYS}
+    data = json.dumps(relevant, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+class FileLock:
+    """قفل بين العمليات عبر ملف"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.handle = None
+    
+    def __enter__(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.handle = open(self.path, 'a+b')
+        if sys.platform == "win32":
+            import msvcrt
+            self.handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(self.handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.05)
+        else:
+            import fcntl
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX)
+        return self
+    
+    def __exit__(self, *exc):
+        if sys.platform == "win32":
+            import msvcrt
+            self.handle.seek(0)
+            msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        self.handle.close()
+        self.handle = None
+
+
+def read_json_file(path, default):
+    """قراءة ملف JSON مع قيمة افتراضية عند غيابه أو تلفه"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def write_json_atomic(path, data):
+    """كتابة ملف JSON بشكل ذري (ملف مؤقت ثم إعادة تسمية)"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def is_pid_alive(pid):
+    """هل العملية ما زالت تعمل"""
+    if sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        kernel32.CloseHandle(handle)
+        return code.value == 259
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def get_memory_info_mb():
+    """(إجمالي الذاكرة، المتاح منها) بالميغابايت، وNone لما يتعذر قياسه"""
+    if sys.platform == "win32":
+        import ctypes
+        
+        class MEMORYSTATUSEX(ctypes.Structure):
+            _fields_ = [
+                ("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+            ]
+        
+        status = MEMORYSTATUSEX()
+        status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+        ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+        return status.ullTotalPhys // 2**20, status.ullAvailPhys // 2**20
+    
+    if os.path.exists("/proc/meminfo"):
+        values = {}
+        with open("/proc/meminfo") as f:
+            for line in f:
+                key, _, rest = line.partition(":")
+                values[key] = int(rest.split()[0]) // 1024
+        return values.get("MemTotal"), values.get("MemAvailable")
+    
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2**20, None
+    except (ValueError, OSError, AttributeError):
+        return None, None
+
+
+def predict_build_memory(config_hash):
+    """الذاكرة المتوقعة للبناء من ذروات البناءات السابقة لنفس الإعدادات"""
+    history = read_json_file(BUILD_HISTORY_FILE, {})
+    peaks = history.get(config_hash, {}).get("peaks_mb", [])
+    if not peaks:
+        return DEFAULT_BUILD_MEMORY_MB, False
+    return int(max(peaks) * MEMORY_PREDICTION_MARGIN), True
+
+
+def record_build_memory(config_hash, peak_mb, seconds):
+    """تسجيل ذروة ذاكرة البناء ومدته"""
+    with FileLock(ACTIVE_BUILDS_LOCK):
+        history = read_json_file(BUILD_HISTORY_FILE, {})
+        entry = history.setdefault(config_hash, {"peaks_mb": [], "seconds": []})
+        entry["peaks_mb"] = (entry["peaks_mb"] + [round(peak_mb)])[-MEMORY_HISTORY_SIZE:]
+        entry["seconds"] = (entry.get("seconds", []) + [round(seconds, 1)])[-MEMORY_HISTORY_SIZE:]
+        write_json_atomic(BUILD_HISTORY_FILE, history)
+
+
+def get_memory_budget_mb(budget_mb=0):
+    """ميزانية الذاكرة لكل البناءات المتزامنة على هذا الجهاز"""
+    if budget_mb:
+        return budget_mb
+    total, _ = get_memory_info_mb()
+    return int(total * 0.85) if total else None
+
+
+# يُقبل البناء وحده دائماً حتى لا ينتظر بناء كبير إلى الأبد
+def try_admit_build(token, predicted_mb, budget_mb):
+    """حجز ذاكرة لبناء جديد في سجل البناءات النشطة: (مقبول، المحجوز حالياً)"""
+    with FileLock(ACTIVE_BUILDS_LOCK):
+        active = read_json_file(ACTIVE_BUILDS_FILE, {})
+        active = {k: v for k, v in active.items() if is_pid_alive(v["pid"])}
+        reserved = sum(v["predicted_mb"] for v in active.values())
+        
+        if active and budget_mb and reserved + predicted_mb > budget_mb:
+            write_json_atomic(ACTIVE_BUILDS_FILE, active)
+            return False, reserved
+        
+        active[token] = {
+            "pid": os.getpid(),
+            "predicted_mb": predicted_mb,
+            "started": datetime.now().isoformat(timespec="seconds"),
+        }
+        write_json_atomic(ACTIVE_BUILDS_FILE, active)
+        return True, reserved
+
+
+def release_build(token):
+    """إلغاء حجز ذاكرة البناء"""
+    with FileLock(ACTIVE_BUILDS_LOCK):
+        active = read_json_file(ACTIVE_BUILDS_FILE, {})
+        if active.pop(token, None) is not None:
+            write_json_atomic(ACTIVE_BUILDS_FILE, active)
+
+
+# Windows: Job Object يطبّق الحدود على شجرة العمليات. لينكس/ماك: حد المعالج عبر rlimits،
+# وحد الذاكرة يُقارن بـ RSS الشجرة في عينات القياس (RLIMIT_AS يحد الذاكرة الافتراضية
+# المحجوزة دون استخدام فيُفشل البناء قبل الحد الحقيقي بكثير)
+class ResourceLimits:
+    """حدود الذاكرة ووقت المعالج لعملية البناء وقياس ذروة الذاكرة"""
+    
+    def __init__(self, memory_mb=0, cpu_seconds=0):
+        self.memory_mb = memory_mb
+        self.cpu_seconds = cpu_seconds
+        self.job = None
+        self.peak_mb = None
+        self.sampled_peak_mb = 0
+        self.memory_exceeded = False
+    
+    def popen_kwargs(self):
+        """معاملات إضافية لـ Popen"""
+        if sys.platform not in ("win32", "linux") and self.cpu_seconds:
+            return {"preexec_fn": self.apply_rlimits}
+        return {}
+    
+    def get_rlimits(self):
+        """قائمة (نوع الحد، القيمة) المطلوب تطبيقها"""
+        import resource
+        limits = []
+        if self.cpu_seconds:
+            limits.append((resource.RLIMIT_CPU, (self.cpu_seconds, self.cpu_seconds)))
+        return limits
+    
+    def apply_rlimits(self):
+        """تُنفَّذ داخل العملية الفرعية قبل تشغيل البرنامج"""
+        import resource
+        for kind, value in self.get_rlimits():
+            resource.setrlimit(kind, value)
+    
+    def attach(self, process):
+        """تطبيق الحدود على عملية بدأت للتو"""
+        if sys.platform == "linux":
+            import resource
+            for kind, value in self.get_rlimits():
+                resource.prlimit(process.pid, kind, value)
+        elif sys.platform == "win32":
+            self.job = create_job_object(self.memory_mb, self.cpu_seconds)
+            assign_job_object(self.job, process)
+    
+    def can_enforce_memory(self):
+        """هل يمكن تطبيق حد الذاكرة على هذا النظام"""
+        return sys.platform == "win32" or psutil is not None or os.path.isdir("/proc")
+    
+    def check_memory(self, sample, process):
+        """مقارنة عينة القياس بحد الذاكرة وإنهاء شجرة البناء عند تجاوزه"""
+        self.sampled_peak_mb = max(self.sampled_peak_mb, sample["rss_bytes"] / 2**20)
+        # Windows: الحد يطبقه Job Object بنفسه
+        if sys.platform == "win32" or not self.memory_mb or self.memory_exceeded:
+            return False
+        if sample["rss_bytes"] < self.memory_mb * 2**20:
+            return False
+        self.memory_exceeded = True
+        kill_process_tree(process.pid)
+        return True
+    
+    def wait(self, process):
+        """انتظار انتهاء العملية وقراءة ذروة الذاكرة"""
+        if sys.platform == "win32":
+            process.wait()
+            if self.job:
+                self.peak_mb = query_job_peak_memory(self.job) / 2**20
+                close_job_object(self.job)
+                self.job = None
+            return process.returncode
+        
+        # Popen.wait وليس os.wait4: خيط الواجهة قد يحصد العملية عبر poll()
+        # (إيقاف مؤقت أو إلغاء) فيفشل wait4 لبناء ناجح. الذروة من عينات شجرة العمليات
+        process.wait()
+        self.peak_mb = self.sampled_peak_mb or None
+        return process.returncode
+
+
+def get_job_structures():
+    """بنى Job Object من Windows API"""
+    import ctypes
+    from ctypes import wintypes
+    
+    class JOBOBJECT_BASIC_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("PerProcessUserTimeLimit", ctypes.c_int64),
+            ("PerJobUserTimeLimit", ctypes.c_int64),
+            ("LimitFlags", wintypes.DWORD),
+            ("MinimumWorkingSetSize", ctypes.c_size_t),
+            ("MaximumWorkingSetSize", ctypes.c_size_t),
+            ("ActiveProcessLimit", wintypes.DWORD),
+            ("Affinity", ctypes.c_size_t),
+            ("PriorityClass", wintypes.DWORD),
+            ("SchedulingClass", wintypes.DWORD),
+        ]
+    
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_uint64) for name in (
+            "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+            "ReadTransferCount", "WriteTransferCount", "OtherTransferCount",
+        )]
+    
+    class JOBOBJECT_EXTENDED_LIMIT_INFORMATION(ctypes.Structure):
+        _fields_ = [
+            ("BasicLimitInformation", JOBOBJECT_BASIC_LIMIT_INFORMATION),
+            ("IoInfo", IO_COUNTERS),
+            ("ProcessMemoryLimit", ctypes.c_size_t),
+            ("JobMemoryLimit", ctypes.c_size_t),
+            ("PeakProcessMemoryUsed", ctypes.c_size_t),
+            ("PeakJobMemoryUsed", ctypes.c_size_t),
+        ]
+    
+    return JOBOBJECT_EXTENDED_LIMIT_INFORMATION
+
+
+JOB_OBJECT_EXTENDED_LIMIT_INFORMATION_CLASS = 9
+JOB_OBJECT_LIMIT_JOB_TIME = 0x4
+JOB_OBJECT_LIMIT_JOB_MEMORY = 0x200
+JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE = 0x2000
+
+
+def create_job_object(memory_mb, cpu_seconds):
+    """إنشاء Job Object بحدود الذاكرة ووقت المعالج لشجرة العمليات"""
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    job = kernel32.CreateJobObjectW(None, None)
+    
+    info = get_job_structures()()
+    flags = JOB_OBJECT_LIMIT_KILL_ON_JOB_CLOSE
+    if memory_mb:
+        flags |= JOB_OBJECT_LIMIT_JOB_MEMORY
+        info.JobMemoryLimit = memory_mb * 2**20
+    if cpu_seconds:
+        flags |= JOB_OBJECT_LIMIT_JOB_TIME
+        # بوحدات 100 نانو ثانية
+        info.BasicLimitInformation.PerJobUserTimeLimit = cpu_seconds * 10**7
+    info.BasicLimitInformation.LimitFlags = flags
+    
+    kernel32.SetInformationJobObject(
+        job, JOB_OBJECT_EXTENDED_LIMIT_INFORMATION_CLASS,
+        ctypes.byref(info), ctypes.sizeof(info)
+    )
+    return job
+
+
+def assign_job_object(job, process):
+    """إضافة عملية إلى Job Object"""
+    import ctypes
+    ctypes.windll.kernel32.AssignProcessToJobObject(job, int(process._handle))
+
+
+def query_job_peak_memory(job):
+    """ذروة الذاكرة لكل عمليات Job Object بالبايت"""
+    import ctypes
+    info = get_job_structures()()
+    ctypes.windll.kernel32.QueryInformationJobObject(
+        job, JOB_OBJECT_EXTENDED_LIMIT_INFORMATION_CLASS,
+        ctypes.byref(info), ctypes.sizeof(info), None
+    )
+    return info.PeakJobMemoryUsed
+
+
+def close_job_object(job):
+    """إغلاق Job Object"""
+    import ctypes
+    ctypes.windll.kernel32.CloseHandle(job)
+
+
+def signal_process(process, suspend):
+    """إيقاف عملية مؤقتاً أو استئنافها (لمجموعة العمليات كاملة إن كانت قائدتها)"""
+    if sys.platform == "win32":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x0800, False, process.pid)  # PROCESS_SUSPEND_RESUME
+        if not handle:
+            raise OSError("تعذر فتح العملية")
+        try:
+            ntdll = ctypes.windll.ntdll
+            (ntdll.NtSuspendProcess if suspend else ntdll.NtResumeProcess)(handle)
+        finally:
+            kernel32.CloseHandle(handle)
+        return
+    
+    import signal
+    sig = signal.SIGSTOP if suspend else signal.SIGCONT
+    if os.getpgid(process.pid) == process.pid:
+        os.killpg(process.pid, sig)
+    else:
+        os.kill(process.pid, sig)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# قياس الموارد أثناء البناء
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# الفاصل بين العينات (ثوانٍ) - كل عينة تقرأ /proc أو psutil لشجرة العمليات فقط
+TELEMETRY_INTERVAL = 1.0
+
+# عدد العينات المعروضة في الرسوم المصغرة
+TELEMETRY_HISTORY = 120
+
+
+def list_proc_tree(root_pid):
+    """معرّفات العملية وكل العمليات المتفرعة منها (من /proc)"""
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'rb') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        ppid = int(stat[stat.rfind(b")") + 2:].split()[1])
+        children.setdefault(ppid, []).append(int(entry))
+    
+    pids, pending = [], [root_pid]
+    while pending:
+        pid = pending.pop()
+        pids.append(pid)
+        pending += children.get(pid, [])
+    return pids
+
+
+def kill_process_tree(root_pid):
+    """إنهاء عملية وكل ما تفرّع منها (لينكس/ماك)"""
+    import signal
+    if psutil is not None:
+        try:
+            root = psutil.Process(root_pid)
+            pids = [root_pid] + [child.pid for child in root.children(recursive=True)]
+        except psutil.NoSuchProcess:
+            return
+    elif os.path.isdir("/proc"):
+        pids = list_proc_tree(root_pid)
+    else:
+        pids = [root_pid]
+    for pid in pids:
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except OSError:
+            continue
+
+
+def sample_proc_tree(root_pid):
+    """عينة موارد شجرة العمليات من /proc (لينكس بدون psutil)"""
+    ticks = os.sysconf("SC_CLK_TCK")
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    sample = {"cpu_seconds": 0.0, "rss_bytes": 0, "read_bytes": 0, "write_bytes": 0,
+              "open_files": 0, "processes": 0}
+    for pid in list_proc_tree(root_pid):
+        try:
+            with open(f"/proc/{pid}/stat", 'rb') as f:
+                fields = f.read().rsplit(b")", 1)[1].split()
+            sample["cpu_seconds"] += (int(fields[11]) + int(fields[12])) / ticks
+            sample["rss_bytes"] += int(fields[21]) * page_size
+            sample["processes"] += 1
+            sample["open_files"] += len(os.listdir(f"/proc/{pid}/fd"))
+            with open(f"/proc/{pid}/io") as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    if key in ("read_bytes", "write_bytes"):
+                        sample[key] += int(value)
+        except (OSError, IndexError, ValueError):
+            continue
+    return sample
+
+
+def sample_psutil_tree(root_pid):
+    """عينة موارد شجرة العمليات عبر psutil"""
+    sample = {"cpu_seconds": 0.0, "rss_bytes": 0, "read_bytes": 0, "write_bytes": 0,
+              "open_files": 0, "processes": 0}
+    root = psutil.Process(root_pid)
+    for process in [root] + root.children(recursive=True):
+        try:
+            with process.oneshot():
+                times = process.cpu_times()
+                sample["cpu_seconds"] += times.user + times.system
+                sample["rss_bytes"] += process.memory_info().rss
+                sample["processes"] += 1
+                if hasattr(process, "io_counters"):
+                    io = process.io_counters()
+                    sample["read_bytes"] += io.read_bytes
+                    sample["write_bytes"] += io.write_bytes
+                if hasattr(process, "num_fds"):
+                    sample["open_files"] += process.num_fds()
+                else:
+                    sample["open_files"] += process.num_handles()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return sample
+
+
+def sample_windows_process(pid):
+    """عينة موارد العملية الرئيسية عبر Windows API (بدون psutil)"""
+    import ctypes
+    from ctypes import wintypes
+    
+    class IO_COUNTERS(ctypes.Structure):
+        _fields_ = [(name, ctypes.c_ulonglong) for name in (
+            "ReadOperationCount", "WriteOperationCount", "OtherOperationCount",
+            "ReadTransferCount", "WriteTransferCount", "OtherTransferCount")]
+    
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD)] + [
+            (name, ctypes.c_size_t) for name in (
+                "PeakWorkingSetSize", "WorkingSetSize", "QuotaPeakPagedPoolUsage",
+                "QuotaPagedPoolUsage", "QuotaPeakNonPagedPoolUsage", "QuotaNonPagedPoolUsage",
+                "PagefileUsage", "PeakPagefileUsage")]
+    
+    kernel32 = ctypes.windll.kernel32
+    handle = kernel32.OpenProcess(0x1000 | 0x0010, False, pid)  # QUERY_LIMITED | VM_READ
+    if not handle:
+        raise OSError("تعذر فتح العملية")
+    try:
+        creation, exit_time, kernel, user = (wintypes.FILETIME() for _ in range(4))
+        kernel32.GetProcessTimes(handle, ctypes.byref(creation), ctypes.byref(exit_time),
+                                 ctypes.byref(kernel), ctypes.byref(user))
+        to_seconds = lambda ft: ((ft.dwHighDateTime << 32) | ft.dwLowDateTime) / 1e7
+        memory = PROCESS_MEMORY_COUNTERS()
+        memory.cb = ctypes.sizeof(memory)
+        kernel32.K32GetProcessMemoryInfo(handle, ctypes.byref(memory), memory.cb)
+        io = IO_COUNTERS()
+        kernel32.GetProcessIoCounters(handle, ctypes.byref(io))
+        handles = wintypes.DWORD()
+        kernel32.GetProcessHandleCount(handle, ctypes.byref(handles))
+    finally:
+        kernel32.CloseHandle(handle)
+    return {
+        "cpu_seconds": to_seconds(kernel) + to_seconds(user),
+        "rss_bytes": memory.WorkingSetSize,
+        "read_bytes": io.ReadTransferCount,
+        "write_bytes": io.WriteTransferCount,
+        "open_files": handles.value,
+        "processes": 1,
+    }
+
+
+def sample_process_tree(pid):
+    """عينة موارد عملية البناء وما تفرّع منها، أو None إن تعذر القياس"""
+    if psutil is not None:
+        sample = sample_psutil_tree(pid)
+    elif os.path.isdir("/proc"):
+        sample = sample_proc_tree(pid)
+    elif sys.platform == "win32":
+        sample = sample_windows_process(pid)
+    else:
+        return None
+    # انتهت العملية ولم يبق ما يُقاس
+    return sample if sample["processes"] else None
+
+
+class TelemetrySampler:
+    """تحويل العينات التراكمية إلى معدلات (نسبة المعالج، سرعة القراءة والكتابة)"""
+    
+    def __init__(self, pid):
+        self.pid = pid
+        self.started = time.perf_counter()
+        self.previous = None
+    
+    def sample(self):
+        now = time.perf_counter()
+        raw = sample_process_tree(self.pid)
+        if raw is None:
+            return None
+        result = dict(raw, elapsed_seconds=now - self.started,
+                      cpu_percent=0.0, read_rate=0.0, write_rate=0.0)
+        if self.previous:
+            last_time, last = self.previous
+            wall = max(now - last_time, 1e-6)
+            result["cpu_percent"] = max(0.0, (raw["cpu_seconds"] - last["cpu_seconds"]) / wall * 100)
+            result["read_rate"] = max(0.0, (raw["read_bytes"] - last["read_bytes"]) / wall)
+            result["write_rate"] = max(0.0, (raw["write_bytes"] - last["write_bytes"]) / wall)
+        self.previous = (now, raw)
+        return result
+
+
+# اسم المقياس، النوع، الوصف، مفتاح العينة
+PROMETHEUS_METRICS = (
+    ("py2exe_build_cpu_percent", "gauge", "CPU usage of the build process tree", "cpu_percent"),
+    ("py2exe_build_cpu_seconds_total", "counter", "CPU time used by the build", "cpu_seconds"),
+    ("py2exe_build_rss_bytes", "gauge", "Resident memory of the build process tree", "rss_bytes"),
+    ("py2exe_build_read_bytes_total", "counter", "Bytes read from disk", "read_bytes"),
+    ("py2exe_build_write_bytes_total", "counter", "Bytes written to disk", "write_bytes"),
+    ("py2exe_build_read_bytes_per_second", "gauge", "Disk read rate", "read_rate"),
+    ("py2exe_build_write_bytes_per_second", "gauge", "Disk write rate", "write_rate"),
+    ("py2exe_build_open_files", "gauge", "Open file descriptors or handles", "open_files"),
+    ("py2exe_build_processes", "gauge", "Processes in the build tree", "processes"),
+    ("py2exe_build_elapsed_seconds", "gauge", "Seconds since the build started", "elapsed_seconds"),
+)
+
+
+class MetricsRegistry:
+    """آخر عينة لكل بناء جارٍ، بصيغة Prometheus النصية (ملف أو نقطة HTTP)"""
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.builds = {}
+        self.server = None
+    
+    def update(self, build_id, labels, sample, metrics_file=None):
+        with self.lock:
+            self.builds[build_id] = (labels, sample)
+        if metrics_file:
+            self.write(metrics_file)
+    
+    def remove(self, build_id, metrics_file=None):
+        with self.lock:
+            self.builds.pop(build_id, None)
+        if metrics_file:
+            self.write(metrics_file)
+    
+    def render(self):
+        with self.lock:
+            builds = list(self.builds.values())
+        lines = []
+        for name, kind, help_text, key in PROMETHEUS_METRICS:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, sample in builds:
+                label_text = ",".join(
+                    '%s="%s"' % (k, str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+                    for k, v in sorted(labels.items())
+                )
+                lines.append(f"{name}{{{label_text}}} {sample[key]:.12g}")
+        return "\n".join(lines) + "\n"
+    
+    def write(self, path):
+        """كتابة ذرية (مناسبة لـ textfile collector في node_exporter)"""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(tmp_path, path)
+    
+    def serve(self, port):
+        """تشغيل نقطة /metrics على المنفذ المحدد (مرة واحدة لكل عملية)"""
+        if self.server:
+            return
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        registry = self
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode("utf-8")
+                self.send_response(200 if self.path.startswith("/metrics") else 404)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+
+METRICS = MetricsRegistry()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# تثبيت PyInstaller والحزم من مخزن الحزم المحلي
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# مخزن ملفات wheel: يُملأ عند أول تثبيت عبر الشبكة أو مسبقاً بأمر prefetch
+WHEELHOUSE_DIR = os.path.join(APP_DATA_DIR, "wheelhouse")
+
+# الحزم التي يحتاجها البناء عند عدم تثبيت إصدارات محددة للمشروع
+BOOTSTRAP_PACKAGES = ("pyinstaller", "pyinstaller-hooks-contrib")
+
+
+def run_logged(cmd, log, on_start=None):
+    """تشغيل أمر مع تمرير مخرجاته سطراً بسطر. يُرجع رمز الخروج"""
+    process = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+        text=True, bufsize=1
+    )
+    if on_start:
+        on_start(process)
+    for line in process.stdout:
+        log(line.rstrip())
+    return process.wait()
+
+
+def normalize_package_name(name):
+    """توحيد اسم الحزمة للمقارنة (PEP 503)"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def get_requirement_name(requirement):
+    """اسم الحزمة من سطر متطلب مثل pyinstaller==6.3.0"""
+    return normalize_package_name(re.split(r"[<>=!~;\[ ]", requirement, 1)[0])
+
+
+def get_pinned_packages(config):
+    """الإصدارات المثبتة للمشروع، مع حزم أداة التجميد لما لم يُحدد"""
+    pins = config.get("pinned_packages", "").split()
+    names = {get_requirement_name(pin) for pin in pins}
+    return pins + [
+        name for name in get_backend(config).packages if get_requirement_name(name) not in names
+    ]
+
+
+def apply_pins(requirements, pins):
+    """استبدال متطلبات بإصداراتها المثبتة للمشروع"""
+    pinned = {get_requirement_name(pin): pin for pin in pins if "==" in pin}
+    result = [req for req in requirements if get_requirement_name(req) not in pinned]
+    return sorted(result + list(pinned.values()))
+
+
+def get_pyinstaller_version(python_exe):
+    """إصدار PyInstaller في المفسر أو None إن لم يكن مثبتاً"""
+    try:
+        result = subprocess.run(
+            [python_exe, "-m", "PyInstaller", "--version"],
+            capture_output=True, text=True, timeout=60
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def is_pinned_version(pinned, installed):
+    """هل يطابق الإصدار المثبت الإصدار المحدد للمشروع (6.3 يطابق 6.3.0)"""
+    if SpecifierSet is not None:
+        try:
+            return SpecifierSet(f"=={pinned}").contains(installed, prereleases=True)
+        except InvalidSpecifier:
+            pass
+    strip = lambda version: re.sub(r"(\.0+)+$", "", version.strip())
+    return strip(pinned) == strip(installed)
+
+
+def is_bootstrap_needed(config, installed_version):
+    """هل يجب تثبيت أداة التجميد (غير مثبتة، أو إصدارها يخالف المثبت للمشروع)"""
+    if not installed_version:
+        return True
+    tool = get_requirement_name(get_backend(config).packages[0])
+    for pin in config.get("pinned_packages", "").split():
+        if get_requirement_name(pin) == tool and "==" in pin:
+            return not is_pinned_version(pin.split("==", 1)[1], installed_version)
+    return False
+
+
+def prefetch_wheels(python_exe, packages, log, on_start=None, wheelhouse=WHEELHOUSE_DIR, extra_args=()):
+    """تنزيل الحزم واعتمادياتها إلى مخزن الحزم. يُرجع رمز الخروج"""
+    os.makedirs(wheelhouse, exist_ok=True)
+    return run_logged(
+        [python_exe, "-m", "pip", "download", "--disable-pip-version-check",
+         "-d", wheelhouse, "--find-links", wheelhouse, *extra_args, *packages],
+        log, on_start
+    )
+
+
+def pip_install(python_exe, packages, log, on_start=None, wheelhouse=WHEELHOUSE_DIR, extra_args=()):
+    """تثبيت الحزم من مخزن الحزم دون شبكة، وتنزيل الناقص إليه أولاً"""
+    install = [
+        python_exe, "-m", "pip", "install", "--disable-pip-version-check",
+        "--no-index", "--find-links", wheelhouse, *extra_args, *packages
+    ]
+    if os.path.isdir(wheelhouse):
+        log(f"📦 التثبيت من مخزن الحزم المحلي: {wheelhouse}")
+        if run_logged(install, log, on_start) == 0:
+            return
+    
+    log("🌐 حزم غير موجودة في المخزن المحلي - جاري التنزيل...")
+    if prefetch_wheels(python_exe, packages, log, on_start, wheelhouse, extra_args) != 0:
+        raise RuntimeError("فشل تنزيل الحزم (تحقق من الاتصال أو من محتوى مخزن الحزم)")
+    if run_logged(install, log, on_start) != 0:
+        raise RuntimeError("فشل تثبيت الحزم من مخزن الحزم")
+
+
+class BootstrapThread(QThread):
+    """خيط تثبيت أداة التجميد (PyInstaller وحزم الخطافات افتراضياً) في الخلفية"""
+    
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+    
+    def __init__(self, config, python_exe=None):
+        super().__init__()
+        self.config = config
+        self.python_exe = python_exe or sys.executable
+    
+    def run(self):
+        # فحص الإصدار هنا لا في خيط الواجهة (تشغيل المفسر قد يستغرق ثوانٍ)
+        backend = get_backend(self.config)
+        version = backend.get_version(self.python_exe)
+        if not is_bootstrap_needed(self.config, version):
+            self.finished_signal.emit(True, version)
+            return
+        
+        packages = get_pinned_packages(self.config)
+        self.log_signal.emit(f"📦 جاري تثبيت: {' '.join(packages)}")
+        started = time.perf_counter()
+        try:
+            pip_install(self.python_exe, packages, self.log_signal.emit)
+        except Exception as e:
+            self.log_signal.emit(f"❌ {str(e)}")
+            self.finished_signal.emit(False, str(e))
+            return
+        
+        # لا إعادة للتثبيت: إصدار لا يطابق بعد تثبيت ناجح خطأ يوقف البناء
+        version = backend.get_version(self.python_exe)
+        if is_bootstrap_needed(self.config, version):
+            message = f"الإصدار المثبت ({version or 'غير معروف'}) لا يطابق الإصدار المحدد للمشروع"
+            self.log_signal.emit(f"❌ {message}")
+            self.finished_signal.emit(False, message)
+            return
+        self.log_signal.emit(
+            f"✅ تم تثبيت {backend.label} {version} في {time.perf_counter() - started:.1f} ث"
+        )
+        self.finished_signal.emit(True, version or "")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# أدوات التجميد (PyInstaller / Nuitka / cx_Freeze)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def get_executable_suffix():
+    """امتداد الملفات التنفيذية على النظام الحالي"""
+    return ".exe" if sys.platform == "win32" else ""
+
+
+class FreezerBackend:
+    """أداة تجميد: تحوّل حقول الإعدادات نفسها إلى أوامرها وتحدد مكان ناتجها"""
+    
+    name = ""
+    label = ""
+    # حزم pip التي تحتاجها الأداة (الأولى هي الأداة نفسها)، وأسماء وحداتها
+    packages = ()
+    modules = ()
+    supports_onefile = True
+    # أوضاع الأرشيف المدعومة (ARCHIVE_MODES)
+    archive_modes = ("compressed",)
+    
+    def build_command(self, config):
+        """(الأمر، رسالة الخطأ)"""
+        raise NotImplementedError
+    
+    def get_version(self, python_exe):
+        """إصدار الأداة في المفسر أو None إن لم تكن مثبتة"""
+        try:
+            result = subprocess.run(
+                [python_exe, "-c",
+                 f"import importlib.metadata as m; print(m.version({self.packages[0]!r}))"],
+                capture_output=True, text=True, timeout=60
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        return result.stdout.strip() if result.returncode == 0 else None
+    
+    def is_onefile(self, config):
+        return self.supports_onefile and config.get("onefile", True)
+    
+    def get_artifact_path(self, config):
+        """الناتج: الملف التنفيذي في وضع الملف الواحد، وإلا مجلد التطبيق"""
+        path = os.path.join(get_dist_dir(config), get_app_name(config))
+        return path + get_executable_suffix() if self.is_onefile(config) else path
+    
+    def get_executable_path(self, config):
+        """الملف التنفيذي لنقطة الدخول الأولى"""
+        path = self.get_artifact_path(config)
+        if self.is_onefile(config):
+            return path
+        return os.path.join(path, get_app_name(config) + get_executable_suffix())
+    
+    def finalize(self, config):
+        """نقل الناتج بعد البناء إلى dist/<اسم التطبيق> كما في PyInstaller"""
+    
+    def get_data_pairs(self, config):
+        """(المصدر، الوجهة) للملفات الإضافية الموجودة"""
+        return [
+            (os.path.abspath(path), os.path.basename(path))
+            for path in config.get("extra_files", []) if os.path.exists(path)
+        ]
+    
+    def get_extra_args(self, config):
+        if not config.get("extra_args"):
+            return []
+        return shlex.split(config["extra_args"], posix=sys.platform != "win32")
+
+
+class PyInstallerBackend(FreezerBackend):
+    name = "pyinstaller"
+    label = "PyInstaller"
+    packages = BOOTSTRAP_PACKAGES
+    modules = ("PyInstaller", "_pyinstaller_hooks_contrib")
+    archive_modes = tuple(ARCHIVE_MODES)
+    
+    def build_command(self, config):
+        return build_pyinstaller_command(config)
+    
+    def get_version(self, python_exe):
+        return get_pyinstaller_version(python_exe)
+
+
+class NuitkaBackend(FreezerBackend):
+    """ترجمة مسبقة إلى C (أبطأ في البناء، وأسرع للأدوات كثيفة الحساب)"""
+    
+    name = "nuitka"
+    label = "Nuitka"
+    packages = ("nuitka", "ordered-set", "zstandard")
+    modules = ("nuitka", "ordered_set", "zstandard")
+    # الوحدات مترجمة داخل الملف التنفيذي، والضغط (zstd) يخص حزمة الملف الواحد فقط
+    archive_modes = ("compressed", "stored")
+    
+    def build_command(self, config):
+        cmd = [sys.executable, "-m", "nuitka"]
+        cmd.append("--onefile" if self.is_onefile(config) else "--standalone")
+        if self.is_onefile(config) and get_archive_mode(config) == "stored":
+            cmd.append("--onefile-no-compression")
+        if config.get("noconfirm", True):
+            cmd.append("--assume-yes-for-downloads")
+        cmd.append(f"--output-dir={get_build_dist_dir(config)}")
+        cmd.append(f"--output-filename={get_app_name(config)}{get_executable_suffix()}")
+        
+        if sys.platform == "win32":
+            if config.get("windowed", False) or config.get("noconsole", False):
+                cmd.append("--windows-console-mode=disable")
+            icon = config.get("icon", "")
+            if icon and os.path.isfile(icon):
+                cmd.append(f"--windows-icon-from-ico={icon}")
+        
+        for path, dest in self.get_data_pairs(config):
+            option = "--include-data-dir" if os.path.isdir(path) else "--include-data-files"
+            cmd.append(f"{option}={path}={dest}")
+        for imp in config.get("hidden_imports", []):
+            cmd.append(f"--include-module={imp}")
+        for package in config.get("collect_submodules", []):
+            cmd.append(f"--include-package={package}")
+        for name in config.get("excludes", []):
+            cmd.append(f"--nofollow-import-to={name}")
+        
+        # -O يحذف assert و -OO يحذف النصوص التوثيقية أيضاً
+        opt_level = config.get("optimize", 0)
+        if opt_level >= 1:
+            cmd.append("--python-flag=no_asserts")
+        if opt_level >= 2:
+            cmd.append("--python-flag=no_docstrings")
+        
+        cmd.extend(self.get_extra_args(config))
+        cmd.append(config["source"])
+        return cmd, None
+    
+    def finalize(self, config):
+        if self.is_onefile(config):
+            return
+        # وضع standalone يكتب <اسم السكربت>.dist
+        stem = os.path.splitext(os.path.basename(config["source"]))[0]
+        built = os.path.join(get_build_dist_dir(config), f"{stem}.dist")
+        target = os.path.join(get_build_dist_dir(config), get_app_name(config))
+        if os.path.isdir(built):
+            if os.path.isdir(target):
+                shutil.rmtree(target)
+            os.replace(built, target)
+
+
+class CxFreezeBackend(FreezerBackend):
+    """cx_Freeze 7+ (وضع المجلد فقط)"""
+    
+    name = "cx_freeze"
+    label = "cx_Freeze"
+    packages = ("cx_Freeze",)
+    modules = ("cx_Freeze",)
+    supports_onefile = False
+    archive_modes = ("compressed", "stored", "loose")
+    
+    def build_command(self, config):
+        cmd = [
+            sys.executable, "-m", "cx_Freeze",
+            f"--script={config['source']}",
+            f"--target-name={get_app_name(config)}",
+        ]
+        if sys.platform == "win32" and (config.get("windowed", False) or config.get("noconsole", False)):
+            cmd.append("--base=gui")
+        icon = config.get("icon", "")
+        if icon and os.path.isfile(icon):
+            cmd.append(f"--icon={icon}")
+        
+        # بقية الخيارات خاصة بأمر build_exe
+        build_exe = os.path.join(get_build_dist_dir(config), get_app_name(config))
+        cmd.extend(["build_exe", f"--build-exe={build_exe}", "--silent"])
+        if config.get("hidden_imports"):
+            cmd.append(f"--includes={','.join(config['hidden_imports'])}")
+        if config.get("collect_submodules"):
+            cmd.append(f"--packages={','.join(config['collect_submodules'])}")
+        if config.get("excludes"):
+            cmd.append(f"--excludes={','.join(config['excludes'])}")
+        data = self.get_data_pairs(config)
+        if data:
+            cmd.append(f"--include-files={','.join(f'{path}={dest}' for path, dest in data)}")
+        
+        if config.get("optimize", 0):
+            cmd.append(f"--optimize={config['optimize']}")
+        
+        # library.zip دون ضغط، أو كل الحزم ملفات منفصلة خارجه
+        archive_mode = get_archive_mode(config)
+        if archive_mode == "stored":
+            cmd.append("--no-compress")
+        elif archive_mode == "loose":
+            cmd.append("--zip-exclude-packages=*")
+        
+        cmd.extend(self.get_extra_args(config))
+        return cmd, None
+
+
+BACKENDS = {backend.name: backend for backend in (PyInstallerBackend(), NuitkaBackend(), CxFreezeBackend())}
+
+
+def get_backend(config):
+    """أداة التجميد المختارة في الإعدادات (PyInstaller افتراضياً)"""
+    return BACKENDS.get(config.get("backend") or "pyinstaller", BACKENDS["pyinstaller"])
+
+
+def check_backend_config(config):
+    """خيارات لا تدعمها الأداة المختارة: (المستوى، الرسالة)"""
+    backend = get_backend(config)
+    problems = []
+    archive_mode = get_archive_mode(config)
+    if archive_mode not in backend.archive_modes:
+        problems.append((
+            "warning", f"وضع الأرشيف \"{ARCHIVE_MODES[archive_mode]}\" غير مدعوم في {backend.label} - يُستخدم الافتراضي"
+        ))
+    if backend.name == "pyinstaller":
+        # كل ملف تنفيذي في وضع الملف الواحد يحمل نسخته من المكتبات والبيانات
+        if config.get("extra_entries") and config.get("onefile", True):
+            problems.append((
+                "warning",
+                f"نقاط الدخول المتعددة في وضع الملف الواحد تكرر المكتبات والبيانات في كل ملف "
+                f"({len(config['extra_entries']) + 1} نسخ) - استخدم وضع المجلد لمشاركتها"
+            ))
+        return problems
+    if config.get("extra_entries"):
+        problems.append(("error", f"نقاط الدخول المتعددة غير مدعومة مع {backend.label}"))
+    if config.get("spec_file"):
+        problems.append(("error", f"ملفات .spec خاصة بـ PyInstaller ولا تُستخدم مع {backend.label}"))
+    if config.get("onefile", True) and not backend.supports_onefile:
+        problems.append(("warning", f"{backend.label} لا يدعم الملف الواحد - سيُبنى مجلد"))
+    if config.get("hookspath"):
+        problems.append(("warning", f"مجلدات الخطافات خاصة بـ PyInstaller - تُتجاهل مع {backend.label}"))
+    if config.get("import_profile") or config.get("lazy_modules"):
+        problems.append((
+            "warning", f"قياس زمن الاستيراد وتأجيل الوحدات خطافات PyInstaller - تُتجاهل مع {backend.label}"
+        ))
+    if config.get("prune_payload"):
+        problems.append(("warning", f"تقليم الملحقات يعمل في ملف .spec الخاص بـ PyInstaller - يُتجاهل مع {backend.label}"))
+    return problems
+
+
+def get_tree_size(path):
+    """حجم ملف أو مجلد بالبايت"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+# {exe} في الأمر هو الملف التنفيذي الناتج، وبدونه يُعامل الأمر كمعاملات له
+def run_benchmark(command, executable, runs, timeout=600):
+    """تشغيل أمر القياس عدة مرات وإرجاع الوسيط بالثواني"""
+    args = shlex.split(command, posix=sys.platform != "win32")
+    if any("{exe}" in arg for arg in args):
+        args = [arg.replace("{exe}", executable) for arg in args]
+    else:
+        args = [executable] + args
+    times = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(
+            args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+            timeout=timeout, check=True, cwd=os.path.dirname(executable)
+        )
+        times.append(time.perf_counter() - started)
+    return sorted(times)[len(times) // 2]
+
+
+def format_compare_report(results):
+    """جدول المقارنة: مدة البناء والحجم وزمن التشغيل لكل أداة"""
+    mb = 1024 * 1024
+    lines = ["", "⚖️ نتائج المقارنة:",
+             f"   {'الأداة':<24} {'البناء':>10} {'الحجم':>12} {'التشغيل':>10}"]
+    for result in results:
+        if result.get("error"):
+            lines.append(f"   {result['label']:<24} ❌ {result['error']}")
+            continue
+        bench = f"{result['run_seconds']:.3f} ث" if result.get("run_seconds") is not None else "-"
+        lines.append(
+            f"   {result['label']:<24} {result['build_seconds']:>8.1f} ث "
+            f"{result['size_bytes'] / mb:>9.1f} MB {bench:>10}"
+        )
+    return lines
+
+
+class BackendCompareThread(QThread):
+    """بناء المشروع بكل أداة في مجلد منفصل ثم قياس الحجم وزمن التشغيل"""
+    
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+    
+    def __init__(self, config, backends, bench_command="", runs=3, archive_modes=None, prune_variants=None):
+        super().__init__()
+        self.config = config
+        self.backends = backends
+        self.archive_modes = archive_modes or [get_archive_mode(config)]
+        self.prune_variants = prune_variants or [bool(config.get("prune_payload"))]
+        self.bench_command = bench_command
+        self.runs = runs
+        self.thread = None
+        self.is_cancelled = False
+        self.results = []
+    
+    def run(self):
+        compare_root = os.path.join(get_work_dir(self.config), "compare")
+        several_modes = len(self.archive_modes) > 1
+        several_prune = len(self.prune_variants) > 1
+        for name, mode, prune in self.get_variants():
+            if self.is_cancelled:
+                break
+            backend = BACKENDS[name]
+            folder = f"{name}-{mode}" if several_modes else name
+            label = f"{backend.label} ({mode})" if several_modes else backend.label
+            if several_prune and prune:
+                folder += "-pruned"
+                label += " مقلَّم"
+            # مراحل ما بعد البناء تغيّر الناتج فلا تُقارن
+            config = dict(
+                self.config, backend=name, archive_mode=mode, output_dir=os.path.join(compare_root, folder),
+                shared_runtime=False, delta_updates=False, analysis_cache=False, prune_payload=prune
+            )
+            result = {"backend": name, "archive_mode": mode, "prune_payload": prune, "label": label}
+            self.results.append(result)
+            self.log_signal.emit(f"\n⚖️ ═══ {label} ═══")
+            try:
+                self.compare_backend(backend, config, result)
+            except Exception as e:
+                result["error"] = str(e)
+                self.log_signal.emit(f"❌ {backend.label}: {str(e)}")
+        
+        for line in format_compare_report(self.results):
+            self.log_signal.emit(line)
+        success = bool(self.results) and not any(r.get("error") for r in self.results)
+        self.finished_signal.emit(success, "اكتملت المقارنة" if success else "فشلت بعض البناءات")
+    
+    def get_variants(self):
+        """(الأداة، وضع الأرشيف، التقليم) لكل بناء، مع تخطي الأوضاع غير المدعومة"""
+        variants = []
+        for name in self.backends:
+            backend = BACKENDS[name]
+            for mode in self.archive_modes:
+                if mode not in backend.archive_modes:
+                    self.log_signal.emit(f"⏭️ {backend.label}: وضع الأرشيف {mode} غير مدعوم")
+                    continue
+                for prune in self.prune_variants:
+                    if prune and name != "pyinstaller":
+                        self.log_signal.emit(f"⏭️ {backend.label}: تقليم الملحقات خاص بـ PyInstaller")
+                        continue
+                    variants.append((name, mode, prune))
+        return variants
+    
+    def compare_backend(self, backend, config, result):
+        for level, msg in check_backend_config(config):
+            if level == "error":
+                raise RuntimeError(msg)
+            self.log_signal.emit(f"⚠️ {msg}")
+        
+        if not backend.get_version(sys.executable):
+            pip_install(sys.executable, get_pinned_packages(config), self.log_signal.emit)
+        
+        cmd, error = build_command_from_config(config)
+        if error:
+            raise RuntimeError(error)
+        os.makedirs(config["output_dir"], exist_ok=True)
+        
+        outcome = {}
+        self.thread = ConversionThread(cmd, get_work_dir(config), config)
+        self.thread.log_signal.connect(self.log_signal.emit)
+        self.thread.finished_signal.connect(lambda success, message: outcome.update(success=success, message=message))
+        started = time.perf_counter()
+        self.thread.run()
+        result["build_seconds"] = time.perf_counter() - started
+        if not outcome.get("success"):
+            raise RuntimeError(outcome.get("message", "فشل البناء"))
+        
+        result["size_bytes"] = get_tree_size(backend.get_artifact_path(config))
+        if self.bench_command and not self.is_cancelled:
+            executable = backend.get_executable_path(config)
+            self.log_signal.emit(f"⏱️ قياس زمن التشغيل ({self.runs} مرات): {executable}")
+            result["run_seconds"] = run_benchmark(self.bench_command, executable, self.runs)
+    
+    def cancel(self):
+        self.is_cancelled = True
+        if self.thread:
+            self.thread.cancel()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# البناء في مجلد تجهيز محلي سريع
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# أدوات التجميد تكتب عشرات آلاف الملفات الصغيرة في build، وهذا بطيء على مجلدات
+# الشبكة والمجلدات التي يفحصها مضاد الفيروسات؛ فيُبنى محلياً ويُنقل الناتج وحده
+SCRATCH_TMPFS_DIRS = ("/dev/shm",)
+SCRATCH_MIN_FREE_MB = 2048
+SCRATCH_PROBE_FILES = 200
+SCRATCH_PROBE_SIZE = 4096
+
+
+def get_scratch_root(config):
+    """مجلد التجهيز: المحدد في الإعدادات، أو tmpfs إن كانت مساحته كافية، أو المجلد المؤقت"""
+    if config.get("scratch_dir"):
+        return os.path.abspath(config["scratch_dir"])
+    for path in SCRATCH_TMPFS_DIRS:
+        try:
+            free = shutil.disk_usage(path).free
+        except OSError:
+            continue
+        if os.access(path, os.W_OK) and free >= SCRATCH_MIN_FREE_MB * 1024 * 1024:
+            return path
+    return tempfile.gettempdir()
+
+
+def get_staging_dir(config):
+    """مجلد ثابت لكل مشروع داخل مجلد التجهيز (ليُعاد استخدام build في البناءات التالية)"""
+    key = hashlib.sha256(os.path.abspath(get_work_dir(config)).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(get_scratch_root(config), "py2exe-staging", f"{get_app_name(config)}-{key}")
+
+
+def is_tmpfs(path):
+    """هل المسار على نظام ملفات في الذاكرة (لينكس فقط)"""
+    try:
+        with open("/proc/mounts", 'r', encoding='utf-8') as f:
+            mounts = [line.split() for line in f]
+    except OSError:
+        return False
+    path = os.path.realpath(path)
+    best, fstype = "", ""
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        mount_point = fields[1]
+        inside = path == mount_point or path.startswith(mount_point.rstrip("/") + "/")
+        if inside and len(mount_point) > len(best):
+            best, fstype = mount_point, fields[2]
+    return fstype in ("tmpfs", "ramfs")
+
+
+def count_written_files(path, since):
+    """(عدد الملفات، الحجم) للملفات المعدلة منذ since"""
+    files = size = 0
+    for root, dirs, names in os.walk(path):
+        for name in names:
+            try:
+                st = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            if st.st_mtime >= since:
+                files += 1
+                size += st.st_size
+    return files, size
+
+
+def probe_small_file_io(directory, count=SCRATCH_PROBE_FILES, size=SCRATCH_PROBE_SIZE):
+    """متوسط زمن إنشاء ملف صغير وكتابته في المجلد بالثواني"""
+    probe_dir = os.path.join(directory, f".io-probe-{os.getpid()}")
+    os.makedirs(probe_dir, exist_ok=True)
+    data = b"\0" * size
+    try:
+        started = time.perf_counter()
+        for index in range(count):
+            with open(os.path.join(probe_dir, f"{index}.tmp"), 'wb') as f:
+                f.write(data)
+        return (time.perf_counter() - started) / count
+    finally:
+        shutil.rmtree(probe_dir, ignore_errors=True)
+
+
+def remove_path(path):
+    """حذف ملف أو مجلد إن وُجد"""
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    elif os.path.lexists(path):
+        os.remove(path)
+
+
+# إعادة تسمية على نفس القرص وإلا نسخة إلى اسم مؤقت، والهدف القديم لا يُحذف
+# إلا بعد أن يحل الجديد محله فلا يضيع الناتج السابق إذا فشل النسخ
+def move_tree_contents(src_dir, dst_dir):
+    """نقل محتويات مجلد إلى آخر (يُرجع True عند إعادة التسمية دون نسخ)"""
+    os.makedirs(dst_dir, exist_ok=True)
+    renamed = True
+    for name in os.listdir(src_dir):
+        src = os.path.join(src_dir, name)
+        dst = os.path.join(dst_dir, name)
+        tmp = f"{dst}.{os.getpid()}.staging"
+        old = f"{dst}.{os.getpid()}.old"
+        remove_path(tmp)
+        remove_path(old)
+        copied = False
+        try:
+            os.replace(src, tmp)
+        except OSError:
+            renamed, copied = False, True
+            try:
+                if os.path.isdir(src) and not os.path.islink(src):
+                    shutil.copytree(src, tmp, symlinks=True)
+                else:
+                    shutil.copy2(src, tmp, follow_symlinks=False)
+            except OSError:
+                remove_path(tmp)
+                raise
+        # الجديد جاهز بجوار الهدف: إزاحة القديم ثم إحلال الجديد (إعادة تسمية فقط)
+        if os.path.lexists(dst):
+            os.replace(dst, old)
+        try:
+            os.replace(tmp, dst)
+        except OSError:
+            if os.path.lexists(old):
+                os.replace(old, dst)
+            raise
+        remove_path(old)
+        if copied:
+            remove_path(src)
+    return renamed
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# فحص المستودع واكتشاف نقاط الدخول
+# ═══════════════════════════════════════════════════════════════════════════════
+
+SCAN_INDEX_FILE = ".py2exe_scan_index.json"
+SCAN_INDEX_VERSION = 1
+SCAN_SKIP_DIRS = {
+    ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv", "env",
+    ".tox", ".nox", ".mypy_cache", ".pytest_cache", ".eggs", "site-packages", "build", "dist",
+}
+# مكتبات الواجهات الرسومية: استيراد إحداها يعني تطبيقاً بلا Console، إلا إن استورد
+# السكربت أيضاً مكتبة سطر أوامر
+SCAN_GUI_MODULES = {
+    "PyQt5", "PyQt6", "PySide2", "PySide6", "tkinter", "customtkinter", "wx", "kivy",
+    "pygame", "flet", "dearpygui", "toga", "pyglet", "arcade", "webview",
+}
+SCAN_CLI_MODULES = {"argparse", "click", "typer", "fire", "docopt", "optparse"}
+
+SCAN_LAUNCHER_TEMPLATE = '''import sys
+from {module} import {attr}
+
+if __name__ == "__main__":
+    sys.exit({call}())
+'''
+
+
+def is_main_guard(node):
+    """هل العقدة if __name__ == "__main__" (بأي ترتيب للطرفين)"""
+    if not isinstance(node, ast.If) or not isinstance(node.test, ast.Compare):
+        return False
+    test = node.test
+    if len(test.ops) != 1 or not isinstance(test.ops[0], ast.Eq):
+        return False
+    sides = [test.left, test.comparators[0]]
+    has_name = any(isinstance(side, ast.Name) and side.id == "__name__" for side in sides)
+    has_main = any(isinstance(side, ast.Constant) and side.value == "__main__" for side in sides)
+    return has_name and has_main
+
+
+def infer_windowed(imports):
+    """واجهة رسومية بلا Console حسب الاستيرادات"""
+    roots = {name.split(".")[0] for name in imports}
+    return bool(roots & SCAN_GUI_MODULES) and not roots & SCAN_CLI_MODULES
+
+
+def analyze_script(path):
+    """None إن لم يكن الملف نقطة دخول، وإلا {windowed, imports}"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    is_pyw = path.endswith(".pyw")
+    # فحص سريع قبل التحليل: أغلب ملفات المستودع وحدات وليست سكربتات
+    if not is_pyw and b"__main__" not in data:
+        return None
+    try:
+        tree = ast.parse(data, filename=path)
+    except (SyntaxError, ValueError):
+        return None
+    if not is_pyw and not any(is_main_guard(node) for node in tree.body):
+        return None
+    imports = sorted(get_source_imports(tree))
+    return {"windowed": is_pyw or infer_windowed(imports), "imports": imports}
+
+
+def list_scan_files(root, workers):
+    """ملفات .py/.pyw و pyproject.toml في الشجرة (قراءة المجلدات بالتوازي)"""
+    scripts, projects = [], []
+    pending = [root]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        while pending:
+            listings = pool.map(list_directory, pending)
+            pending = []
+            for dirs, files in listings:
+                pending.extend(dirs)
+                for path in files:
+                    if path.endswith((".py", ".pyw")):
+                        scripts.append(path)
+                    elif os.path.basename(path) == "pyproject.toml":
+                        projects.append(path)
+    return sorted(scripts), sorted(projects)
+
+
+def list_directory(path):
+    """(المجلدات الفرعية، الملفات) مع تخطي المجلدات المستبعدة والمخفية"""
+    dirs, files = [], []
+    try:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SCAN_SKIP_DIRS and not entry.name.startswith(".") \
+                            and not os.path.exists(os.path.join(entry.path, "pyvenv.cfg")):
+                        dirs.append(entry.path)
+                elif entry.is_file():
+                    files.append(entry.path)
+    except OSError:
+        pass
+    return dirs, files
+
+
+def scan_script(path, cached):
+    """(النتيجة، سجل الفهرس، هل أُعيد التحليل) - الملف غير المعدل لا يُقرأ"""
+    st = os.stat(path)
+    if cached and cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+        return cached.get("result"), cached, False
+    digest = file_sha256(path)
+    record = {"mtime_ns": st.st_mtime_ns, "size": st.st_size, "sha256": digest}
+    # تغيّر وقت التعديل فقط (نسخ أو checkout) - المحتوى نفسه
+    if cached and cached.get("sha256") == digest:
+        record["result"] = cached.get("result")
+        return record["result"], record, False
+    record["result"] = analyze_script(path)
+    return record["result"], record, True
+
+
+def read_project_scripts(path):
+    """[(الاسم، "module:func"، واجهة؟)] من [project.scripts] و gui-scripts و [tool.poetry.scripts]"""
+    with open(path, 'rb') as f:
+        data = tomllib.load(f)
+    project = data.get("project", {})
+    scripts = [(name, target, False) for name, target in project.get("scripts", {}).items()]
+    scripts += [(name, target, True) for name, target in project.get("gui-scripts", {}).items()]
+    poetry = data.get("tool", {}).get("poetry", {}).get("scripts", {})
+    scripts += [(name, target, False) for name, target in poetry.items() if isinstance(target, str)]
+    return scripts
+
+
+def find_module_file(project_dir, module):
+    """(مجلد الجذر، ملف الوحدة) لوحدة في المشروع - تخطيط src أو مسطح"""
+    parts = module.split(".")
+    for base in (os.path.join(project_dir, "src"), project_dir):
+        for candidate in (os.path.join(base, *parts) + ".py", os.path.join(base, *parts, "__init__.py")):
+            if os.path.isfile(candidate):
+                return base, candidate
+    return None, None
+
+
+def quote_arg(arg):
+    """اقتباس معامل لسطر الأوامر حسب النظام"""
+    return subprocess.list2cmdline([arg]) if sys.platform == "win32" else shlex.quote(arg)
+
+
+def make_entry_config(name, source, windowed, out_dir, onefile, extra_args=""):
+    """إعدادات بصيغة الإعدادات المحفوظة لنقطة دخول واحدة"""
+    return {
+        "source": source,
+        "output_name": name,
+        "output_dir": os.path.join(out_dir, "builds", name),
+        "backend": "pyinstaller",
+        "onefile": onefile,
+        "windowed": windowed,
+        "clean": True,
+        "noconsole": False,
+        "noconfirm": True,
+        "extra_entries": [],
+        "extra_files": [],
+        "hidden_imports": [],
+        "extra_args": extra_args,
+        "auto_profiles": True,
+    }
+
+
+def unique_entry_names(paths, root):
+    """اسم لكل سكربت: اسم الملف، ومع التكرار يُسبق بمسار مجلده النسبي"""
+    stems = {}
+    for path in paths:
+        stems.setdefault(os.path.splitext(os.path.basename(path))[0], []).append(path)
+    names = {}
+    for stem, group in stems.items():
+        for path in group:
+            if len(group) == 1:
+                names[path] = stem
+            else:
+                rel = os.path.splitext(os.path.relpath(path, root))[0]
+                names[path] = re.sub(r"[^\w.-]+", "-", rel).strip("-")
+    return names
+
+
+# الفهرس يتخطى الملفات غير المعدلة، وإعدادات نقاط الدخول التي اختفت تُحذف
+def scan_repository(root, out_dir, workers=None, onefile=True, log=print):
+    """اكتشاف نقاط الدخول في مستودع وكتابة ملف إعدادات لكل منها في out_dir"""
+    root = os.path.abspath(root)
+    out_dir = os.path.abspath(out_dir)
+    workers = workers or min(32, (os.cpu_count() or 1) * 4)
+    index_path = os.path.join(out_dir, SCAN_INDEX_FILE)
+    index = read_json_file(index_path, {})
+    if index.get("version") != SCAN_INDEX_VERSION or index.get("root") != root:
+        index = {}
+    cached_files = index.get("files", {})
+    
+    started = time.perf_counter()
+    scripts, projects = list_scan_files(root, workers)
+    # لا تُفحص ملفات الإعدادات ومشغلاتها المولدة إن كان مجلد الإخراج داخل المستودع
+    scripts = [path for path in scripts if not path.startswith(out_dir + os.sep)]
+    
+    files, entries = {}, {}
+    parsed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {path: pool.submit(scan_script, path, cached_files.get(path)) for path in scripts}
+        for path, future in futures.items():
+            try:
+                result, record, reparsed = future.result()
+            except OSError:
+                continue
+            files[path] = record
+            parsed += reparsed
+            if result:
+                entries[path] = result["windowed"]
+    
+    configs = {}
+    names = unique_entry_names(list(entries), root)
+    for path, windowed in entries.items():
+        configs[names[path]] = make_entry_config(names[path], path, windowed, out_dir, onefile)
+    
+    # console_scripts: مشغل صغير يستدعي الدالة، والمشروع يُضاف إلى مسارات البحث
+    for pyproject in projects:
+        if tomllib is None:
+            log("⚠️ قراءة pyproject.toml تتطلب Python 3.11+ - تُتخطى console_scripts")
+            break
+        try:
+            project_scripts = read_project_scripts(pyproject)
+        except (OSError, ValueError) as e:
+            log(f"⚠️ تعذر قراءة {pyproject}: {str(e)}")
+            continue
+        for name, target, gui in project_scripts:
+            module, _, attr = target.partition(":")
+            base, module_file = find_module_file(os.path.dirname(pyproject), module.strip())
+            if not module_file or not attr:
+                log(f"⚠️ {name}: لم يُعثر على {target}")
+                continue
+            if name in configs:
+                name = f"{name}-script"
+            launcher = os.path.join(out_dir, "launchers", f"{name}.py")
+            attr = attr.strip()
+            write_if_changed(launcher, SCAN_LAUNCHER_TEMPLATE.format(
+                module=module.strip(), attr=attr.split(".")[0], call=attr
+            ).encode("utf-8"))
+            windowed = gui
+            if not gui:
+                try:
+                    with open(module_file, 'rb') as f:
+                        windowed = infer_windowed(get_source_imports(ast.parse(f.read(), filename=module_file)))
+                except (OSError, SyntaxError, ValueError):
+                    pass
+            configs[name] = make_entry_config(
+                name, launcher, windowed, out_dir, onefile, f"--paths {quote_arg(base)}"
+            )
+    
+    written = 0
+    for name, config in configs.items():
+        data = json.dumps(config, ensure_ascii=False, indent=2).encode("utf-8")
+        written += write_if_changed(os.path.join(out_dir, f"{name}.json"), data)
+    removed = 0
+    for name in set(index.get("configs", [])) - set(configs):
+        for path in (os.path.join(out_dir, f"{name}.json"), os.path.join(out_dir, "launchers", f"{name}.py")):
+            if os.path.exists(path):
+                os.remove(path)
+                removed += 1
+    
+    write_json_atomic(index_path, {
+        "version": SCAN_INDEX_VERSION, "root": root, "files": files, "configs": sorted(configs),
+    })
+    return {
+        "files": len(scripts), "parsed": parsed, "reused": len(scripts) - parsed,
+        "entries": len(configs), "written": written, "removed": removed,
+        "seconds": time.perf_counter() - started, "configs": sorted(configs),
+    }
+
+
+def format_scan_report(summary, out_dir):
+    """ملخص الفحص"""
+    return [
+        f"🔎 {summary['files']} ملف بايثون: أُعيد تحليل {summary['parsed']} وتُخطي {summary['reused']} غير معدل "
+        f"({summary['seconds']:.1f} ث)",
+        f"🎯 نقاط الدخول: {summary['entries']} - ملفات إعدادات جديدة أو معدلة: {summary['written']} - "
+        f"محذوفة: {summary['removed']}",
+        f"📁 {out_dir}",
+    ]
+
+
+class RepoScanThread(QThread):
+    """فحص المستودع في الخلفية"""
+    
+    log_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(bool, str)
+    
+    def __init__(self, root, out_dir, onefile=True):
+        super().__init__()
+        self.root = root
+        self.out_dir = out_dir
+        self.onefile = onefile
+        self.summary = None
+    
+    def run(self):
+        try:
+            self.summary = scan_repository(self.root, self.out_dir, onefile=self.onefile, log=self.log_signal.emit)
+        except Exception as e:
+            self.log_signal.emit(f"❌ فشل الفحص: {str(e)}")
+            self.finished_signal.emit(False, str(e))
+            return
+        for line in format_scan_report(self.summary, self.out_dir):
+            self.log_signal.emit(line)
+        self.finished_signal.emit(True, "اكتمل الفحص")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# قياس أداء المحوّل نفسه
+# ═══════════════════════════════════════════════════════════════════════════════
+
+BENCH_FORMAT_VERSION = 1
+BENCH_SIZES = (10, 100, 1000, 5000)
+BENCH_VARIANTS = ("plain", "heavy", "data")
+BENCH_DATA_FILES = 2000
+BENCH_IMPORT_FANOUT = 3
+# مكتبات خارجية ثقيلة تُستخدم إن كانت مثبتة، وإلا فوحدات قياسية ثقيلة (القياس لا يحتاج شبكة)
+BENCH_HEAVY_MODULES = ("numpy", "pandas", "matplotlib", "PIL", "requests")
+BENCH_HEAVY_FALLBACK = ("asyncio", "email.mime.multipart", "xml.dom.minidom", "unittest", "http.server", "sqlite3")
+# فروق أقل من هذا تُعد ضجيجاً ولا تُحسب تراجعاً
+BENCH_MIN_DELTA_SECONDS = 0.05
+
+BENCH_MODULE_TEMPLATE = '''"""وحدة اصطناعية رقم {index}"""
+{imports}
+
+CONSTANT_{index} = {index}
+
+
+class Model{index}:
+    """نموذج بيانات"""
+    
+    def __init__(self, value: int = {index}) -> None:
+        self.value = value
+    
+    def compute(self, factor: int) -> int:
+        """ضرب القيمة في المعامل"""
+        return self.value * factor
+
+
+def helper_{index}(x: int) -> int:
+    """دالة مساعدة مستخدمة"""
+    return Model{index}(x).compute(2) + CONSTANT_{index}
+
+
+def unused_{index}(x):
+    """دالة غير مستخدمة"""
+    return [x] * {index}
+'''
+
+
+def get_bench_heavy_modules():
+    """الوحدات الثقيلة المتاحة محلياً لحالة heavy"""
+    installed = [name for name in BENCH_HEAVY_MODULES if importlib.util.find_spec(name) is not None]
+    return installed or list(BENCH_HEAVY_FALLBACK)
+
+
+def generate_bench_project(root, modules, heavy=(), data_files=0):
+    """مشروع اصطناعي بمحتوى ثابت للقياس: وحدات محلية متشابكة واستيرادات ثقيلة وبيانات"""
+    os.makedirs(root, exist_ok=True)
+    for index in range(modules):
+        children = range(index * BENCH_IMPORT_FANOUT + 1, min((index + 1) * BENCH_IMPORT_FANOUT + 1, modules))
+        imports = "\n".join(f"import m{child}" for child in children)
+        write_if_changed(
+            os.path.join(root, f"m{index}.py"),
+            BENCH_MODULE_TEMPLATE.format(index=index, imports=imports).encode("utf-8")
+        )
+    
+    lines = [f"import {name}" for name in heavy] + ["import m0", "", "", "if __name__ == '__main__':",
+                                                    "    print(m0.helper_0(1))", ""]
+    source = os.path.join(root, "main.py")
+    write_if_changed(source, "\n".join(lines).encode("utf-8"))
+    
+    extra_files = []
+    if data_files:
+        data_dir = os.path.join(root, "data")
+        os.makedirs(data_dir, exist_ok=True)
+        for index in range(data_files):
+            write_if_changed(os.path.join(data_dir, f"item{index}.txt"), f"{index}\n".encode("utf-8") * 16)
+        extra_files.append(data_dir)
+    
+    return {
+        "source": source,
+        "output_name": "bench",
+        "output_dir": os.path.join(root, "out"),
+        "onefile": False,
+        "clean": True,
+        "noconfirm": True,
+        "extra_files": extra_files,
+        "validate": False,
+        "auto_profiles": True,
+        "admission_control": False,
+        "analysis_cache": False,
+        "delta_updates": True,
+        "release": True,
+        "releases_dir": os.path.join(root, "releases"),
+    }
+
+
+def time_call(func, repeat):
+    """أقل زمن لعدة تشغيلات (أقل تأثراً بالضجيج من المتوسط)"""
+    best = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def run_bench_build(config, log):
+    """بناء كامل في الخيط الحالي: (النجاح، المدة الكلية، مدد المراحل)"""
+    cmd, error = build_command_from_config(config)
+    if error:
+        raise RuntimeError(error)
+    outcome = {}
+    thread = ConversionThread(cmd, get_work_dir(config), config)
+    thread.log_signal.connect(log)
+    thread.finished_signal.connect(lambda success, message: outcome.update(success=success, message=message))
+    started = time.perf_counter()
+    thread.run()
+    elapsed = time.perf_counter() - started
+    if not outcome.get("success"):
+        raise RuntimeError(outcome.get("message", "فشل البناء"))
+    return elapsed, thread.stage_times
+
+
+def run_bench_case(root, modules, variant, repeat=3, build=True, log=print):
+    """قياس حالة واحدة: الكشف والتحليل وبناء الأمر، ثم بناء بارد ودافئ إن أمكن"""
+    heavy = get_bench_heavy_modules() if variant == "heavy" else []
+    data_files = BENCH_DATA_FILES if variant == "data" else 0
+    config = generate_bench_project(root, modules, heavy, data_files)
+    result = {"case": f"{variant}-{modules}", "variant": variant, "modules": modules,
+              "heavy_modules": heavy, "data_files": data_files, "stages": {}}
+    stages = result["stages"]
+    
+    stages["detect_imports"] = time_call(lambda: detect_source_imports(config["source"]), repeat)
+    stages["project_imports"] = time_call(lambda: get_project_imports(config), repeat)
+    resolved, matched = resolve_profiles(config)
+    stages["resolve_profiles"] = time_call(lambda: resolve_profiles(config), repeat)
+    
+    def build_command():
+        cmd, error = build_command_from_config(resolved)
+        if error:
+            raise RuntimeError(error)
+    stages["build_command"] = time_call(build_command, repeat)
+    stages["slim_modules"] = time_call(lambda: slim_project(dict(resolved, slim_modules=True)), repeat)
+    
+    if not build:
+        return result
+    if not get_pyinstaller_version(sys.executable):
+        result["skipped"] = "PyInstaller غير مثبت (القياس لا ينزّل شيئاً)"
+        return result
+    
+    # بداية باردة فعلاً: لا مجلد build ولا إصدارات سابقة من تشغيل قديم
+    for folder in (resolved["output_dir"], resolved["releases_dir"]):
+        shutil.rmtree(folder, ignore_errors=True)
+    os.makedirs(resolved["output_dir"], exist_ok=True)
+    
+    try:
+        stages["cold_build"], cold_stages = run_bench_build(resolved, log)
+        # البناء الدافئ يعيد استخدام مجلد build ويحسب أول تحديث تفاضلي
+        stages["warm_build"], warm_stages = run_bench_build(dict(resolved, clean=False), log)
+    except Exception as e:
+        result["error"] = str(e)
+        return result
+    stages["cold_freeze"] = cold_stages.get("freeze")
+    stages["warm_freeze"] = warm_stages.get("freeze")
+    stages["post_build"] = warm_stages.get("post_build")
+    return result
+
+
+def run_bench_suite(sizes=BENCH_SIZES, variants=BENCH_VARIANTS, repeat=3, build_max=1000,
+                    work_root=None, keep=False, log=print):
+    """تشغيل كل الحالات وإرجاع مستند النتائج"""
+    root = work_root or tempfile.mkdtemp(prefix="py2exe-bench-")
+    document = {
+        "version": BENCH_FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": sys.platform,
+        "pyinstaller": get_pyinstaller_version(sys.executable),
+        "results": [],
+    }
+    try:
+        for modules in sizes:
+            for variant in variants:
+                log(f"⏱️ {variant} / {modules} وحدة...")
+                case_root = os.path.join(root, f"{variant}-{modules}")
+                # مخرجات البناء مطوّلة: تُطبع الأخطاء فقط
+                result = run_bench_case(
+                    case_root, modules, variant, repeat, modules <= build_max,
+                    lambda line: log(line) if line.startswith("❌") else None
+                )
+                document["results"].append(result)
+                for line in format_bench_result(result):
+                    log(line)
+    finally:
+        if not keep and not work_root:
+            shutil.rmtree(root, ignore_errors=True)
+    return document
+
+
+def format_bench_result(result):
+    """أسطر نتيجة حالة واحدة"""
+    lines = [f"   {stage:<18} {seconds * 1000:>10.1f} ms"
+             for stage, seconds in result["stages"].items() if seconds is not None]
+    if result.get("skipped"):
+        lines.append(f"   ⏭️ البناء: {result['skipped']}")
+    if result.get("error"):
+        lines.append(f"   ❌ {result['error']}")
+    return lines
+
+
+# التراجع زيادة أكبر من النسبة المسموحة ومن حد الضجيج معاً
+def compare_bench_results(baseline, current, tolerance=0.2, min_delta=BENCH_MIN_DELTA_SECONDS):
+    """مقارنة نتيجتين مرحلة بمرحلة: [(الحالة، المرحلة، الأساس، الحالي، تراجع؟)]"""
+    base_cases = {result["case"]: result["stages"] for result in baseline.get("results", [])}
+    rows = []
+    for result in current.get("results", []):
+        base_stages = base_cases.get(result["case"])
+        if not base_stages:
+            continue
+        for stage, seconds in result["stages"].items():
+            base = base_stages.get(stage)
+            if base is None or seconds is None:
+                continue
+            regressed = seconds > base * (1 + tolerance) and seconds - base > min_delta
+            rows.append((result["case"], stage, base, seconds, regressed))
+    return rows
+
+
+def format_bench_comparison(baseline, current, rows):
+    """جدول المقارنة مع تحذير عند اختلاف البيئة"""
+    lines = []
+    for key in ("python", "platform", "pyinstaller"):
+        if baseline.get(key) != current.get(key):
+            lines.append(f"⚠️ البيئة مختلفة ({key}): {baseline.get(key)} ← {current.get(key)}")
+    lines.append(f"   {'الحالة':<14} {'المرحلة':<18} {'الأساس ms':>10} {'الحالي ms':>10} {'التغير':>8}")
+    for case, stage, base, seconds, regressed in rows:
+        change = f"{(seconds / base - 1) * 100:+.0f}%" if base else "-"
+        mark = " 🔴" if regressed else ""
+        lines.append(f"   {case:<14} {stage:<18} {base * 1000:>10.1f} {seconds * 1000:>10.1f} {change:>8}{mark}")
+    regressions = sum(1 for row in rows if row[4])
+    lines.append(f"🔴 {regressions} تراجع في الأداء" if regressions else "✅ لا تراجع في الأداء")
+    return lines
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# البيئة الافتراضية المصغرة
+# ═══════════════════════════════════════════════════════════════════════════════
+
+VENVS_DIR = os.path.join(APP_DATA_DIR, "venvs")
+VENV_MARKER = "py2exe_venv.json"
+
+# يُنفَّذ داخل مفسر المصدر: يحوّل أسماء الوحدات المستوردة إلى توزيعات مثبتة
+# بإصداراتها، ويُرجع كل التوزيعات المثبتة كقيود لإصدارات الاعتماديات
+REQUIREMENTS_PROBE = r'''
+import sys, json
+import importlib.metadata
+
+request = json.loads(sys.stdin.read())
+names, tools = request["modules"], request["tools"]
+stdlib = set(getattr(sys, "stdlib_module_names", ()))
+distributions = importlib.metadata.packages_distributions()
+
+
+def requirement(dist_name):
+    dist = importlib.metadata.distribution(dist_name)
+    direct_url = dist.read_text("direct_url.json")
+    if direct_url:
+        url = json.loads(direct_url).get("url", "")
+        if url.startswith("file:"):
+            return url
+    return "%s==%s" % (dist.metadata["Name"], dist.version)
+
+
+requirements, unresolved = set(), []
+for name in names + tools:
+    if name in stdlib or name in sys.builtin_module_names:
+        continue
+    dists = distributions.get(name)
+    if not dists:
+        unresolved.append(name)
+        continue
+    for dist_name in dists:
+        requirements.add(requirement(dist_name))
+
+constraints = sorted({
+    "%s==%s" % (dist.metadata["Name"], dist.version)
+    for dist in importlib.metadata.distributions()
+    if dist.metadata["Name"] and not dist.read_text("direct_url.json")
+})
+print(json.dumps({
+    "python": "%d.%d" % sys.version_info[:2],
+    "requirements": sorted(requirements),
+    "unresolved": [n for n in unresolved if n not in tools],
+    "constraints": constraints,
+}))
+'''
+
+
+def get_local_module_names(config):
+    """أسماء الوحدات والحزم الموجودة في مجلدات نقاط الدخول (ليست مكتبات خارجية)"""
+    names = set()
+    for folder in {os.path.dirname(os.path.abspath(script)) for name, script in get_entries(config)}:
+        if not os.path.isdir(folder):
+            continue
+        for item in os.listdir(folder):
+            path = os.path.join(folder, item)
+            if item.endswith((".py", ".pyw")):
+                names.add(os.path.splitext(item)[0])
+            elif os.path.isfile(os.path.join(path, "__init__.py")):
+                names.add(item)
+    return names
+
+
+def get_third_party_roots(config):
+    """أسماء الحزم الخارجية الجذرية التي يحتاجها المشروع"""
+    modules = set(get_project_imports(config))
+    modules.update(config.get("hidden_imports", []))
+    modules.update(config.get("collect_submodules", []))
+    local = get_local_module_names(config)
+    return sorted({name.split(".")[0] for name in modules} - local)
+
+
+def resolve_requirements(config, python_exe):
+    """المتطلبات المثبتة بإصداراتها في مفسر المصدر (مع أداة التجميد نفسها)"""
+    extra = config.get("venv_extra_packages", "").split()
+    backend = get_backend(config)
+    request = {"modules": get_third_party_roots(config), "tools": list(backend.modules)}
+    result = subprocess.run(
+        [python_exe, "-c", REQUIREMENTS_PROBE],
+        input=json.dumps(request), capture_output=True, text=True,
+        timeout=60, check=True
+    )
+    resolved = json.loads(result.stdout)
+    # أداة غير مثبتة في مفسر المصدر تُثبَّت في البيئة بآخر إصدار
+    installed = {get_requirement_name(req) for req in resolved["requirements"]}
+    extra += [name for name in backend.packages if get_requirement_name(name) not in installed]
+    pins = config.get("pinned_packages", "").split()
+    pinned_names = {get_requirement_name(pin) for pin in pins}
+    resolved["requirements"] = apply_pins(sorted(set(resolved["requirements"]) | set(extra)), pins)
+    resolved["constraints"] = [
+        c for c in resolved["constraints"] if get_requirement_name(c) not in pinned_names
+    ]
+    return resolved
+
+
+def get_venv_python(venv_dir):
+    """مسار مفسر بايثون داخل البيئة الافتراضية"""
+    if sys.platform == "win32":
+        return os.path.join(venv_dir, "Scripts", "python.exe")
+    return os.path.join(venv_dir, "bin", "python")
+
+
+def get_venv_key(resolved):
+    """بصمة البيئة: إصدار بايثون + المتطلبات"""
+    data = json.dumps([resolved["python"], resolved["requirements"]])
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()[:16]
+
+
+def ensure_minimal_venv(python_exe, resolved, log, on_start=None):
+    """بيئة افتراضية بمتطلبات المشروع فقط مخزنة حسب بصمتها: (المفسر، هل أُعيد استخدامها)"""
+    key = get_venv_key(resolved)
+    venv_dir = os.path.join(VENVS_DIR, key)
+    marker = os.path.join(venv_dir, VENV_MARKER)
+    
+    with FileLock(os.path.join(VENVS_DIR, f"{key}.lock")):
+        if os.path.exists(marker):
+            return get_venv_python(venv_dir), True
+        
+        # بقايا إنشاء سابق لم يكتمل
+        if os.path.exists(venv_dir):
+            shutil.rmtree(venv_dir)
+        
+        try:
+            if run_logged([python_exe, "-m", "venv", venv_dir], log, on_start) != 0:
+                raise RuntimeError("فشل إنشاء البيئة الافتراضية")
+            
+            constraints_path = os.path.join(venv_dir, "constraints.txt")
+            with open(constraints_path, 'w', encoding='utf-8') as f:
+                f.write("\n".join(resolved["constraints"]) + "\n")
+            
+            if resolved["requirements"]:
+                pip_install(
+                    get_venv_python(venv_dir), resolved["requirements"], log, on_start,
+                    extra_args=["-c", constraints_path]
+                )
+        except BaseException:
+            shutil.rmtree(venv_dir, ignore_errors=True)
+            raise
+        
+        write_json_atomic(marker, {
+            "python": resolved["python"],
+            "requirements": resolved["requirements"],
+            "created": datetime.now().isoformat(timespec="seconds"),
+        })
+    return get_venv_python(venv_dir), False
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# تخزين إعدادات الواجهة
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# التعديلات تُكتب بعد هدوئها بقفل بين العمليات ودمج مع الملف ثم كتابة ذرية،
+# فلا تنتظر الواجهة القرص ولا تمحو نسخة أخرى مفاتيح لم تعدلها
+class SettingsStore:
+    """إعدادات الواجهة في الذاكرة مع كتابة مؤجلة في الخلفية"""
+    
+    def __init__(self, path=SETTINGS_PATH, delay=SETTINGS_SAVE_DELAY):
+        self.path = path
+        self.lock_path = f"{path}.lock"
+        self.delay = delay
+        self.data = {}
+        self.dirty = set()
+        self.error = None
+        self.closed = False
+        self.mutex = threading.Lock()
+        self.wake = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+    
+    def load(self, legacy_path=SETTINGS_FILE):
+        """تحميل الإعدادات (مع نقل الملف القديم من المجلد الحالي إن وُجد)"""
+        with FileLock(self.lock_path):
+            data = read_json_file(self.path, None)
+        
+        if data is None and os.path.isfile(legacy_path):
+            data = read_json_file(legacy_path, {})
+            with self.mutex:
+                self.dirty.update(data)
+            self.wake.set()
+        
+        with self.mutex:
+            self.data = dict(data or {})
+    
+    def get(self, key, default=None):
+        with self.mutex:
+            return self.data.get(key, default)
+    
+    def __getitem__(self, key):
+        with self.mutex:
+            return self.data[key]
+    
+    def __setitem__(self, key, value):
+        with self.mutex:
+            self.data[key] = value
+            self.dirty.add(key)
+        self.wake.set()
+    
+    def __contains__(self, key):
+        with self.mutex:
+            return key in self.data
+    
+    def run(self):
+        """خيط الكتابة: ينتظر تعديلاً ثم هدوء التعديلات قبل الحفظ"""
+        while not self.closed:
+            self.wake.wait()
+            self.wake.clear()
+            while not self.closed and self.wake.wait(self.delay):
+                self.wake.clear()
+            if not self.closed:
+                self.flush()
+    
+    def flush(self):
+        """كتابة المفاتيح المعدلة فقط. يُرجع False عند الفشل (تبقى معلَّمة للمحاولة لاحقاً)"""
+        with self.mutex:
+            changes = {key: self.data[key] for key in self.dirty}
+            self.dirty.clear()
+        if not changes:
+            return True
+        
+        try:
+            with FileLock(self.lock_path):
+                current = read_json_file(self.path, {})
+                current.update(changes)
+                write_json_atomic(self.path, current)
+        except OSError as e:
+            with self.mutex:
+                self.dirty.update(changes)
+            self.error = str(e)
+            return False
+        
+        self.error = None
+        return True
+    
+    def close(self):
+        """إيقاف خيط الكتابة وحفظ ما تبقى فوراً"""
+        self.closed = True
+        self.wake.set()
+        self.thread.join()
+        return self.flush()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# طابور البناء
+# ═══════════════════════════════════════════════════════════════════════════════
+
+JOB_STATUS_LABELS = {
+    "queued": "⏳ في الانتظار",
+    "running": "🔨 قيد البناء",
+    "paused": "⏸️ متوقف مؤقتاً",
+    "done": "✅ اكتمل",
+    "failed": "❌ فشل",
+    "cancelled": "🚫 أُلغي",
+}
+
+
+class BuildJob:
+    """مهمة بناء في الطابور"""
+    
+    def __init__(self, job_id, name, config, priority=0):
+        self.id = job_id
+        self.name = name
+        self.config = config
+        self.priority = priority
+        self.status = "queued"
+        self.progress = 0
+        self.thread = None
+        self.started = None
+        self.seconds = None
+        # يُوقف مؤقتاً بطلب المستخدم، فلا يستأنفه المجدول تلقائياً
+        self.held = False
+
+
+# مع الإزاحة تُوقَف أضعف مهمة جارية مؤقتاً لصالح مهمة أعلى أولوية وتُستأنف عند توفر مكان
+class BuildQueue:
+    """جدولة مهام البناء حسب الأولوية ثم الترتيب، بعدد متزامن محدد"""
+    
+    def __init__(self):
+        self.jobs = []
+        self.next_id = 1
+    
+    def add(self, name, config, priority=0):
+        job = BuildJob(self.next_id, name, config, priority)
+        self.next_id += 1
+        self.jobs.append(job)
+        return job
+    
+    def remove(self, job):
+        self.jobs.remove(job)
+    
+    def move(self, job, offset):
+        """تحريك مهمة في الطابور (يؤثر على الترتيب بين المهام متساوية الأولوية)"""
+        index = self.jobs.index(job)
+        target = max(0, min(len(self.jobs) - 1, index + offset))
+        self.jobs.insert(target, self.jobs.pop(index))
+    
+    def rank(self, job):
+        """مفتاح الترتيب: الأولوية الأعلى ثم الأقدم في الطابور"""
+        return (-job.priority, self.jobs.index(job))
+    
+    def schedule(self, concurrency, preempt=True):
+        """الإجراءات المطلوبة للجدولة: [(start أو resume أو pause، المهمة)]"""
+        active = [job for job in self.jobs if job.status == "running"]
+        waiting = sorted(
+            (job for job in self.jobs if job.status in ("queued", "paused") and not job.held),
+            key=self.rank
+        )
+        actions = []
+        
+        def run(job):
+            actions.append(("resume" if job.status == "paused" else "start", job))
+            active.append(job)
+        
+        while waiting and len(active) < concurrency:
+            run(waiting.pop(0))
+        
+        while preempt and waiting and active:
+            weakest = max(active, key=self.rank)
+            if waiting[0].priority <= weakest.priority:
+                break
+            active.remove(weakest)
+            actions.append(("pause", weakest))
+            run(waiting.pop(0))
+        return actions
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# سجل البناءات المفهرس
+# ═══════════════════════════════════════════════════════════════════════════════
+
+LOG_STORE_FILE = os.path.join(APP_DATA_DIR, "build_logs.sqlite3")
+LOG_STORE_MAX_BUILDS = 100
+LOG_FLUSH_LINES = 500
+LOG_VIEW_LIMIT = 5000
+
+# من الأشد إلى الأخف (التصفية بمستوى تعرض ما فوقه أيضاً)
+LOG_LEVELS = ("ERROR", "WARNING", "INFO", "DEBUG")
+
+# المراحل بترتيب حدوثها: (الاسم، العنوان، نصوص PyInstaller التي تبدأ بها)
+LOG_PHASES = (
+    ("prepare", "التحضير", ()),
+    ("analysis", "التحليل", ("Analyzing", "module dependency graph", "Looking for", "Processing module hooks")),
+    ("archive", "الأرشيف", ("Building PYZ",)),
+    ("executable", "الملف التنفيذي", ("Building PKG", "Building EXE")),
+    ("collect", "التجميع", ("Building COLLECT",)),
+    ("post", "ما بعد البناء", ()),
+)
+LOG_PHASE_ORDER = {name: index for index, (name, title, markers) in enumerate(LOG_PHASES)}
+
+LOG_LEVEL_RE = re.compile(r"\b(DEBUG|INFO|WARNING|ERROR|CRITICAL|FATAL)\b:")
+LOG_HOOK_RE = re.compile(r"hook-([A-Za-z_][\w.]*)\.py")
+LOG_QUOTED_MODULE_RE = re.compile(r"'([A-Za-z_][\w]*(?:\.[A-Za-z_]\w*)*)'")
+
+LOG_STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS builds (
+    id TEXT PRIMARY KEY, app TEXT, command TEXT, started REAL, finished REAL,
+    success INTEGER, message TEXT, warn_file TEXT, xref_file TEXT
+);
+CREATE TABLE IF NOT EXISTS lines (
+    id INTEGER PRIMARY KEY, build_id TEXT, seq INTEGER, ts REAL,
+    level TEXT, phase TEXT, module TEXT, message TEXT
+);
+CREATE INDEX IF NOT EXISTS lines_build_seq ON lines (build_id, seq);
+CREATE INDEX IF NOT EXISTS lines_build_level ON lines (build_id, level);
+CREATE INDEX IF NOT EXISTS lines_build_phase ON lines (build_id, phase);
+CREATE INDEX IF NOT EXISTS lines_build_module ON lines (build_id, module);
+CREATE TABLE IF NOT EXISTS missing_modules (
+    build_id TEXT, module TEXT, kind TEXT, importers TEXT, import_types TEXT,
+    priority INTEGER, action TEXT
+);
+CREATE INDEX IF NOT EXISTS missing_build ON missing_modules (build_id);
+"""
+
+# فهرس trigram يجعل البحث عن أي جزء من النص فورياً (SQLite 3.34+)
+LOG_STORE_FTS = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS lines_fts USING fts5("
+    "message, content='lines', content_rowid='id', tokenize='trigram')"
+)
+
+# سطور warn-<name>.txt التي يكتبها PyInstaller
+WARN_LINE_RE = re.compile(r"^(missing|excluded) module named (\S+) - imported by (.+)$")
+WARN_IMPORTER_RE = re.compile(r"\s*([^,(]+?)(?: \(([^)]*)\))?\s*(?:,|$)")
+
+# وحدات تخص أنظمة تشغيل أخرى تظهر دائماً في ملف التحذيرات
+PLATFORM_MODULES = {
+    "nt", "winreg", "_winreg", "_winapi", "msvcrt", "_overlapped", "winerror", "win32api",
+    "win32con", "pywintypes", "pwd", "grp", "posix", "termios", "fcntl", "resource",
+    "_posixsubprocess", "_posixshmem", "vms_lib", "java", "org", "_scproxy", "riscos",
+    "riscosenviron", "riscospath", "ce", "os2", "_dummy_thread", "dummy_threading",
+}
+
+
+def parse_log_line(line, phase):
+    """(المستوى، المرحلة، الوحدة) لسطر من سجل البناء"""
+    match = PYINSTALLER_LOG_RE.match(line)
+    text = line.lstrip()
+    if match:
+        level = match.group(2)
+    elif text.startswith("❌") or re.match(r"^\w*Error\b", text):
+        level = "ERROR"
+    elif text.startswith("⚠️"):
+        level = "WARNING"
+    else:
+        match = LOG_LEVEL_RE.search(line)
+        level = match.group(1) if match else "INFO"
+    if level in ("CRITICAL", "FATAL"):
+        level = "ERROR"
+    
+    for name, title, markers in LOG_PHASES[LOG_PHASE_ORDER[phase] + 1:]:
+        if any(marker in line for marker in markers):
+            phase = name
+    
+    match = LOG_HOOK_RE.search(line) or LOG_QUOTED_MODULE_RE.search(line)
+    return level, phase, match.group(1) if match else ""
+
+
+def parse_warn_file(path):
+    """الوحدات المفقودة من warn-<name>.txt بلا تكرار ومرتبة حسب الحاجة لإجراء"""
+    modules = {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            match = WARN_LINE_RE.match(line.strip())
+            if not match:
+                continue
+            kind, module, imported_by = match.groups()
+            entry = modules.setdefault(module.strip("'"), {"kind": kind, "importers": {}})
+            for importer, types in WARN_IMPORTER_RE.findall(imported_by):
+                if importer:
+                    kinds = entry["importers"].setdefault(importer.strip(), set())
+                    kinds.update(t.strip() for t in (types or "top-level").split(","))
+    
+    rows = []
+    for module, entry in modules.items():
+        importers = entry["importers"]
+        types = set().union(*importers.values()) if importers else set()
+        if entry["kind"] == "excluded":
+            priority, action = 3, "مستبعدة عمداً (excludes)"
+        elif module.split(".")[0] in PLATFORM_MODULES:
+            priority, action = 3, "خاصة بنظام تشغيل آخر - تجاهلها"
+        elif any(kinds == {"top-level"} for kinds in importers.values()):
+            priority, action = 0, "ثبّت المكتبة في بيئة البناء أو أضفها كمكتبة مخفية"
+        elif importers and all("optional" in kinds for kinds in importers.values()):
+            priority, action = 2, "اختيارية (داخل try) - غالباً يمكن تجاهلها"
+        else:
+            priority, action = 1, "استيراد مؤجل أو شرطي - تحقق منه عند التشغيل"
+        rows.append({
+            "module": module, "kind": entry["kind"], "importers": sorted(importers),
+            "types": sorted(types), "priority": priority, "action": action,
+        })
+    rows.sort(key=lambda row: (row["priority"], -len(row["importers"]), row["module"]))
+    return rows
+
+
+def find_pyinstaller_report(config, command, prefix, suffix):
+    """ملف تقرير PyInstaller (warn أو xref): يُسمى باسم ملف .spec في build/<الاسم>"""
+    names = [get_app_name(config)]
+    if command and command[-1].endswith(".spec"):
+        names.insert(0, os.path.splitext(os.path.basename(command[-1]))[0])
+    for name in names:
+        path = os.path.join(get_build_root(config), "build", name, f"{prefix}-{name}{suffix}")
+        if os.path.isfile(path):
+            return path
+    return None
+
+
+class BuildLogStore:
+    """سجلات البناء في SQLite: سطر لكل رسالة مع المستوى والمرحلة والوحدة"""
+    
+    def __init__(self, path=LOG_STORE_FILE):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        # WAL: العارض يقرأ أثناء كتابة البناءات، و NORMAL يكفي للسجلات (دون fsync لكل دفعة)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(LOG_STORE_SCHEMA)
+        try:
+            self.conn.execute(LOG_STORE_FTS)
+            self.fts = True
+        except sqlite3.OperationalError:
+            self.fts = False
+        self.conn.commit()
+    
+    def start_build(self, build_id, app, command):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO builds (id, app, command, started) VALUES (?, ?, ?, ?)",
+                (build_id, app, " ".join(command), time.time())
+            )
+    
+    def add_lines(self, build_id, rows):
+        """rows: (seq, ts, level, phase, module, message)"""
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT INTO lines (build_id, seq, ts, level, phase, module, message) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(build_id,) + tuple(row) for row in rows]
+            )
+            if self.fts:
+                self.conn.execute(
+                    "INSERT INTO lines_fts (rowid, message) SELECT id, message FROM lines "
+                    "WHERE build_id = ? AND seq >= ?", (build_id, rows[0][0])
+                )
+    
+    def finish_build(self, build_id, success, message):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE builds SET finished = ?, success = ?, message = ? WHERE id = ?",
+                (time.time(), int(success), message, build_id)
+            )
+            self.prune()
+    
+    def prune(self):
+        """حذف أقدم البناءات بعد LOG_STORE_MAX_BUILDS"""
+        old = [row[0] for row in self.conn.execute(
+            "SELECT id FROM builds ORDER BY started DESC LIMIT -1 OFFSET ?", (LOG_STORE_MAX_BUILDS,)
+        )]
+        for build_id in old:
+            if self.fts:
+                self.conn.execute(
+                    "INSERT INTO lines_fts (lines_fts, rowid, message) "
+                    "SELECT 'delete', id, message FROM lines WHERE build_id = ?", (build_id,)
+                )
+            for table, column in (("lines", "build_id"), ("missing_modules", "build_id"), ("builds", "id")):
+                self.conn.execute(f"DELETE FROM {table} WHERE {column} = ?", (build_id,))
+    
+    def save_missing_modules(self, build_id, rows, warn_file, xref_file):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM missing_modules WHERE build_id = ?", (build_id,))
+            self.conn.executemany(
+                "INSERT INTO missing_modules VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(build_id, row["module"], row["kind"], ", ".join(row["importers"]),
+                  ", ".join(row["types"]), row["priority"], row["action"]) for row in rows]
+            )
+            self.conn.execute(
+                "UPDATE builds SET warn_file = ?, xref_file = ? WHERE id = ?", (warn_file, xref_file, build_id)
+            )
+    
+    def list_builds(self, limit=LOG_STORE_MAX_BUILDS):
+        """[(المعرف، التطبيق، البداية، النجاح، ملف xref)] الأحدث أولاً"""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT id, app, started, success, xref_file FROM builds ORDER BY started DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+    
+    def query_lines(self, build_id, level=None, phase=None, module="", text="", limit=LOG_VIEW_LIMIT):
+        """(الأسطر المطابقة حتى limit، العدد الكلي): (ts, level, phase, module, message)"""
+        where = ["build_id = ?"]
+        params = [build_id]
+        if level:
+            levels = LOG_LEVELS[:LOG_LEVELS.index(level) + 1]
+            where.append(f"level IN ({', '.join('?' * len(levels))})")
+            params.extend(levels)
+        if phase:
+            where.append("phase = ?")
+            params.append(phase)
+        if module:
+            # الوحدة نفسها أو ما تحتها ("/" يلي "." مباشرة، فالنطاق يستخدم الفهرس)
+            where.append("module >= ? AND module < ?")
+            params.extend([module, module + "/"])
+        if text:
+            if self.fts and len(text) >= 3:
+                where.append("id IN (SELECT rowid FROM lines_fts WHERE lines_fts MATCH ?)")
+                params.append('"' + text.replace('"', '""') + '"')
+            else:
+                where.append("message LIKE ? ESCAPE '\\'")
+                params.append("%" + re.sub(r"([%_\\])", r"\\\1", text) + "%")
+        condition = " AND ".join(where)
+        with self.lock:
+            total = self.conn.execute(f"SELECT count(*) FROM lines WHERE {condition}", params).fetchone()[0]
+            rows = self.conn.execute(
+                f"SELECT ts, level, phase, module, message FROM lines WHERE {condition} ORDER BY seq LIMIT ?",
+                params + [limit]
+            ).fetchall()
+        return rows, total
+    
+    def missing_modules(self, build_id):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT module, kind, importers, import_types, action FROM missing_modules "
+                "WHERE build_id = ? ORDER BY priority, module", (build_id,)
+            ).fetchall()
+
+
+_log_store = None
+
+
+def get_log_store():
+    """مخزن السجلات المشترك في العملية"""
+    global _log_store
+    if _log_store is None:
+        _log_store = BuildLogStore()
+    return _log_store
+
+
+class BuildLogRecorder:
+    """يحوّل أسطر سجل بناء واحد إلى سجلات ويكتبها في المخزن دفعات"""
+    
+    def __init__(self, store, build_id, app, command):
+        self.store = store
+        self.build_id = build_id
+        self.phase = "prepare"
+        self.seq = 0
+        self.pending = []
+        # add يُستدعى مباشرة من خيط البناء ومن خيط الواجهة (رسائل الإيقاف والاستئناف)،
+        # والقفل يحفظ تسلسل seq وترتيب الدفعات (RLock لأن add يستدعي flush)
+        self.lock = threading.RLock()
+        store.start_build(build_id, app, command)
+    
+    def add(self, text):
+        now = time.time()
+        with self.lock:
+            for line in str(text).split("\n"):
+                if not line.strip():
+                    continue
+                level, self.phase, module = parse_log_line(line, self.phase)
+                self.pending.append((self.seq, now, level, self.phase, module, line))
+                self.seq += 1
+            if len(self.pending) >= LOG_FLUSH_LINES:
+                self.flush()
+    
+    def flush(self):
+        # تعذر الكتابة (قرص ممتلئ أو قاعدة مقفلة) لا يوقف البناء
+        with self.lock:
+            if self.pending:
+                rows, self.pending = self.pending, []
+                try:
+                    self.store.add_lines(self.build_id, rows)
+                except sqlite3.Error:
+                    pass
+    
+    def set_phase(self, phase):
+        with self.lock:
+            self.phase = phase
+    
+    def finish(self, success, message):
+        self.flush()
+        try:
+            self.store.finish_build(self.build_id, success, message)
+        except sqlite3.Error:
+            pass
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # خيط التحويل
@@ -93,24 +5749,81 @@ class ConversionThread(QThread):
     log_signal = pyqtSignal(str)
     progress_signal = pyqtSignal(int)
     finished_signal = pyqtSignal(bool, str)
+    telemetry_signal = pyqtSignal(dict)
     
-    def __init__(self, command, output_dir):
+    def __init__(self, command, output_dir, config=None):
         super().__init__()
         self.command = command
         self.output_dir = output_dir
+        self.config = config or {}
+        self.backend = get_backend(self.config)
         self.process = None
         self.is_cancelled = False
+        self.analysis_started = None
+        self.analysis_seconds = None
+        self.cache_hits = None
+        self.memory_error_seen = False
+        # مهام الطابور تعمل في مجموعة عمليات خاصة لإيقافها مؤقتاً بكل عملياتها
+        self.preemptible = False
+        self.suspended = False
+        # حجز الذاكرة يُلغى أثناء الإيقاف المؤقت ويُعاد عند الاستئناف، وإلا
+        # انتظرت المهمة التي أزاحته إلى الأبد
+        self.admission_lock = threading.Lock()
+        self.admission_mb = 0
+        self.admission_budget = None
+        self.reservation_released = False
+        self.build_id = uuid.uuid4().hex[:8]
+        self.telemetry_stop = threading.Event()
+        self.telemetry_samples = []
+        # مدة كل مرحلة بالثواني (لقياس أداء المحول نفسه)
+        self.stage_times = {}
+        self.log_recorder = None
     
     def run(self):
+        self.admission_token = None
         try:
+            if self.config.get("log_store", True):
+                self.start_log_record()
             self.log_signal.emit("═" * 60)
             self.log_signal.emit(f"⏱️ بدء التحويل: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
             self.log_signal.emit("═" * 60)
+            
+            if self.config.get("slim_modules"):
+                self.slim_project_modules()
+            
+            if self.config.get("scratch_build"):
+                self.prepare_scratch_build()
+            
+            if self.config.get("minimal_venv"):
+                self.prepare_minimal_venv()
+                if self.is_cancelled:
+                    self.finished_signal.emit(False, "تم إلغاء العملية")
+                    return
+            
+            if self.config.get("binary_scan"):
+                self.scan_binary_dependencies()
+            
+            # ذاكرة التحليل تعتمد على ملفات TOC الخاصة بـ PyInstaller
+            if self.config.get("analysis_cache") and self.backend.name == "pyinstaller":
+                self.apply_analysis_cache()
+            
             self.log_signal.emit(f"\n📋 الأمر المنفذ:\n{' '.join(self.command)}\n")
             self.log_signal.emit("─" * 60)
             
             self.progress_signal.emit(10)
             
+            # قبول البناء حسب الذاكرة المتوقعة
+            if self.config.get("admission_control", True) and not self.wait_for_admission():
+                self.finished_signal.emit(False, "تم إلغاء العملية")
+                return
+            
+            limits = ResourceLimits(
+                self.config.get("memory_limit_mb", 0),
+                self.config.get("cpu_limit_seconds", 0)
+            )
+            started = time.perf_counter()
+            self.set_log_phase("analysis")
+            
             # تنفيذ PyInstaller
             self.process = subprocess.Popen(
                 self.command,
@@ -119,8 +5832,16 @@ class ConversionThread(QThread):
                 text=True,
                 bufsize=1,
                 universal_newlines=True,
-                cwd=self.output_dir
+                cwd=self.output_dir,
+                start_new_session=self.preemptible and sys.platform != "win32",
+                **limits.popen_kwargs()
             )
+            limits.attach(self.process)
+            if limits.memory_mb and not limits.can_enforce_memory():
+                self.log_signal.emit("⚠️ حد الذاكرة غير مطبق: قياس ذاكرة البناء على هذا النظام يتطلب psutil")
+            if self.suspended:
+                signal_process(self.process, True)
+            self.start_telemetry(limits)
             
             self.progress_signal.emit(20)
             
@@ -133,6 +5854,9 @@ class ConversionThread(QThread):
                     return
                 
                 self.log_signal.emit(line.strip())
+                self.track_analysis_time(line)
+                if "MemoryError" in line:
+                    self.memory_error_seen = True
                 
                 # تحديث التقدم بناءً على المخرجات
                 if "Analyzing" in line:
@@ -146,9 +5870,17 @@ class ConversionThread(QThread):
                 
                 self.progress_signal.emit(progress)
             
-            self.process.wait()
+            self.telemetry_stop.set()
+            limits.wait(self.process)
+            self.stage_times["freeze"] = time.perf_counter() - started
+            self.report_resource_usage(limits, self.stage_times["freeze"])
+            self.report_telemetry()
             
             if self.process.returncode == 0:
+                started = time.perf_counter()
+                self.set_log_phase("post")
+                self.run_post_build_stages()
+                self.stage_times["post_build"] = time.perf_counter() - started
                 self.progress_signal.emit(100)
                 self.log_signal.emit("\n" + "═" * 60)
                 self.log_signal.emit("✅ تم التحويل بنجاح!")
@@ -163,13 +5895,495 @@ class ConversionThread(QThread):
         except Exception as e:
             self.log_signal.emit(f"\n❌ خطأ: {str(e)}")
             self.finished_signal.emit(False, str(e))
+        finally:
+            self.telemetry_stop.set()
+            with self.admission_lock:
+                if self.admission_token:
+                    release_build(self.admission_token)
+                    self.admission_token = None
+    
+    def start_log_record(self):
+        """حفظ أسطر هذا البناء في السجل المفهرس (في خيط البناء نفسه)"""
+        try:
+            self.log_recorder = BuildLogRecorder(
+                get_log_store(), self.build_id, get_app_name(self.config), self.command
+            )
+        except (sqlite3.Error, OSError) as e:
+            self.log_signal.emit(f"⚠️ تعذر فتح سجل البناءات: {str(e)}")
+            return
+        self.log_signal.connect(self.log_recorder.add, Qt.DirectConnection)
+        self.finished_signal.connect(self.log_recorder.finish, Qt.DirectConnection)
+    
+    def set_log_phase(self, phase):
+        if self.log_recorder:
+            self.log_recorder.set_phase(phase)
+    
+    def report_missing_modules(self):
+        """جدول الوحدات المفقودة من warn-<name>.txt (بلا تكرار ومرتبة حسب الحاجة لإجراء)"""
+        warn_file = find_pyinstaller_report(self.config, self.command, "warn", ".txt")
+        if not warn_file:
+            return
+        try:
+            rows = parse_warn_file(warn_file)
+        except OSError as e:
+            self.log_signal.emit(f"⚠️ تعذر قراءة {warn_file}: {str(e)}")
+            return
+        if self.log_recorder:
+            xref_file = find_pyinstaller_report(self.config, self.command, "xref", ".html")
+            try:
+                self.log_recorder.store.save_missing_modules(self.build_id, rows, warn_file, xref_file)
+            except sqlite3.Error:
+                pass
+        
+        actionable = [row for row in rows if row["priority"] == 0]
+        self.log_signal.emit(
+            f"\n🔎 الوحدات المفقودة: {len(rows)} - تحتاج إجراء: {len(actionable)} "
+            f"(التفاصيل في \"سجل البناءات\")"
+        )
+        for row in actionable[:10]:
+            self.log_signal.emit(f"   ⚠️ {row['module']} ← {', '.join(row['importers'][:3])}")
+    
+    def report_payload_prune(self):
+        """تقرير التقليم الذي يكتبه ملف .spec (الحجم وعدد الملفات قبل وبعد)"""
+        report_file = find_pyinstaller_report(self.config, self.command, "prune", ".json")
+        if not report_file:
+            self.log_signal.emit("⚠️ لم يُكتب تقرير التقليم (ملف .spec معدَّل يدوياً أو قديم؟)")
+            return
+        try:
+            with open(report_file, 'r', encoding='utf-8') as f:
+                report = json.load(f)
+        except (OSError, ValueError) as e:
+            self.log_signal.emit(f"⚠️ تعذر قراءة {report_file}: {str(e)}")
+            return
+        for line in format_prune_report(report, self.backend.is_onefile(self.config)):
+            self.log_signal.emit(line)
+    
+    def wait_for_admission(self):
+        """انتظار توفر الذاكرة المتوقعة للبناء. يُرجع False عند الإلغاء"""
+        self.config_hash = get_config_hash(self.config)
+        predicted, known = predict_build_memory(self.config_hash)
+        if self.config.get("memory_limit_mb"):
+            predicted = min(predicted, self.config["memory_limit_mb"])
+        budget = get_memory_budget_mb(self.config.get("memory_budget_mb", 0))
+        self.admission_mb = predicted
+        self.admission_budget = budget
+        token = uuid.uuid4().hex
+        
+        waiting_logged = False
+        while not self.is_cancelled:
+            with self.admission_lock:
+                # المهمة الموقوفة مؤقتاً لا تحجز ذاكرة حتى تُستأنف
+                admitted, reserved = (False, 0) if self.suspended else try_admit_build(token, predicted, budget)
+                if admitted:
+                    self.admission_token = token
+            if admitted:
+                source = "من البناءات السابقة" if known else "تقدير افتراضي"
+                self.log_signal.emit(
+                    f"🧮 الذاكرة المتوقعة: {predicted} MB ({source}) - "
+                    f"محجوز لبناءات أخرى: {reserved} MB من {budget or '?'} MB"
+                )
+                return True
+            if not waiting_logged and not self.suspended:
+                self.log_signal.emit(
+                    f"⏳ في انتظار توفر الذاكرة: يحتاج البناء {predicted} MB "
+                    f"والمحجوز {reserved} MB من {budget} MB"
+                )
+                waiting_logged = True
+            time.sleep(ADMISSION_POLL_SECONDS)
+        return False
+    
+    def report_resource_usage(self, limits, seconds):
+        """تسجيل ذروة الذاكرة ومدة البناء"""
+        if limits.peak_mb is None:
+            return
+        self.log_signal.emit(f"📈 ذروة الذاكرة: {limits.peak_mb:.0f} MB - المدة: {seconds:.1f} ث")
+        
+        memory_limit = self.config.get("memory_limit_mb", 0)
+        near_limit = self.memory_error_seen or limits.peak_mb >= memory_limit * 0.9
+        # تجاوز الحد سُجّل عند إنهاء البناء، والتحذير للفشل قرب الحد فقط
+        if self.process.returncode != 0 and memory_limit and near_limit and not limits.memory_exceeded:
+            self.log_signal.emit(f"⚠️ قد يكون الفشل بسبب حد الذاكرة ({memory_limit} MB)")
+        if self.process.returncode == 0:
+            try:
+                record_build_memory(get_config_hash(self.config), limits.peak_mb, seconds)
+            except OSError as e:
+                self.log_signal.emit(f"⚠️ تعذر حفظ سجل الذاكرة: {str(e)}")
+    
+    def start_telemetry(self, limits):
+        """بدء قياس موارد شجرة عمليات البناء في خيط منفصل (ومنه يُطبَّق حد الذاكرة)"""
+        if self.config.get("metrics_port"):
+            try:
+                METRICS.serve(self.config["metrics_port"])
+            except OSError as e:
+                self.log_signal.emit(f"⚠️ تعذر تشغيل نقطة المقاييس: {str(e)}")
+        threading.Thread(target=self.sample_telemetry, args=(self.process.pid, limits), daemon=True).start()
+    
+    def sample_telemetry(self, pid, limits):
+        """أخذ عينة كل TELEMETRY_INTERVAL ثانية حتى انتهاء البناء"""
+        sampler = TelemetrySampler(pid)
+        labels = {"app": get_app_name(self.config), "build": self.build_id}
+        metrics_file = self.config.get("metrics_file")
+        try:
+            while not self.telemetry_stop.wait(TELEMETRY_INTERVAL):
+                try:
+                    sample = sampler.sample()
+                except Exception:
+                    continue
+                if sample is None:
+                    return
+                if limits.check_memory(sample, self.process):
+                    self.log_signal.emit(
+                        f"❌ تجاوزت ذاكرة البناء المقيمة {sample['rss_bytes'] / 2**20:.0f} MB "
+                        f"حد الذاكرة ({limits.memory_mb} MB) - تم إنهاء البناء"
+                    )
+                self.telemetry_samples.append(sample)
+                self.telemetry_signal.emit(sample)
+                METRICS.update(self.build_id, labels, sample, metrics_file)
+        finally:
+            METRICS.remove(self.build_id, metrics_file)
+    
+    def report_telemetry(self):
+        """ملخص العينات: هل كان البناء مقيداً بالمعالج أم بالقرص"""
+        samples = self.telemetry_samples
+        if len(samples) < 2:
+            return
+        mb = 1024 * 1024
+        cpu = sum(sample["cpu_percent"] for sample in samples[1:]) / (len(samples) - 1)
+        io_rate = sum(sample["read_rate"] + sample["write_rate"] for sample in samples[1:]) / (len(samples) - 1)
+        last = samples[-1]
+        self.log_signal.emit(
+            f"📊 متوسط المعالج: {cpu:.0f}% - قراءة: {last['read_bytes'] / mb:.0f} MB - "
+            f"كتابة: {last['write_bytes'] / mb:.0f} MB - متوسط القرص: {io_rate / mb:.1f} MB/ث"
+        )
+    
+    def track_analysis_time(self, line):
+        """قياس مدة مرحلة التحليل من الطوابع الزمنية في سجل PyInstaller"""
+        match = PYINSTALLER_LOG_RE.match(line)
+        if not match:
+            return
+        timestamp = int(match.group(1)) / 1000
+        if self.analysis_started is None and ("Analyzing" in line or "module dependency graph" in line):
+            self.analysis_started = timestamp
+        elif self.analysis_started is not None and self.analysis_seconds is None and "PYZ" in line:
+            self.analysis_seconds = timestamp - self.analysis_started
+    
+    def prepare_minimal_venv(self):
+        """تشغيل PyInstaller من بيئة افتراضية مصغرة فيها متطلبات المشروع فقط"""
+        self.log_signal.emit("🧪 جاري تحديد متطلبات المشروع...")
+        resolved = resolve_requirements(self.config, self.command[0])
+        if resolved["unresolved"]:
+            self.log_signal.emit(
+                f"⚠️ مكتبات غير مثبتة أو غير معروفة المصدر (لن تُضاف للبيئة): "
+                f"{', '.join(resolved['unresolved'])}"
+            )
+        
+        started = time.perf_counter()
+        python_exe, reused = ensure_minimal_venv(
+            self.command[0], resolved, self.log_signal.emit, self.set_process
+        )
+        self.process = None
+        if reused:
+            self.log_signal.emit(
+                f"♻️ البيئة المصغرة جاهزة من الذاكرة ({len(resolved['requirements'])} متطلب)"
+            )
+        else:
+            self.log_signal.emit(
+                f"✅ أُنشئت البيئة المصغرة في {time.perf_counter() - started:.1f} ث"
+            )
+        self.command[0] = python_exe
+    
+    def slim_project_modules(self):
+        """البناء من نسخة منحّفة من وحدات المشروع"""
+        spec = self.command[-1]
+        if self.config.get("spec_file") or (spec.endswith(".spec") and is_spec_edited(spec)):
+            self.log_signal.emit("⚠️ ملف .spec مخصص أو معدَّل يدوياً - لن تُنحَّف وحدات المشروع")
+            return
+        self.log_signal.emit("✂️ جاري تنحيف وحدات المشروع...")
+        try:
+            config, stats = slim_project(self.config)
+            command, error = build_command_from_config(config)
+            if error:
+                raise ValueError(error)
+        except Exception as e:
+            self.log_signal.emit(f"⚠️ تعذر التنحيف - سيُبنى من الملفات الأصلية: {str(e)}")
+            return
+        command[0] = self.command[0]
+        self.config, self.command = config, command
+        for line in format_slim_report(stats):
+            self.log_signal.emit(line)
+    
+    def prepare_scratch_build(self):
+        """تجهيز مجلد البناء المحلي (tmpfs إن أمكن) بدل مجلد الإخراج"""
+        staging_dir = get_staging_dir(self.config)
+        os.makedirs(staging_dir, exist_ok=True)
+        kind = "tmpfs" if is_tmpfs(staging_dir) else "قرص محلي"
+        self.log_signal.emit(f"🚀 البناء في مجلد تجهيز محلي ({kind}): {staging_dir}")
+        self.scratch_started = time.time()
+    
+    def move_staged_artifacts(self):
+        """نقل الناتج من مجلد التجهيز إلى مجلد الإخراج وتقدير الوقت الموفّر"""
+        staged = get_build_dist_dir(self.config)
+        if not os.path.isdir(staged) or not os.listdir(staged):
+            raise RuntimeError(f"لا يوجد ناتج في مجلد التجهيز: {staged}")
+        files, size = count_written_files(get_staging_dir(self.config), self.scratch_started)
+        
+        started = time.perf_counter()
+        renamed = move_tree_contents(staged, get_dist_dir(self.config))
+        seconds = time.perf_counter() - started
+        self.stage_times["staging_move"] = seconds
+        method = "إعادة تسمية" if renamed else "نسخة واحدة"
+        self.log_signal.emit(f"📦 نُقل الناتج إلى {get_dist_dir(self.config)} ({method}) في {seconds:.1f} ث")
+        
+        try:
+            target_cost = probe_small_file_io(get_work_dir(self.config))
+            scratch_cost = probe_small_file_io(get_staging_dir(self.config))
+        except OSError:
+            return
+        saved = files * (target_cost - scratch_cost) - seconds
+        self.log_signal.emit(
+            f"💾 كُتب {files} ملف ({size / (1024 * 1024):.1f} MB) في مجلد التجهيز - "
+            f"الوقت الموفّر المقدّر: {saved:.1f} ث "
+            f"(الملف الصغير: {target_cost * 1000:.2f} ms في مجلد الإخراج مقابل {scratch_cost * 1000:.2f} ms)"
+        )
+    
+    def scan_binary_dependencies(self):
+        """فحص المكتبات الثنائية قبل البناء (المفقودة والمكررة)"""
+        started = time.perf_counter()
+        try:
+            report, scanner = scan_project_binaries(self.config, self.command[0])
+        except Exception as e:
+            self.log_signal.emit(f"⚠️ تعذر فحص الاعتماديات الثنائية: {str(e)}")
+            return
+        for line in format_binary_report(report, scanner, time.perf_counter() - started):
+            self.log_signal.emit(line)
+    
+    def set_process(self, process):
+        """تسجيل العملية الفرعية الحالية (لإتاحة الإلغاء)"""
+        self.process = process
+        if self.is_cancelled:
+            process.terminate()
+        elif self.suspended:
+            signal_process(process, True)
+    
+    def apply_analysis_cache(self):
+        """استخدام نتائج التحليل المخزنة للحزم الخارجية"""
+        try:
+            overrides, hits, misses = apply_analysis_cache(self.config, self.command[0])
+            if hits and not self.apply_build_overrides(overrides):
+                hits, misses = [], hits + misses
+        except Exception as e:
+            self.log_signal.emit(f"⚠️ تعذر استخدام ذاكرة التحليل: {str(e)}")
+            return
+        
+        self.cache_hits = hits
+        total = len(hits) + len(misses)
+        rate = (len(hits) / total * 100) if total else 0
+        self.log_signal.emit(f"📦 ذاكرة التحليل: {len(hits)}/{total} حزمة مطابقة ({rate:.0f}%)")
+        if hits:
+            self.log_signal.emit(f"   من الذاكرة: {', '.join(hits)}")
+        if misses:
+            self.log_signal.emit(f"   تحليل كامل: {', '.join(misses)}")
+    
+    def apply_build_overrides(self, overrides):
+        """إضافة قوائم إضافية إلى البناء: في ملف .spec أو كمعاملات قبل ملف المصدر"""
+        if self.command[-1].endswith(".spec"):
+            if is_spec_edited(self.command[-1]):
+                self.log_signal.emit("⚠️ ملف .spec معدَّل يدوياً - لن تُضاف إليه نتائج ذاكرة التحليل")
+                return False
+            self.command[-1] = write_spec(merge_build_overrides(self.config, overrides))
+        elif overrides.get("cached_toc"):
+            # مدخلات TOC لا تُمرَّر كمعاملات، ودون حقنها يُفقد محتوى الحزم المستثناة
+            self.log_signal.emit("⚠️ ذاكرة التحليل تتطلب البناء عبر ملف .spec")
+            return False
+        else:
+            self.command[-1:-1] = overrides_to_args(overrides)
+        return True
+    
+    def update_analysis_cache(self):
+        """تخزين نتائج تحليل الحزم الجديدة"""
+        if self.analysis_seconds is not None and self.cache_hits is not None:
+            # زمن مقيس فقط: مقارنة بآخر بناء بنفس الإعدادات لم يطابق أي حزمة
+            try:
+                cold = record_analysis_time(self.config, self.analysis_seconds, not self.cache_hits)
+            except OSError:
+                cold = None
+            if self.cache_hits and cold:
+                self.log_signal.emit(
+                    f"⏱️ زمن التحليل: {self.analysis_seconds:.1f} ث "
+                    f"(آخر بناء بدون ذاكرة التحليل: {cold:.1f} ث)"
+                )
+            else:
+                self.log_signal.emit(f"⏱️ زمن التحليل: {self.analysis_seconds:.1f} ث")
+        try:
+            added = update_analysis_cache(self.config, self.command[0])
+            if added:
+                self.log_signal.emit(f"📦 أُضيفت إلى ذاكرة التحليل: {', '.join(sorted(added))}")
+        except Exception as e:
+            self.log_signal.emit(f"⚠️ تعذر تحديث ذاكرة التحليل: {str(e)}")
+    
+    def run_post_build_stages(self):
+        """مراحل ما بعد البناء"""
+        self.backend.finalize(self.config)
+        if self.config.get("scratch_build"):
+            self.move_staged_artifacts()
+        is_pyinstaller = self.backend.name == "pyinstaller"
+        onedir = not self.backend.is_onefile(self.config)
+        if is_pyinstaller:
+            self.report_missing_modules()
+        if self.config.get("prune_payload") and is_pyinstaller:
+            self.report_payload_prune()
+        if self.config.get("analysis_cache") and is_pyinstaller:
+            self.update_analysis_cache()
+        if self.config.get("shared_runtime") and onedir and is_pyinstaller:
+            self.extract_shared_runtime()
+        if self.config.get("delta_updates") and onedir:
+            self.create_release_delta()
+        if self.config.get("import_profile") and is_pyinstaller:
+            self.log_signal.emit(
+                "\n🩺 بناء تشخيصي: شغّل البرنامج وسيكتب تقرير زمن الاستيراد بجانبه "
+                f"({get_app_name(self.config)}.importtime.json) عند الخروج أو بعد 20 ثانية، "
+                "ثم حلّله من \"إعدادات متقدمة\""
+            )
+    
+    def extract_shared_runtime(self):
+        """فصل الملفات المشتركة إلى طبقة التشغيل المشتركة"""
+        app_name = get_app_name(self.config)
+        app_dir = os.path.join(get_dist_dir(self.config), app_name)
+        if not os.path.isdir(app_dir):
+            self.log_signal.emit(f"⚠️ مجلد التطبيق غير موجود: {app_dir}")
+            return
+        
+        self.log_signal.emit("\n🧩 جاري فصل طبقة التشغيل المشتركة...")
+        try:
+            layer_id = get_runtime_layer_id(self.command[0])
+            layers_root = self.config.get("runtime_layers_dir") or RUNTIME_LAYERS_DIR
+            keep = {os.path.basename(p) for p in self.config.get("extra_files", [])}
+            exe_names = [name for name, script in get_entries(self.config)]
+            stats = extract_runtime_layer(app_dir, layers_root, layer_id, exe_names, keep)
+            
+            self.log_signal.emit(f"   الطبقة: {layer_id}")
+            self.log_signal.emit(
+                f"   ملفات مشتركة: {stats['shared']} "
+                f"({stats['shared_bytes'] / (1024 * 1024):.1f} MB) - "
+                f"جديدة في الطبقة: {stats['added']} - باقية في التطبيق: {stats['kept']}"
+            )
+            self.log_signal.emit(f"   البيان: {os.path.join(app_dir, RUNTIME_MANIFEST)}")
+        except Exception as e:
+            self.log_signal.emit(f"❌ فشل فصل طبقة التشغيل: {str(e)}")
+    
+    def create_release_delta(self):
+        """حزمة تحديث تفاضلية من آخر إصدار إلى الناتج الحالي"""
+        self.log_signal.emit("\n📦 جاري مقارنة الناتج بآخر إصدار...")
+        try:
+            stats, released = create_release_delta(self.config)
+        except Exception as e:
+            self.log_signal.emit(f"❌ فشل إنشاء حزمة التحديث: {str(e)}")
+            return
+        
+        if stats is None:
+            if not released:
+                self.log_signal.emit(
+                    "   لا يوجد إصدار منشور بعد - فعّل \"اعتماد هذا البناء إصداراً منشوراً\" عند نشر أول إصدار"
+                )
+        elif not stats["changed"] and not stats["removed"]:
+            self.log_signal.emit("   لا تغييرات منذ آخر إصدار")
+        else:
+            mb = 1024 * 1024
+            self.log_signal.emit(
+                f"   ملفات متغيرة: {stats['changed']} (منها {stats['patched']} بفروق الكتل) - "
+                f"محذوفة: {stats['removed']}"
+            )
+            self.log_signal.emit(
+                f"   حجم التحديث: {stats['delta_bytes'] / mb:.2f} MB بدلاً من "
+                f"{stats['full_bytes'] / mb:.2f} MB للملفات المتغيرة"
+            )
+            self.log_signal.emit(f"   الحزمة: {stats['path']}")
+        if released:
+            self.log_signal.emit("📌 اعتُمد هذا الناتج إصداراً منشوراً - حزم التحديث التالية تُبنى منه")
+    
+    def suspend(self):
+        """إيقاف عملية البناء مؤقتاً وإلغاء حجز ذاكرتها لتستخدمه المهمة التي أزاحتها"""
+        with self.admission_lock:
+            if self.suspended:
+                return
+            if self.process and self.process.poll() is None:
+                signal_process(self.process, True)
+            self.suspended = True
+            if self.admission_token:
+                release_build(self.admission_token)
+                self.admission_token = None
+                self.reservation_released = True
+        self.log_signal.emit("⏸️ أُوقف البناء مؤقتاً (أُلغي حجز ذاكرته حتى الاستئناف)")
+    
+    def resume(self, force=False):
+        """استئناف البناء بعد إعادة حجز ذاكرته (False إن لم تتوفر؛ force للإلغاء دون حجز)"""
+        with self.admission_lock:
+            if not self.suspended:
+                return True
+            if self.reservation_released and not force:
+                token = uuid.uuid4().hex
+                admitted, reserved = try_admit_build(token, self.admission_mb, self.admission_budget)
+                if not admitted:
+                    return False
+                self.admission_token = token
+            self.reservation_released = False
+            if self.process and self.process.poll() is None:
+                signal_process(self.process, False)
+            self.suspended = False
+        self.log_signal.emit("▶️ استؤنف البناء")
+        return True
     
     def cancel(self):
         self.is_cancelled = True
+        # العملية الموقوفة لا تستقبل إشارة الإنهاء قبل استئنافها
+        self.resume(force=True)
         if self.process:
             self.process.terminate()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# رسم بياني مصغر
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class Sparkline(QWidget):
+    """خط بياني صغير لآخر القيم (يتدرج تلقائياً حسب أعلى قيمة)"""
+    
+    def __init__(self, color, parent=None):
+        super().__init__(parent)
+        self.color = QColor(color)
+        self.values = []
+        self.setMinimumSize(120, 36)
+    
+    def add_value(self, value):
+        self.values.append(value)
+        del self.values[:-TELEMETRY_HISTORY]
+        self.update()
+    
+    def clear(self):
+        self.values = []
+        self.update()
+    
+    def paintEvent(self, event):
+        if len(self.values) < 2:
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(QPen(self.color, 1.5))
+        
+        width, height = self.width() - 2, self.height() - 4
+        peak = max(self.values) or 1
+        step = width / (TELEMETRY_HISTORY - 1)
+        offset = width - step * (len(self.values) - 1)
+        points = [
+            (offset + i * step, 2 + height - value / peak * height)
+            for i, value in enumerate(self.values)
+        ]
+        # الرسم من اليسار لليمين حتى في الواجهة العربية
+        for (x1, y1), (x2, y2) in zip(points, points[1:]):
+            painter.drawLine(int(x1), int(y1), int(x2), int(y2))
+        painter.end()
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # نافذة إضافة Hidden Import
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -201,6 +6415,146 @@ class AddImportDialog(QDialog):
         return self.input.text().strip()
 
 
+class BuildLogDialog(QDialog):
+    """عارض سجل البناءات: تصفية بالمستوى والمرحلة والوحدة وبحث نصي، وجدول الوحدات المفقودة"""
+    
+    def __init__(self, store, add_hidden_imports=None, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.add_hidden_imports = add_hidden_imports
+        self.setWindowTitle("📜 سجل البناءات")
+        self.resize(1000, 650)
+        self.setLayoutDirection(Qt.RightToLeft)
+        
+        layout = QVBoxLayout(self)
+        
+        # ═══ البناء والتصفية ═══
+        filters = QHBoxLayout()
+        self.build_combo = QComboBox()
+        for build_id, app, started, success, xref_file in store.list_builds():
+            status = "⏳" if success is None else ("✅" if success else "❌")
+            when = datetime.fromtimestamp(started).strftime("%Y-%m-%d %H:%M") if started else "?"
+            self.build_combo.addItem(f"{status} {app} - {when}", (build_id, xref_file))
+        filters.addWidget(self.build_combo, stretch=2)
+        
+        self.level_combo = QComboBox()
+        self.level_combo.addItem("كل المستويات", None)
+        for level, title in zip(LOG_LEVELS, ("أخطاء", "تحذيرات فأعلى", "معلومات فأعلى", "الكل مع التصحيح")):
+            self.level_combo.addItem(title, level)
+        filters.addWidget(self.level_combo)
+        
+        self.phase_combo = QComboBox()
+        self.phase_combo.addItem("كل المراحل", None)
+        for name, title, markers in LOG_PHASES:
+            self.phase_combo.addItem(title, name)
+        filters.addWidget(self.phase_combo)
+        
+        self.module_filter = QLineEdit()
+        self.module_filter.setPlaceholderText("الوحدة (وما تحتها)")
+        filters.addWidget(self.module_filter)
+        
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("🔍 بحث في النص...")
+        filters.addWidget(self.search_input, stretch=2)
+        layout.addLayout(filters)
+        
+        # ═══ الأسطر والوحدات المفقودة ═══
+        tabs = QTabWidget()
+        lines_tab = QWidget()
+        lines_layout = QVBoxLayout(lines_tab)
+        self.lines_output = QTextEdit()
+        self.lines_output.setReadOnly(True)
+        self.lines_output.setLayoutDirection(Qt.LeftToRight)
+        self.lines_output.setFont(QFont("Consolas", 9))
+        lines_layout.addWidget(self.lines_output)
+        self.count_label = QLabel()
+        lines_layout.addWidget(self.count_label)
+        tabs.addTab(lines_tab, "📋 الأسطر")
+        
+        missing_tab = QWidget()
+        missing_layout = QVBoxLayout(missing_tab)
+        self.missing_table = QTableWidget(0, 5)
+        self.missing_table.setHorizontalHeaderLabels(
+            ["الوحدة", "النوع", "مستوردة من", "طريقة الاستيراد", "الإجراء المقترح"]
+        )
+        self.missing_table.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.missing_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.missing_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        missing_layout.addWidget(self.missing_table)
+        
+        missing_buttons = QHBoxLayout()
+        add_btn = QPushButton("➕ إضافة المحدد كمكتبات مخفية")
+        add_btn.clicked.connect(self.add_selected_hidden_imports)
+        add_btn.setEnabled(add_hidden_imports is not None)
+        missing_buttons.addWidget(add_btn)
+        self.xref_btn = QPushButton("🌐 فتح xref")
+        self.xref_btn.setToolTip("رسم الاستيرادات الكامل الذي يكتبه PyInstaller (xref-<name>.html)")
+        self.xref_btn.clicked.connect(self.open_xref)
+        missing_buttons.addWidget(self.xref_btn)
+        missing_layout.addLayout(missing_buttons)
+        tabs.addTab(missing_tab, "⚠️ الوحدات المفقودة")
+        layout.addWidget(tabs)
+        
+        # تحديث بعد توقف الكتابة قليلاً
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.setInterval(150)
+        self.refresh_timer.timeout.connect(self.refresh_lines)
+        self.module_filter.textChanged.connect(self.refresh_timer.start)
+        self.search_input.textChanged.connect(self.refresh_timer.start)
+        self.level_combo.currentIndexChanged.connect(self.refresh_lines)
+        self.phase_combo.currentIndexChanged.connect(self.refresh_lines)
+        self.build_combo.currentIndexChanged.connect(self.refresh_build)
+        
+        self.refresh_build()
+    
+    def current_build(self):
+        data = self.build_combo.currentData()
+        return data if data else (None, None)
+    
+    def refresh_build(self):
+        build_id, xref_file = self.current_build()
+        self.xref_btn.setEnabled(bool(xref_file and os.path.isfile(xref_file)))
+        self.missing_table.setRowCount(0)
+        if build_id:
+            for row in self.store.missing_modules(build_id):
+                index = self.missing_table.rowCount()
+                self.missing_table.insertRow(index)
+                for column, value in enumerate(row):
+                    self.missing_table.setItem(index, column, QTableWidgetItem(value))
+        self.refresh_lines()
+    
+    def refresh_lines(self):
+        build_id, xref_file = self.current_build()
+        if not build_id:
+            self.lines_output.setPlainText("لا توجد بناءات محفوظة بعد")
+            self.count_label.setText("")
+            return
+        started = time.perf_counter()
+        rows, total = self.store.query_lines(
+            build_id, self.level_combo.currentData(), self.phase_combo.currentData(),
+            self.module_filter.text().strip(), self.search_input.text()
+        )
+        elapsed = (time.perf_counter() - started) * 1000
+        self.lines_output.setPlainText("\n".join(
+            f"{datetime.fromtimestamp(ts).strftime('%H:%M:%S')} {level:<7} {phase:<10} {message}"
+            for ts, level, phase, module, message in rows
+        ))
+        shown = f"عرض {len(rows)} من {total}" if total > len(rows) else f"{total} سطر"
+        self.count_label.setText(f"{shown} ({elapsed:.0f} ms)")
+    
+    def add_selected_hidden_imports(self):
+        rows = sorted({index.row() for index in self.missing_table.selectedIndexes()})
+        names = [self.missing_table.item(row, 0).text() for row in rows]
+        if names:
+            self.add_hidden_imports(names)
+    
+    def open_xref(self):
+        build_id, xref_file = self.current_build()
+        if xref_file and os.path.isfile(xref_file):
+            webbrowser.open(Path(xref_file).as_uri())
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # النافذة الرئيسية
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -209,7 +6563,20 @@ class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.conversion_thread = None
-        self.settings = {}
+        self.trace_thread = None
+        self.bootstrap_thread = None
+        self.pending_conversion = None
+        self.validation_threads = []
+        self.compare_thread = None
+        self.scan_thread = None
+        # إصدارات أدوات التجميد المثبتة (تُفحص عند الحاجة)
+        self.backend_versions = {}
+        self.build_queue = BuildQueue()
+        self.settings = SettingsStore()
+        self.applied_profiles = []
+        # ما استخدمه التطبيق في آخر تتبع (وحدات وملفات بيانات وإضافات Qt)
+        self.payload_usage = {}
+        self.profiles, self.profile_errors = load_profiles()
         self.load_settings()
         self.init_ui()
         self.check_dependencies()
@@ -381,6 +6748,7 @@ class MainWindow(QMainWindow):
         tabs.addTab(self.create_main_tab(), "⚙️ الإعدادات الرئيسية")
         tabs.addTab(self.create_advanced_tab(), "🔧 إعدادات متقدمة")
         tabs.addTab(self.create_templates_tab(), "📋 القوالب")
+        tabs.addTab(self.create_queue_tab(), "🗂️ طابور البناء")
         tabs.addTab(self.create_about_tab(), "ℹ️ حول البرنامج")
         main_layout.addWidget(tabs)
         
@@ -395,6 +6763,26 @@ class MainWindow(QMainWindow):
         self.progress_bar.setFormat("%p% - جاهز للتحويل")
         progress_layout.addWidget(self.progress_bar)
         
+        # قياسات البناء المباشرة
+        telemetry_widget = QWidget()
+        telemetry_widget.setLayoutDirection(Qt.LeftToRight)
+        telemetry_layout = QGridLayout(telemetry_widget)
+        telemetry_layout.setContentsMargins(0, 0, 0, 0)
+        self.telemetry_lines = {}
+        self.telemetry_labels = {}
+        for column, (key, title, color) in enumerate((
+            ("cpu", "CPU", "#89b4fa"),
+            ("memory", "RAM", "#a6e3a1"),
+            ("io", "Disk I/O", "#fab387"),
+            ("files", "Open files", "#f5c2e7"),
+        )):
+            self.telemetry_labels[key] = QLabel(f"{title}: -")
+            self.telemetry_labels[key].setProperty("title", title)
+            self.telemetry_lines[key] = Sparkline(color)
+            telemetry_layout.addWidget(self.telemetry_labels[key], 0, column)
+            telemetry_layout.addWidget(self.telemetry_lines[key], 1, column)
+        progress_layout.addWidget(telemetry_widget)
+        
         main_layout.addWidget(progress_group)
         
         # أزرار التحكم
@@ -499,6 +6887,28 @@ class MainWindow(QMainWindow):
         options_group = QGroupBox("⚙️ خيارات التحويل")
         options_layout = QVBoxLayout(options_group)
         
+        # أداة التجميد
+        backend_row = QHBoxLayout()
+        backend_row.addWidget(QLabel("أداة التجميد:"))
+        self.backend_combo = QComboBox()
+        for backend in BACKENDS.values():
+            self.backend_combo.addItem(backend.label, backend.name)
+        self.backend_combo.setToolTip(
+            "Nuitka يترجم الكود إلى C مسبقاً (بناء أبطأ وتشغيل أسرع للأدوات كثيفة الحساب)، "
+            "وcx_Freeze يبني مجلداً فقط"
+        )
+        backend_row.addWidget(self.backend_combo, stretch=1)
+        backend_row.addWidget(QLabel("أرشيف الوحدات:"))
+        self.archive_combo = QComboBox()
+        for mode, label in ARCHIVE_MODES.items():
+            self.archive_combo.addItem(label, mode)
+        self.archive_combo.setToolTip(
+            "الضغط يصغّر الحجم لكن كل وحدة تُفك عند استيرادها؛ دون ضغط أو كملفات منفصلة "
+            "يسرّع بدء التطبيقات التي تستورد آلاف الوحدات مقابل حجم أكبر"
+        )
+        backend_row.addWidget(self.archive_combo, stretch=1)
+        options_layout.addLayout(backend_row)
+        
         # الصف الأول
         row1 = QHBoxLayout()
         self.onefile_check = QCheckBox("ملف واحد (--onefile)")
@@ -548,8 +6958,16 @@ class MainWindow(QMainWindow):
         clear_log_btn = QPushButton("🗑️ مسح السجل")
         clear_log_btn.clicked.connect(lambda: self.log_output.clear())
         
+        build_logs_btn = QPushButton("📜 سجل البناءات")
+        build_logs_btn.setToolTip("كل البناءات السابقة مع التصفية والبحث وجدول الوحدات المفقودة")
+        build_logs_btn.clicked.connect(self.show_build_logs)
+        
+        log_buttons = QHBoxLayout()
+        log_buttons.addWidget(clear_log_btn)
+        log_buttons.addWidget(build_logs_btn)
+        
         log_layout.addWidget(self.log_output)
-        log_layout.addWidget(clear_log_btn)
+        log_layout.addLayout(log_buttons)
         
         layout.addWidget(log_group)
         
@@ -560,6 +6978,32 @@ class MainWindow(QMainWindow):
         tab = QWidget()
         layout = QVBoxLayout(tab)
         
+        # ═══ نقاط الدخول الإضافية ═══
+        entries_group = QGroupBox("🧷 نقاط دخول إضافية (تحليل مشترك واحد)")
+        entries_layout = QVBoxLayout(entries_group)
+        
+        self.extra_entries_list = QListWidget()
+        self.extra_entries_list.setMinimumHeight(60)
+        self.extra_entries_list.setToolTip(
+            "كل سكربت هنا يصبح ملفاً تنفيذياً مستقلاً بجانب ملف المصدر، "
+            "وتُبنى كلها بتحليل PyInstaller واحد. المكتبات تُشارَك في وضع المجلد فقط، "
+            "أما في وضع الملف الواحد فيحمل كل ملف نسخته منها"
+        )
+        
+        entries_btn_layout = QHBoxLayout()
+        add_entry_btn = QPushButton("➕ إضافة سكربت")
+        add_entry_btn.clicked.connect(self.add_extra_entry)
+        remove_entry_btn = QPushButton("🗑️ حذف المحدد")
+        remove_entry_btn.clicked.connect(self.remove_extra_entry)
+        
+        entries_btn_layout.addWidget(add_entry_btn)
+        entries_btn_layout.addWidget(remove_entry_btn)
+        
+        entries_layout.addWidget(self.extra_entries_list)
+        entries_layout.addLayout(entries_btn_layout)
+        
+        layout.addWidget(entries_group)
+        
         # ═══ الملفات الإضافية ═══
         files_group = QGroupBox("📁 الملفات الإضافية (--add-data)")
         files_layout = QVBoxLayout(files_group)
@@ -608,6 +7052,62 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(imports_group)
         
+        # ═══ تتبع الاستيرادات أثناء التشغيل ═══
+        trace_group = QGroupBox("🧪 تتبع الاستيرادات أثناء التشغيل (اختياري)")
+        trace_layout = QGridLayout(trace_group)
+        
+        trace_layout.addWidget(QLabel("سكربت الاختبار:"), 0, 0)
+        self.trace_entry = QLineEdit()
+        self.trace_entry.setPlaceholderText("اختياري - يُستخدم ملف المصدر إذا تُرك فارغاً")
+        trace_entry_btn = QPushButton("📂")
+        trace_entry_btn.clicked.connect(self.browse_trace_entry)
+        trace_layout.addWidget(self.trace_entry, 0, 1)
+        trace_layout.addWidget(trace_entry_btn, 0, 2)
+        
+        trace_layout.addWidget(QLabel("المهلة (ثانية):"), 1, 0)
+        self.trace_timeout = QSpinBox()
+        self.trace_timeout.setRange(1, 600)
+        self.trace_timeout.setValue(20)
+        self.trace_timeout.setToolTip("يُنهى السكربت بعد المهلة وتُسجَّل الوحدات المحمّلة حتى تلك اللحظة")
+        trace_layout.addWidget(self.trace_timeout, 1, 1)
+        
+        self.trace_btn = QPushButton("🧪 تتبع وإضافة المكتبات الناقصة")
+        self.trace_btn.setToolTip("يشغّل السكربت فعلياً ويقارن الوحدات المحمّلة بتحليل PyInstaller")
+        self.trace_btn.clicked.connect(self.trace_runtime_imports)
+        trace_layout.addWidget(self.trace_btn, 2, 0, 1, 3)
+        
+        layout.addWidget(trace_group)
+        
+        # ═══ تقليم الملحقات ═══
+        prune_group = QGroupBox("✂️ تقليم إضافات Qt وملفات البيانات (PyInstaller)")
+        prune_layout = QGridLayout(prune_group)
+        
+        self.prune_check = QCheckBox("حذف إضافات Qt والترجمات وملفات البيانات غير المستخدمة قبل التجميع")
+        self.prune_check.setToolTip(
+            "منصات العرض الأخرى، وصيغ الصور التي لا يشير إليها المشروع، وترجمات Qt لغير اللغات المختارة، "
+            "وQML وWebEngine إن لم تُستورد، ومناطق tzdata وخطوط matplotlib غير المستخدمة. "
+            "نتيجة التتبع (إن وُجدت) تُبقي كل ما فُتح أثناء التشغيل"
+        )
+        prune_layout.addWidget(self.prune_check, 0, 0, 1, 3)
+        
+        prune_layout.addWidget(QLabel("لغات الترجمة:"), 1, 0)
+        self.prune_languages = QLineEdit()
+        self.prune_languages.setPlaceholderText("افتراضياً: ar en")
+        prune_layout.addWidget(self.prune_languages, 1, 1, 1, 2)
+        
+        prune_layout.addWidget(QLabel("أنماط تُبقى دائماً:"), 2, 0)
+        self.prune_keep = QLineEdit()
+        self.prune_keep.setPlaceholderText("مثال: PyQt5/Qt5/plugins/imageformats/* tzdata/zoneinfo/Asia/*")
+        prune_layout.addWidget(self.prune_keep, 2, 1, 1, 2)
+        
+        self.payload_usage_label = QLabel()
+        prune_layout.addWidget(self.payload_usage_label, 3, 0, 1, 2)
+        clear_usage_btn = QPushButton("🗑️ مسح نتيجة التتبع")
+        clear_usage_btn.clicked.connect(self.clear_payload_usage)
+        prune_layout.addWidget(clear_usage_btn, 3, 2)
+        
+        layout.addWidget(prune_group)
+        
         # ═══ خيارات إضافية ═══
         extra_group = QGroupBox("🔧 خيارات إضافية")
         extra_layout = QGridLayout(extra_group)
@@ -628,10 +7128,75 @@ class MainWindow(QMainWindow):
         self.upx_check.setToolTip("يتطلب تثبيت UPX")
         extra_layout.addWidget(self.upx_check, 2, 0, 1, 2)
         
+        self.validate_check = QCheckBox("التحقق من الإعدادات قبل البناء")
+        self.validate_check.setChecked(True)
+        self.validate_check.setToolTip(
+            "فحص المكتبات المخفية والملفات والأيقونة والأوامر الإضافية قبل تشغيل PyInstaller"
+        )
+        extra_layout.addWidget(self.validate_check, 3, 0, 1, 2)
+        
+        self.analysis_cache_check = QCheckBox("ذاكرة تحليل الحزم الخارجية (تجريبي)")
+        self.analysis_cache_check.setToolTip(
+            "تخزين نتائج تحليل كل حزمة حسب إصدارها وإصدار خطافاتها، "
+            "وإعادة استخدامها في المشاريع التالية بدلاً من إعادة التحليل"
+        )
+        extra_layout.addWidget(self.analysis_cache_check, 4, 0, 1, 2)
+        
+        self.minimal_venv_check = QCheckBox("البناء من بيئة افتراضية مصغرة (متطلبات المشروع فقط)")
+        self.minimal_venv_check.setToolTip(
+            "تُنشأ بيئة فيها المكتبات التي يستوردها المشروع فقط بنفس إصداراتها، "
+            "وتُعاد استخدامها حتى تتغير المتطلبات - تحليل أسرع وحجم أصغر"
+        )
+        extra_layout.addWidget(self.minimal_venv_check, 5, 0, 1, 2)
+        
+        self.binary_scan_check = QCheckBox("فحص المكتبات الثنائية قبل البناء (المفقودة والمكررة)")
+        self.binary_scan_check.setToolTip(
+            "قراءة جداول الاستيراد في ملفات .so/.dll/.pyd مباشرة، مع تخزين النتائج حسب بصمة كل ملف "
+            "فلا يُعاد فحص الملفات التي لم تتغير"
+        )
+        extra_layout.addWidget(self.binary_scan_check, 8, 0, 1, 2)
+        
+        self.slim_modules_check = QCheckBox("تنحيف وحدات المشروع قبل التجميد (على نسخة مؤقتة)")
+        self.slim_modules_check.setToolTip(
+            "يحذف النصوص التوثيقية وتعليقات الأنواع وكتل if __debug__ والدوال والوحدات غير المستخدمة "
+            "من نسخة في build/slim دون تعديل الملفات الأصلية. الوحدات المحمّلة ديناميكياً أضفها كمكتبات مخفية"
+        )
+        extra_layout.addWidget(self.slim_modules_check, 9, 0, 1, 2)
+        
+        self.scratch_build_check = QCheckBox("البناء في مجلد تجهيز محلي سريع ثم نقل الناتج فقط")
+        self.scratch_build_check.setToolTip(
+            "ملفات build الكثيرة تُكتب في tmpfs أو المجلد المؤقت بدل مجلد الإخراج (مفيد لمجلدات الشبكة "
+            "والمجلدات التي يفحصها مضاد الفيروسات)، ثم يُنقل الناتج دفعة واحدة ويُقدَّر الوقت الموفّر"
+        )
+        extra_layout.addWidget(self.scratch_build_check, 10, 0, 1, 2)
+        
+        extra_layout.addWidget(QLabel("مجلد التجهيز:"), 11, 0)
+        self.scratch_dir = QLineEdit()
+        self.scratch_dir.setPlaceholderText("افتراضياً: /dev/shm إن توفرت مساحة، وإلا المجلد المؤقت")
+        extra_layout.addWidget(self.scratch_dir, 11, 1)
+        
+        self.log_store_check = QCheckBox("حفظ سجل كل بناء في سجل مفهرس (تصفية وبحث وجدول الوحدات المفقودة)")
+        self.log_store_check.setChecked(True)
+        extra_layout.addWidget(self.log_store_check, 12, 0, 1, 2)
+        
+        extra_layout.addWidget(QLabel("مكتبات إضافية للبيئة:"), 6, 0)
+        self.venv_extra_packages = QLineEdit()
+        self.venv_extra_packages.setPlaceholderText("مثال: pillow==10.2.0 lxml")
+        extra_layout.addWidget(self.venv_extra_packages, 6, 1)
+        
+        extra_layout.addWidget(QLabel("إصدارات مثبتة للمشروع:"), 7, 0)
+        self.pinned_packages = QLineEdit()
+        self.pinned_packages.setPlaceholderText("مثال: pyinstaller==6.3.0 pyinstaller-hooks-contrib==2024.1")
+        self.pinned_packages.setToolTip(
+            "تُثبَّت من مخزن الحزم المحلي دون شبكة إن وُجدت فيه "
+            "(املأ المخزن مسبقاً بالأمر: python python_to_exe.py prefetch)"
+        )
+        extra_layout.addWidget(self.pinned_packages, 7, 1)
+        
         layout.addWidget(extra_group)
         
         # ═══ أوامر إضافية ═══
-        cmd_group = QGroupBox("💻 أوامر PyInstaller إضافية")
+        cmd_group = QGroupBox("💻 أوامر إضافية لأداة التجميد")
         cmd_layout = QVBoxLayout(cmd_group)
         
         self.extra_args = QLineEdit()
@@ -640,9 +7205,210 @@ class MainWindow(QMainWindow):
         
         layout.addWidget(cmd_group)
         
+        # ═══ مقارنة أدوات التجميد ═══
+        compare_group = QGroupBox("⚖️ مقارنة أدوات التجميد")
+        compare_layout = QGridLayout(compare_group)
+        
+        self.compare_checks = {}
+        for column, backend in enumerate(BACKENDS.values()):
+            check = QCheckBox(backend.label)
+            check.setChecked(True)
+            self.compare_checks[backend.name] = check
+            compare_layout.addWidget(check, 0, column)
+        
+        # كل وضع أرشيف مختار يُبنى مع كل أداة تدعمه
+        archive_row = QHBoxLayout()
+        archive_row.addWidget(QLabel("أوضاع الأرشيف:"))
+        self.compare_archive_checks = {}
+        for mode, label in ARCHIVE_MODES.items():
+            check = QCheckBox(label)
+            self.compare_archive_checks[mode] = check
+            archive_row.addWidget(check)
+        self.compare_prune_check = QCheckBox("قبل/بعد التقليم")
+        self.compare_prune_check.setToolTip("يبني كل تركيبة مع تقليم الملحقات ودونه لمقارنة الحجم وزمن التشغيل")
+        archive_row.addWidget(self.compare_prune_check)
+        compare_layout.addLayout(archive_row, 1, 0, 1, 3)
+        
+        compare_layout.addWidget(QLabel("أمر قياس التشغيل:"), 2, 0)
+        self.benchmark_command = QLineEdit()
+        self.benchmark_command.setPlaceholderText("اختياري: معاملات للبرنامج الناتج، أو أمر يحتوي {exe}")
+        compare_layout.addWidget(self.benchmark_command, 2, 1, 1, 2)
+        
+        compare_layout.addWidget(QLabel("عدد مرات التشغيل:"), 3, 0)
+        self.benchmark_runs = QSpinBox()
+        self.benchmark_runs.setRange(1, 50)
+        self.benchmark_runs.setValue(3)
+        compare_layout.addWidget(self.benchmark_runs, 3, 1)
+        
+        compare_btn = QPushButton("⚖️ بناء ومقارنة")
+        compare_btn.setToolTip(
+            "يبني المشروع بكل أداة (وكل وضع أرشيف مختار) في compare/ ويقيس مدة البناء والحجم وزمن التشغيل"
+        )
+        compare_btn.clicked.connect(self.start_backend_compare)
+        compare_layout.addWidget(compare_btn, 3, 2)
+        
+        layout.addWidget(compare_group)
+        
+        # ═══ زمن الاستيراد عند التشغيل ═══
+        import_group = QGroupBox("⏱️ زمن الاستيراد عند التشغيل")
+        import_layout = QGridLayout(import_group)
+        
+        self.import_profile_check = QCheckBox("بناء تشخيصي يقيس زمن استيراد كل وحدة داخل البرنامج الناتج")
+        self.import_profile_check.setToolTip(
+            "يضيف خطاف تشغيل يسجل الزمن الذاتي والتراكمي لكل استيراد (مثل -X importtime) "
+            "ويكتب التقرير بجانب الملف التنفيذي. للتشخيص فقط"
+        )
+        import_layout.addWidget(self.import_profile_check, 0, 0, 1, 3)
+        
+        import_layout.addWidget(QLabel("وحدات مؤجلة التحميل:"), 1, 0)
+        self.lazy_modules = QLineEdit()
+        self.lazy_modules.setPlaceholderText("مثل: pandas matplotlib.pyplot (تُحمَّل عند أول استخدام)")
+        import_layout.addWidget(self.lazy_modules, 1, 1)
+        
+        analyze_btn = QPushButton("📊 تحليل تقرير...")
+        analyze_btn.clicked.connect(self.analyze_import_profile)
+        import_layout.addWidget(analyze_btn, 1, 2)
+        
+        layout.addWidget(import_group)
+        
+        # ═══ ملف .spec ═══
+        spec_group = QGroupBox("📝 ملف .spec")
+        spec_layout = QGridLayout(spec_group)
+        
+        self.use_spec_check = QCheckBox("البناء من ملف .spec مولَّد ومخزن حسب بصمة الإعدادات")
+        self.use_spec_check.setChecked(True)
+        self.use_spec_check.setToolTip(
+            "يُولَّد الملف مرة واحدة لكل مجموعة إعدادات في مجلد specs ويُعاد استخدامه، "
+            "ويمكن تعديله يدوياً"
+        )
+        spec_layout.addWidget(self.use_spec_check, 0, 0, 1, 3)
+        
+        spec_layout.addWidget(QLabel("ملف .spec مخصص:"), 1, 0)
+        self.spec_file = QLineEdit()
+        self.spec_file.setPlaceholderText("اختياري - يتجاوز كل إعدادات البناء")
+        spec_file_btn = QPushButton("📂")
+        spec_file_btn.clicked.connect(self.browse_spec_file)
+        spec_layout.addWidget(self.spec_file, 1, 1)
+        spec_layout.addWidget(spec_file_btn, 1, 2)
+        
+        edit_spec_btn = QPushButton("✏️ توليد ملف .spec وفتحه للتعديل")
+        edit_spec_btn.clicked.connect(self.edit_generated_spec)
+        spec_layout.addWidget(edit_spec_btn, 2, 0, 1, 3)
+        
+        layout.addWidget(spec_group)
+        
+        # ═══ طبقة التشغيل المشتركة ═══
+        runtime_group = QGroupBox("🧩 طبقة تشغيل مشتركة (وضع المجلد)")
+        runtime_layout = QGridLayout(runtime_group)
+        
+        self.shared_runtime_check = QCheckBox("فصل المكتبات المشتركة إلى طبقة تشغيل مُعاد استخدامها")
+        self.shared_runtime_check.setToolTip(
+            "يحمل التطبيق ملفاته الخاصة وبياناً يشير إلى الطبقة، "
+            "وتُشارَك بايثون وQt والمكتبات بين كل التطبيقات"
+        )
+        self.shared_runtime_check.setEnabled(not self.onefile_check.isChecked())
+        self.onefile_check.toggled.connect(
+            lambda checked: self.shared_runtime_check.setEnabled(not checked)
+        )
+        runtime_layout.addWidget(self.shared_runtime_check, 0, 0, 1, 3)
+        
+        runtime_layout.addWidget(QLabel("مجلد الطبقات:"), 1, 0)
+        self.runtime_layers_dir = QLineEdit()
+        self.runtime_layers_dir.setPlaceholderText(RUNTIME_LAYERS_DIR)
+        runtime_dir_btn = QPushButton("📂")
+        runtime_dir_btn.clicked.connect(self.browse_runtime_layers_dir)
+        runtime_layout.addWidget(self.runtime_layers_dir, 1, 1)
+        runtime_layout.addWidget(runtime_dir_btn, 1, 2)
+        
+        self.delta_updates_check = QCheckBox("إنشاء حزمة تحديث تفاضلية من آخر إصدار بعد كل بناء")
+        self.delta_updates_check.setToolTip(
+            "تحتوي الملفات المتغيرة فقط، وفروقاً على مستوى الكتل للملفات الكبيرة، "
+            "مع أداة apply_delta.py لتطبيقها على الأجهزة"
+        )
+        self.delta_updates_check.setEnabled(not self.onefile_check.isChecked())
+        self.onefile_check.toggled.connect(
+            lambda checked: self.delta_updates_check.setEnabled(not checked)
+        )
+        runtime_layout.addWidget(self.delta_updates_check, 2, 0, 1, 3)
+        
+        # لا يُحفظ مع الإعدادات: كل إصدار منشور يُعتمد بطلب صريح
+        self.release_check = QCheckBox("اعتماد هذا البناء إصداراً منشوراً (تُبنى حزم التحديث التالية منه)")
+        self.release_check.setToolTip(
+            "فعّله فقط عند نشر الناتج على الأجهزة؛ البناءات الأخرى تُنشئ حزماً من آخر إصدار منشور دون تغييره"
+        )
+        self.release_check.setEnabled(not self.onefile_check.isChecked())
+        self.onefile_check.toggled.connect(
+            lambda checked: self.release_check.setEnabled(not checked)
+        )
+        runtime_layout.addWidget(self.release_check, 4, 0, 1, 3)
+        
+        runtime_layout.addWidget(QLabel("مجلد الإصدارات:"), 3, 0)
+        self.releases_dir = QLineEdit()
+        self.releases_dir.setPlaceholderText("افتراضياً: releases في مجلد الإخراج")
+        releases_dir_btn = QPushButton("📂")
+        releases_dir_btn.clicked.connect(self.browse_releases_dir)
+        runtime_layout.addWidget(self.releases_dir, 3, 1)
+        runtime_layout.addWidget(releases_dir_btn, 3, 2)
+        
+        layout.addWidget(runtime_group)
+        
+        # ═══ حدود الموارد ═══
+        resources_group = QGroupBox("🧮 حدود الموارد")
+        resources_layout = QGridLayout(resources_group)
+        
+        resources_layout.addWidget(QLabel("حد الذاكرة (MB):"), 0, 0)
+        self.memory_limit = QSpinBox()
+        self.memory_limit.setRange(0, 1024 * 1024)
+        self.memory_limit.setSingleStep(512)
+        self.memory_limit.setSpecialValueText("بدون حد")
+        self.memory_limit.setToolTip("يُوقف البناء إذا تجاوزت الذاكرة المقيمة (RSS) لعملياته هذا الحد بدلاً من استنزاف ذاكرة الجهاز")
+        resources_layout.addWidget(self.memory_limit, 0, 1)
+        
+        resources_layout.addWidget(QLabel("حد وقت المعالج (ثانية):"), 1, 0)
+        self.cpu_limit = QSpinBox()
+        self.cpu_limit.setRange(0, 24 * 3600)
+        self.cpu_limit.setSingleStep(60)
+        self.cpu_limit.setSpecialValueText("بدون حد")
+        resources_layout.addWidget(self.cpu_limit, 1, 1)
+        
+        self.admission_check = QCheckBox("انتظار توفر الذاكرة قبل البدء (حسب البناءات السابقة)")
+        self.admission_check.setChecked(True)
+        self.admission_check.setToolTip(
+            "يتوقع ذاكرة البناء من ذروات البناءات السابقة لنفس الإعدادات، "
+            "ولا يبدأ إذا تجاوز مجموع البناءات الجارية على الجهاز الميزانية"
+        )
+        resources_layout.addWidget(self.admission_check, 2, 0, 1, 2)
+        
+        resources_layout.addWidget(QLabel("ميزانية ذاكرة الجهاز (MB):"), 3, 0)
+        self.memory_budget = QSpinBox()
+        self.memory_budget.setRange(0, 1024 * 1024)
+        self.memory_budget.setSingleStep(1024)
+        self.memory_budget.setSpecialValueText("تلقائي (85% من الذاكرة)")
+        resources_layout.addWidget(self.memory_budget, 3, 1)
+        
+        resources_layout.addWidget(QLabel("ملف المقاييس (Prometheus):"), 4, 0)
+        self.metrics_file = QLineEdit()
+        self.metrics_file.setPlaceholderText("اختياري: مثل /var/lib/node_exporter/builds.prom")
+        resources_layout.addWidget(self.metrics_file, 4, 1)
+        
+        resources_layout.addWidget(QLabel("منفذ المقاييس (HTTP):"), 5, 0)
+        self.metrics_port = QSpinBox()
+        self.metrics_port.setRange(0, 65535)
+        self.metrics_port.setSpecialValueText("معطل")
+        self.metrics_port.setToolTip("يعرض /metrics على 127.0.0.1 أثناء البناء")
+        resources_layout.addWidget(self.metrics_port, 5, 1)
+        
+        layout.addWidget(resources_group)
+        
         layout.addStretch()
         
-        return tab
+        # التبويب طويل فيوضع داخل منطقة تمرير
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        scroll.setWidget(tab)
+        
+        return scroll
     
     def create_templates_tab(self):
         """تبويب القوالب"""
@@ -655,8 +7421,7 @@ class MainWindow(QMainWindow):
         templates_layout.addWidget(QLabel("اختر قالباً لتطبيق الإعدادات المناسبة تلقائياً:"))
         
         self.templates_combo = QComboBox()
-        for name, data in TEMPLATES.items():
-            self.templates_combo.addItem(f"{name} - {data['description']}", name)
+        self.fill_templates_combo()
         
         self.templates_combo.currentIndexChanged.connect(self.apply_template)
         templates_layout.addWidget(self.templates_combo)
@@ -671,6 +7436,30 @@ class MainWindow(QMainWindow):
         apply_btn.clicked.connect(self.apply_selected_template)
         templates_layout.addWidget(apply_btn)
         
+        self.auto_profiles_check = QCheckBox("تطبيق القوالب المطابقة لمكتبات المشروع تلقائياً عند البناء")
+        self.auto_profiles_check.setChecked(True)
+        self.auto_profiles_check.setToolTip(
+            "مثلاً: استيراد pandas يضيف استثناءات وخطافات قالب البيانات"
+        )
+        templates_layout.addWidget(self.auto_profiles_check)
+        
+        self.applied_profiles_label = QLabel()
+        self.applied_profiles_label.setWordWrap(True)
+        self.update_applied_profiles_label()
+        templates_layout.addWidget(self.applied_profiles_label)
+        
+        profiles_btn_layout = QHBoxLayout()
+        clear_profiles_btn = QPushButton("🗑️ إلغاء القوالب المطبقة")
+        clear_profiles_btn.clicked.connect(self.clear_applied_profiles)
+        reload_profiles_btn = QPushButton("🔄 إعادة تحميل ملفات التعريف")
+        reload_profiles_btn.clicked.connect(self.reload_profiles)
+        open_profiles_btn = QPushButton("📂 مجلد ملفات التعريف")
+        open_profiles_btn.clicked.connect(self.open_profiles_dir)
+        profiles_btn_layout.addWidget(clear_profiles_btn)
+        profiles_btn_layout.addWidget(reload_profiles_btn)
+        profiles_btn_layout.addWidget(open_profiles_btn)
+        templates_layout.addLayout(profiles_btn_layout)
+        
         layout.addWidget(templates_group)
         
         # ═══ حفظ/تحميل الإعدادات ═══
@@ -695,6 +7484,81 @@ class MainWindow(QMainWindow):
         
         return tab
     
+    def create_queue_tab(self):
+        """تبويب طابور البناء"""
+        tab = QWidget()
+        layout = QVBoxLayout(tab)
+        
+        # ═══ إضافة المهام ═══
+        add_layout = QHBoxLayout()
+        add_current_btn = QPushButton("➕ إضافة الإعدادات الحالية")
+        add_current_btn.clicked.connect(self.enqueue_current_config)
+        add_files_btn = QPushButton("📂 إضافة ملفات إعدادات")
+        add_files_btn.clicked.connect(self.enqueue_config_files)
+        scan_repo_btn = QPushButton("🔎 فحص مستودع")
+        scan_repo_btn.setToolTip(
+            "اكتشاف السكربتات (if __name__ == \"__main__\") و console_scripts في مستودع "
+            "وتوليد ملف إعدادات لكل منها"
+        )
+        scan_repo_btn.clicked.connect(self.start_repo_scan)
+        add_layout.addWidget(add_current_btn)
+        add_layout.addWidget(add_files_btn)
+        add_layout.addWidget(scan_repo_btn)
+        add_layout.addWidget(QLabel("الأولوية:"))
+        self.queue_priority = QSpinBox()
+        self.queue_priority.setRange(-100, 100)
+        self.queue_priority.setToolTip("الأعلى يُبنى أولاً")
+        add_layout.addWidget(self.queue_priority)
+        layout.addLayout(add_layout)
+        
+        # ═══ جدول المهام ═══
+        self.queue_table = QTableWidget(0, 5)
+        self.queue_table.setHorizontalHeaderLabels(["المهمة", "الأولوية", "الحالة", "التقدم", "المدة"])
+        self.queue_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.queue_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.queue_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.queue_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.queue_table)
+        
+        # ═══ التحكم بالمهمة المحددة ═══
+        job_layout = QHBoxLayout()
+        for text, handler in (
+            ("⬆️", lambda: self.move_queue_job(-1)),
+            ("⬇️", lambda: self.move_queue_job(1)),
+            ("⚡ عاجل", self.make_queue_job_urgent),
+            ("⏸️ إيقاف مؤقت", self.hold_queue_job),
+            ("▶️ استئناف", self.release_queue_job),
+            ("⏹ إلغاء", self.cancel_queue_job),
+            ("🗑️ حذف", self.remove_queue_job),
+        ):
+            btn = QPushButton(text)
+            btn.clicked.connect(handler)
+            job_layout.addWidget(btn)
+        layout.addLayout(job_layout)
+        
+        # ═══ تشغيل الطابور ═══
+        run_layout = QHBoxLayout()
+        run_layout.addWidget(QLabel("بناءات متزامنة:"))
+        self.queue_concurrency = QSpinBox()
+        self.queue_concurrency.setRange(1, 16)
+        self.queue_concurrency.setValue(1)
+        self.queue_concurrency.valueChanged.connect(self.schedule_queue)
+        run_layout.addWidget(self.queue_concurrency)
+        
+        self.queue_preempt_check = QCheckBox("إيقاف المهام الأقل أولوية مؤقتاً للمهام الأعلى")
+        self.queue_preempt_check.setChecked(True)
+        self.queue_preempt_check.toggled.connect(self.schedule_queue)
+        run_layout.addWidget(self.queue_preempt_check)
+        run_layout.addStretch()
+        
+        self.queue_run_btn = QPushButton("▶️ تشغيل الطابور")
+        self.queue_run_btn.setCheckable(True)
+        self.queue_run_btn.toggled.connect(self.toggle_queue)
+        run_layout.addWidget(self.queue_run_btn)
+        layout.addLayout(run_layout)
+        
+        return tab
+    
     def create_about_tab(self):
         """تبويب حول البرنامج"""
         tab = QWidget()
@@ -771,18 +7635,16 @@ class MainWindow(QMainWindow):
             self.log_output.append("❌ Python غير موجود!")
         
         # التحقق من PyInstaller
-        try:
-            result = subprocess.run(
-                [sys.executable, "-m", "PyInstaller", "--version"],
-                capture_output=True, text=True
-            )
-            if result.returncode == 0:
-                self.log_output.append(f"✅ PyInstaller: {result.stdout.strip()}")
-            else:
-                self.log_output.append("⚠️ PyInstaller غير مثبت - سيتم تثبيته عند التحويل")
-        except:
+        self.backend_versions["pyinstaller"] = get_pyinstaller_version(sys.executable)
+        if self.backend_versions["pyinstaller"]:
+            self.log_output.append(f"✅ PyInstaller: {self.backend_versions['pyinstaller']}")
+        else:
             self.log_output.append("⚠️ PyInstaller غير مثبت - سيتم تثبيته عند التحويل")
         
+        # ملفات التعريف
+        for error in self.profile_errors:
+            self.log_output.append(f"⚠️ ملف تعريف غير صالح: {error}")
+        
         self.log_output.append("─" * 50)
         self.log_output.append("✅ جاهز للاستخدام!\n")
     
@@ -829,6 +7691,102 @@ class MainWindow(QMainWindow):
         if file_path:
             self.icon_input.setText(file_path)
     
+    def browse_spec_file(self):
+        """اختيار ملف .spec مخصص"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "اختر ملف .spec",
+            self.output_dir.text(),
+            "Spec Files (*.spec);;All Files (*.*)"
+        )
+        if file_path:
+            self.spec_file.setText(file_path)
+    
+    def edit_generated_spec(self):
+        """توليد ملف .spec للإعدادات الحالية وفتحه في المحرر"""
+        config = self.get_config()
+        if not config["source"] or not os.path.isfile(config["source"]):
+            QMessageBox.warning(self, "تنبيه", "اختر ملف المصدر أولاً!")
+            return
+        
+        try:
+            spec_path = write_spec(config)
+        except OSError as e:
+            QMessageBox.critical(self, "خطأ", f"فشل توليد ملف .spec:\n{str(e)}")
+            return
+        
+        self.log_output.append(f"📝 ملف .spec: {spec_path}")
+        self.open_path(spec_path)
+    
+    def open_path(self, path):
+        """فتح ملف أو مجلد بالبرنامج الافتراضي للنظام"""
+        if sys.platform == "win32":
+            os.startfile(path)
+        elif sys.platform == "darwin":
+            subprocess.run(["open", path])
+        else:
+            subprocess.run(["xdg-open", path])
+    
+    def analyze_import_profile(self):
+        """تحليل تقرير زمن الاستيراد واقتراح الوحدات المؤجلة"""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "اختر تقرير زمن الاستيراد", self.output_dir.text(), "Import profile (*.importtime.json *.json)"
+        )
+        if not path:
+            return
+        config = self.get_config()
+        try:
+            report = load_import_profile(path)
+            styles = get_import_styles(config) if config.get("source") else {}
+        except (OSError, ValueError, SyntaxError) as e:
+            QMessageBox.warning(self, "تنبيه", f"تعذر قراءة التقرير:\n{str(e)}")
+            return
+        
+        suggestions = suggest_lazy_modules(report, styles)
+        for line in format_import_profile(report, suggestions):
+            self.log_output.append(line)
+        
+        lazy = [module for module, ms, lazy_ok in suggestions if lazy_ok and module not in config["lazy_modules"]]
+        if lazy and QMessageBox.question(
+            self, "تأجيل الوحدات",
+            f"إضافة هذه الوحدات إلى الوحدات المؤجلة التحميل؟\n\n{chr(10).join(lazy)}",
+            QMessageBox.Yes | QMessageBox.No
+        ) == QMessageBox.Yes:
+            self.lazy_modules.setText(" ".join(config["lazy_modules"] + lazy))
+            self.log_output.append("✅ أُضيفت إلى الوحدات المؤجلة - ستُطبَّق في البناء التالي")
+    
+    def browse_releases_dir(self):
+        """اختيار مجلد الإصدارات وحزم التحديث"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "اختر مجلد الإصدارات", self.releases_dir.text() or self.output_dir.text()
+        )
+        if dir_path:
+            self.releases_dir.setText(dir_path)
+    
+    def browse_runtime_layers_dir(self):
+        """اختيار مجلد طبقات التشغيل المشتركة"""
+        dir_path = QFileDialog.getExistingDirectory(
+            self, "اختر مجلد الطبقات",
+            self.runtime_layers_dir.text() or RUNTIME_LAYERS_DIR
+        )
+        if dir_path:
+            self.runtime_layers_dir.setText(dir_path)
+    
+    def add_extra_entry(self):
+        """إضافة نقطة دخول"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "اختر سكربت",
+            self.settings.get("last_source_dir", ""),
+            "Python Files (*.py *.pyw);;All Files (*.*)"
+        )
+        if file_path:
+            self.extra_entries_list.addItem(file_path)
+    
+    def remove_extra_entry(self):
+        """حذف نقطة دخول"""
+        current = self.extra_entries_list.currentRow()
+        if current >= 0:
+            self.extra_entries_list.takeItem(current)
+    
     def add_extra_file(self):
         """إضافة ملف إضافي"""
         file_path, _ = QFileDialog.getOpenFileName(
@@ -875,23 +7833,7 @@ class MainWindow(QMainWindow):
         self.log_output.append("🔍 جاري كشف المكتبات المستخدمة...")
         
         try:
-            with open(source, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # كشف الاستيرادات
-            imports = set()
-            for line in content.split('\n'):
-                line = line.strip()
-                if line.startswith('import '):
-                    parts = line[7:].split(',')
-                    for part in parts:
-                        module = part.strip().split(' as ')[0].split('.')[0]
-                        if module:
-                            imports.add(module)
-                elif line.startswith('from '):
-                    module = line[5:].split(' import')[0].strip().split('.')[0]
-                    if module:
-                        imports.add(module)
+            imports = detect_source_imports(source)
             
             # إضافة المكتبات غير الموجودة
             added = 0
@@ -909,36 +7851,163 @@ class MainWindow(QMainWindow):
         except Exception as e:
             self.log_output.append(f"❌ خطأ في كشف المكتبات: {str(e)}")
     
+    def browse_trace_entry(self):
+        """اختيار سكربت الاختبار للتتبع"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "اختر سكربت الاختبار",
+            self.settings.get("last_source_dir", ""),
+            "Python Files (*.py *.pyw);;All Files (*.*)"
+        )
+        if file_path:
+            self.trace_entry.setText(file_path)
+    
+    def trace_runtime_imports(self):
+        """كشف المكتبات المخفية بتشغيل السكربت تحت التتبع"""
+        config = self.get_config()
+        script = config["trace_entry"] or config["source"]
+        if not script or not os.path.isfile(script):
+            QMessageBox.warning(self, "تنبيه", "اختر ملف المصدر أو سكربت الاختبار أولاً!")
+            return
+        
+        self.trace_btn.setEnabled(False)
+        self.trace_thread = TraceImportsThread(config, script, config["trace_timeout"])
+        self.trace_thread.log_signal.connect(self.log_output.append)
+        self.trace_thread.finished_signal.connect(self.on_trace_finished)
+        self.trace_thread.usage_signal.connect(self.on_trace_usage)
+        self.trace_thread.start()
+    
+    def show_build_logs(self):
+        """عارض سجل البناءات المفهرس"""
+        try:
+            store = get_log_store()
+        except (sqlite3.Error, OSError) as e:
+            QMessageBox.warning(self, "تنبيه", f"تعذر فتح سجل البناءات: {str(e)}")
+            return
+        BuildLogDialog(store, self.add_hidden_imports, self).exec_()
+    
+    def add_hidden_imports(self, names):
+        """إضافة مكتبات مخفية بلا تكرار"""
+        existing = {self.hidden_imports_list.item(i).text()
+                    for i in range(self.hidden_imports_list.count())}
+        added = [name for name in names if name not in existing]
+        for name in added:
+            self.hidden_imports_list.addItem(name)
+        self.log_output.append(f"✅ تمت إضافة {len(added)} مكتبة مخفية: {', '.join(added)}")
+    
+    def on_trace_finished(self, minimal, unused):
+        """إضافة نتائج التتبع إلى المكتبات المخفية"""
+        self.trace_btn.setEnabled(True)
+        
+        existing = {self.hidden_imports_list.item(i).text() 
+                    for i in range(self.hidden_imports_list.count())}
+        added = 0
+        for imp in minimal:
+            if imp not in existing:
+                self.hidden_imports_list.addItem(imp)
+                added += 1
+        
+        self.log_output.append(f"✅ التتبع: تمت إضافة {added} مكتبة مخفية")
+        if minimal:
+            self.log_output.append(f"   {', '.join(minimal)}")
+        if unused:
+            self.log_output.append(
+                f"💡 مكتبات مخفية لم تُحمَّل أثناء التتبع (يمكن حذفها لتصغير الحجم): {', '.join(unused)}"
+            )
+    
+    def on_trace_usage(self, usage):
+        """حفظ ما استخدمه التطبيق أثناء التتبع لحمايته من التقليم"""
+        self.payload_usage = usage
+        self.update_payload_usage_label()
+    
+    def clear_payload_usage(self):
+        """التقليم حسب التحليل الساكن فقط"""
+        self.payload_usage = {}
+        self.update_payload_usage_label()
+    
+    def update_payload_usage_label(self):
+        if self.payload_usage:
+            self.payload_usage_label.setText(
+                f"نتيجة التتبع: {len(self.payload_usage.get('modules', []))} وحدة، "
+                f"{len(self.payload_usage.get('files', []))} ملف بيانات وإضافة"
+            )
+        else:
+            self.payload_usage_label.setText("لا توجد نتيجة تتبع - التقليم حسب التحليل الساكن فقط")
+    
+    def fill_templates_combo(self):
+        """تعبئة قائمة القوالب من القوالب الجاهزة وملفات التعريف"""
+        self.templates_combo.blockSignals(True)
+        self.templates_combo.clear()
+        for name, data in self.profiles.items():
+            self.templates_combo.addItem(f"{name} - {data['description']}", name)
+        self.templates_combo.blockSignals(False)
+    
+    def update_applied_profiles_label(self):
+        """عرض القوالب المطبقة يدوياً"""
+        if self.applied_profiles:
+            self.applied_profiles_label.setText(f"القوالب المطبقة: {', '.join(self.applied_profiles)}")
+        else:
+            self.applied_profiles_label.setText("لا توجد قوالب مطبقة يدوياً")
+    
+    def clear_applied_profiles(self):
+        """إلغاء القوالب المطبقة يدوياً"""
+        self.applied_profiles = []
+        self.update_applied_profiles_label()
+    
+    def reload_profiles(self):
+        """إعادة قراءة ملفات التعريف من مجلد المستخدم"""
+        self.profiles, self.profile_errors = load_profiles()
+        self.fill_templates_combo()
+        self.apply_template(self.templates_combo.currentIndex())
+        self.log_output.append(f"✅ تم تحميل {len(self.profiles)} قالب")
+        for error in self.profile_errors:
+            self.log_output.append(f"⚠️ ملف تعريف غير صالح: {error}")
+    
+    def open_profiles_dir(self):
+        """فتح مجلد ملفات التعريف (يُنشأ إن لم يكن موجوداً)"""
+        os.makedirs(PROFILES_DIR, exist_ok=True)
+        self.open_path(PROFILES_DIR)
+    
     def apply_template(self, index):
         """عرض وصف القالب"""
         template_name = self.templates_combo.currentData()
-        if template_name and template_name in TEMPLATES:
-            template = TEMPLATES[template_name]
+        if template_name and template_name in self.profiles:
+            template = self.profiles[template_name]
             desc = f"""
             <b>القالب:</b> {template_name}<br>
             <b>الوصف:</b> {template['description']}<br>
             <b>نافذة:</b> {'نعم' if template['windowed'] else 'لا'}<br>
             <b>ملف واحد:</b> {'نعم' if template['onefile'] else 'لا'}<br>
-            <b>مكتبات مخفية:</b> {', '.join(template['hidden_imports']) if template['hidden_imports'] else 'لا يوجد'}
+            <b>تقليم الملحقات:</b> {'نعم' if template.get('prune_payload') else 'لا'}<br>
+            <b>مكتبات مخفية:</b> {', '.join(template['hidden_imports']) if template['hidden_imports'] else 'لا يوجد'}<br>
+            <b>استثناءات:</b> {', '.join(template.get('excludes', [])) or 'لا يوجد'}<br>
+            <b>يُطبَّق تلقائياً عند استيراد:</b> {', '.join(template.get('match', [])) or 'لا يوجد'}
             """
             self.template_desc.setHtml(desc)
     
     def apply_selected_template(self):
         """تطبيق القالب المحدد"""
         template_name = self.templates_combo.currentData()
-        if template_name and template_name in TEMPLATES:
-            template = TEMPLATES[template_name]
+        if template_name and template_name in self.profiles:
+            template = self.profiles[template_name]
             
             self.windowed_check.setChecked(template['windowed'])
             self.onefile_check.setChecked(template['onefile'])
+            if template.get('prune_payload'):
+                self.prune_check.setChecked(True)
             
             # إضافة المكتبات المخفية
+            existing = {self.hidden_imports_list.item(i).text() 
+                        for i in range(self.hidden_imports_list.count())}
             for imp in template['hidden_imports']:
-                existing = [self.hidden_imports_list.item(i).text() 
-                           for i in range(self.hidden_imports_list.count())]
                 if imp not in existing:
+                    existing.add(imp)
                     self.hidden_imports_list.addItem(imp)
             
+            # الاستثناءات والخطافات تُطبَّق عند البناء
+            if template_name not in self.applied_profiles:
+                self.applied_profiles.append(template_name)
+                self.update_applied_profiles_label()
+            
             self.log_output.append(f"✅ تم تطبيق قالب: {template_name}")
             QMessageBox.information(self, "نجاح", f"تم تطبيق قالب: {template_name}")
     
@@ -950,26 +8019,7 @@ class MainWindow(QMainWindow):
             "JSON Files (*.json)"
         )
         if file_path:
-            settings = {
-                "source": self.source_input.text(),
-                "output_name": self.output_name.text(),
-                "output_dir": self.output_dir.text(),
-                "icon": self.icon_input.text(),
-                "onefile": self.onefile_check.isChecked(),
-                "windowed": self.windowed_check.isChecked(),
-                "clean": self.clean_check.isChecked(),
-                "noconsole": self.noconsole_check.isChecked(),
-                "noconfirm": self.noconfirm_check.isChecked(),
-                "strip": self.strip_check.isChecked(),
-                "extra_files": [self.extra_files_list.item(i).text() 
-                               for i in range(self.extra_files_list.count())],
-                "hidden_imports": [self.hidden_imports_list.item(i).text() 
-                                  for i in range(self.hidden_imports_list.count())],
-                "optimize": self.optimize_combo.currentIndex(),
-                "upx": self.upx_check.isChecked(),
-                "upx_level": self.upx_level.value(),
-                "extra_args": self.extra_args.text()
-            }
+            settings = self.get_config()
             
             try:
                 with open(file_path, 'w', encoding='utf-8') as f:
@@ -991,29 +8041,7 @@ class MainWindow(QMainWindow):
                 with open(file_path, 'r', encoding='utf-8') as f:
                     settings = json.load(f)
                 
-                self.source_input.setText(settings.get("source", ""))
-                self.output_name.setText(settings.get("output_name", ""))
-                self.output_dir.setText(settings.get("output_dir", ""))
-                self.icon_input.setText(settings.get("icon", ""))
-                self.onefile_check.setChecked(settings.get("onefile", True))
-                self.windowed_check.setChecked(settings.get("windowed", False))
-                self.clean_check.setChecked(settings.get("clean", True))
-                self.noconsole_check.setChecked(settings.get("noconsole", False))
-                self.noconfirm_check.setChecked(settings.get("noconfirm", True))
-                self.strip_check.setChecked(settings.get("strip", False))
-                
-                self.extra_files_list.clear()
-                for f in settings.get("extra_files", []):
-                    self.extra_files_list.addItem(f)
-                
-                self.hidden_imports_list.clear()
-                for imp in settings.get("hidden_imports", []):
-                    self.hidden_imports_list.addItem(imp)
-                
-                self.optimize_combo.setCurrentIndex(settings.get("optimize", 0))
-                self.upx_check.setChecked(settings.get("upx", False))
-                self.upx_level.setValue(settings.get("upx_level", 0))
-                self.extra_args.setText(settings.get("extra_args", ""))
+                self.apply_config(settings)
                 
                 self.log_output.append(f"✅ تم تحميل الإعدادات: {file_path}")
                 QMessageBox.information(self, "نجاح", "تم تحميل الإعدادات بنجاح!")
@@ -1021,128 +8049,199 @@ class MainWindow(QMainWindow):
             except Exception as e:
                 QMessageBox.critical(self, "خطأ", f"فشل تحميل الإعدادات:\n{str(e)}")
     
+    def get_config(self):
+        """جمع الإعدادات الحالية من الواجهة"""
+        return {
+            "source": self.source_input.text(),
+            "output_name": self.output_name.text(),
+            "output_dir": self.output_dir.text(),
+            "icon": self.icon_input.text(),
+            "backend": self.backend_combo.currentData(),
+            "archive_mode": self.archive_combo.currentData(),
+            "onefile": self.onefile_check.isChecked(),
+            "windowed": self.windowed_check.isChecked(),
+            "clean": self.clean_check.isChecked(),
+            "noconsole": self.noconsole_check.isChecked(),
+            "noconfirm": self.noconfirm_check.isChecked(),
+            "strip": self.strip_check.isChecked(),
+            "extra_entries": [self.extra_entries_list.item(i).text() 
+                             for i in range(self.extra_entries_list.count())],
+            "extra_files": [self.extra_files_list.item(i).text() 
+                           for i in range(self.extra_files_list.count())],
+            "hidden_imports": [self.hidden_imports_list.item(i).text() 
+                              for i in range(self.hidden_imports_list.count())],
+            "optimize": self.optimize_combo.currentIndex(),
+            "upx": self.upx_check.isChecked(),
+            "upx_level": self.upx_level.value(),
+            "extra_args": self.extra_args.text(),
+            "validate": self.validate_check.isChecked(),
+            "profiles": list(self.applied_profiles),
+            "auto_profiles": self.auto_profiles_check.isChecked(),
+            "use_spec": self.use_spec_check.isChecked(),
+            "spec_file": self.spec_file.text(),
+            "analysis_cache": self.analysis_cache_check.isChecked(),
+            "minimal_venv": self.minimal_venv_check.isChecked(),
+            "venv_extra_packages": self.venv_extra_packages.text(),
+            "pinned_packages": self.pinned_packages.text(),
+            "binary_scan": self.binary_scan_check.isChecked(),
+            "slim_modules": self.slim_modules_check.isChecked(),
+            "scratch_build": self.scratch_build_check.isChecked(),
+            "scratch_dir": self.scratch_dir.text(),
+            "log_store": self.log_store_check.isChecked(),
+            "prune_payload": self.prune_check.isChecked(),
+            "prune_languages": self.prune_languages.text().split(),
+            "prune_keep": self.prune_keep.text().split(),
+            "payload_usage": self.payload_usage,
+            "import_profile": self.import_profile_check.isChecked(),
+            "lazy_modules": self.lazy_modules.text().split(),
+            "trace_entry": self.trace_entry.text(),
+            "trace_timeout": self.trace_timeout.value(),
+            "shared_runtime": self.shared_runtime_check.isChecked(),
+            "runtime_layers_dir": self.runtime_layers_dir.text(),
+            "delta_updates": self.delta_updates_check.isChecked(),
+            "release": self.release_check.isChecked(),
+            "releases_dir": self.releases_dir.text(),
+            "memory_limit_mb": self.memory_limit.value(),
+            "cpu_limit_seconds": self.cpu_limit.value(),
+            "admission_control": self.admission_check.isChecked(),
+            "memory_budget_mb": self.memory_budget.value(),
+            "metrics_file": self.metrics_file.text(),
+            "metrics_port": self.metrics_port.value(),
+            "compare_backends": [name for name, check in self.compare_checks.items() if check.isChecked()],
+            "compare_archive_modes": [mode for mode, check in self.compare_archive_checks.items() if check.isChecked()],
+            "compare_prune": self.compare_prune_check.isChecked(),
+            "benchmark_command": self.benchmark_command.text(),
+            "benchmark_runs": self.benchmark_runs.value()
+        }
+    
+    def apply_config(self, settings):
+        """تطبيق إعدادات على الواجهة"""
+        self.source_input.setText(settings.get("source", ""))
+        self.output_name.setText(settings.get("output_name", ""))
+        self.output_dir.setText(settings.get("output_dir", ""))
+        self.icon_input.setText(settings.get("icon", ""))
+        self.onefile_check.setChecked(settings.get("onefile", True))
+        self.windowed_check.setChecked(settings.get("windowed", False))
+        self.clean_check.setChecked(settings.get("clean", True))
+        self.noconsole_check.setChecked(settings.get("noconsole", False))
+        self.noconfirm_check.setChecked(settings.get("noconfirm", True))
+        self.strip_check.setChecked(settings.get("strip", False))
+        
+        self.extra_entries_list.clear()
+        for script in settings.get("extra_entries", []):
+            self.extra_entries_list.addItem(script)
+        
+        self.extra_files_list.clear()
+        for f in settings.get("extra_files", []):
+            self.extra_files_list.addItem(f)
+        
+        self.hidden_imports_list.clear()
+        for imp in settings.get("hidden_imports", []):
+            self.hidden_imports_list.addItem(imp)
+        
+        self.optimize_combo.setCurrentIndex(settings.get("optimize", 0))
+        self.upx_check.setChecked(settings.get("upx", False))
+        self.upx_level.setValue(settings.get("upx_level", 0))
+        self.extra_args.setText(settings.get("extra_args", ""))
+        self.validate_check.setChecked(settings.get("validate", True))
+        self.applied_profiles = list(settings.get("profiles", []))
+        self.update_applied_profiles_label()
+        self.auto_profiles_check.setChecked(settings.get("auto_profiles", True))
+        self.use_spec_check.setChecked(settings.get("use_spec", True))
+        self.spec_file.setText(settings.get("spec_file", ""))
+        self.analysis_cache_check.setChecked(settings.get("analysis_cache", False))
+        self.minimal_venv_check.setChecked(settings.get("minimal_venv", False))
+        self.venv_extra_packages.setText(settings.get("venv_extra_packages", ""))
+        self.pinned_packages.setText(settings.get("pinned_packages", ""))
+        self.binary_scan_check.setChecked(settings.get("binary_scan", False))
+        self.slim_modules_check.setChecked(settings.get("slim_modules", False))
+        self.scratch_build_check.setChecked(settings.get("scratch_build", False))
+        self.scratch_dir.setText(settings.get("scratch_dir", ""))
+        self.log_store_check.setChecked(settings.get("log_store", True))
+        self.prune_check.setChecked(settings.get("prune_payload", False))
+        self.prune_languages.setText(" ".join(settings.get("prune_languages", [])))
+        self.prune_keep.setText(" ".join(settings.get("prune_keep", [])))
+        self.payload_usage = settings.get("payload_usage") or {}
+        self.update_payload_usage_label()
+        self.import_profile_check.setChecked(settings.get("import_profile", False))
+        self.lazy_modules.setText(" ".join(settings.get("lazy_modules", [])))
+        self.trace_entry.setText(settings.get("trace_entry", ""))
+        self.trace_timeout.setValue(settings.get("trace_timeout", 20))
+        self.shared_runtime_check.setChecked(settings.get("shared_runtime", False))
+        self.runtime_layers_dir.setText(settings.get("runtime_layers_dir", ""))
+        self.delta_updates_check.setChecked(settings.get("delta_updates", False))
+        self.releases_dir.setText(settings.get("releases_dir", ""))
+        self.memory_limit.setValue(settings.get("memory_limit_mb", 0))
+        self.cpu_limit.setValue(settings.get("cpu_limit_seconds", 0))
+        self.admission_check.setChecked(settings.get("admission_control", True))
+        self.memory_budget.setValue(settings.get("memory_budget_mb", 0))
+        self.metrics_file.setText(settings.get("metrics_file", ""))
+        self.metrics_port.setValue(settings.get("metrics_port", 0))
+        self.backend_combo.setCurrentIndex(max(self.backend_combo.findData(settings.get("backend", "pyinstaller")), 0))
+        self.archive_combo.setCurrentIndex(max(self.archive_combo.findData(get_archive_mode(settings)), 0))
+        compare_backends = settings.get("compare_backends", list(BACKENDS))
+        for name, check in self.compare_checks.items():
+            check.setChecked(name in compare_backends)
+        compare_archive_modes = settings.get("compare_archive_modes", [])
+        for mode, check in self.compare_archive_checks.items():
+            check.setChecked(mode in compare_archive_modes)
+        self.compare_prune_check.setChecked(settings.get("compare_prune", False))
+        self.benchmark_command.setText(settings.get("benchmark_command", ""))
+        self.benchmark_runs.setValue(settings.get("benchmark_runs", 3))
+    
     def load_settings(self):
         """تحميل الإعدادات المحفوظة"""
-        if os.path.exists(SETTINGS_FILE):
-            try:
-                with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-                    self.settings = json.load(f)
-            except:
-                self.settings = {}
+        try:
+            self.settings.load()
+        except OSError as e:
+            print(f"⚠️ تعذر تحميل الإعدادات: {e}", file=sys.stderr)
     
     def save_settings(self):
-        """حفظ الإعدادات"""
-        try:
-            with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, ensure_ascii=False, indent=2)
-        except:
-            pass
+        """حفظ الإعدادات (التعديلات تُحفظ تلقائياً في الخلفية، وهذا يحفظ ما تبقى فوراً)"""
+        if not self.settings.flush():
+            print(f"⚠️ تعذر حفظ الإعدادات: {self.settings.error}", file=sys.stderr)
     
     def build_command(self):
         """بناء أمر PyInstaller"""
-        source = self.source_input.text()
-        
-        if not source or not os.path.isfile(source):
-            return None, "اختر ملف المصدر أولاً!"
-        
-        cmd = [sys.executable, "-m", "PyInstaller"]
-        
-        # الخيارات الأساسية
-        if self.onefile_check.isChecked():
-            cmd.append("--onefile")
-        
-        if self.windowed_check.isChecked():
-            cmd.append("--windowed")
-        
-        if self.noconsole_check.isChecked():
-            cmd.append("--noconsole")
-        
-        if self.clean_check.isChecked():
-            cmd.append("--clean")
-        
-        if self.noconfirm_check.isChecked():
-            cmd.append("--noconfirm")
-        
-        if self.strip_check.isChecked():
-            cmd.append("--strip")
-        
-        # اسم الملف
-        if self.output_name.text():
-            cmd.extend(["--name", self.output_name.text()])
-        
-        # الأيقونة
-        if self.icon_input.text() and os.path.isfile(self.icon_input.text()):
-            cmd.extend(["--icon", self.icon_input.text()])
-        
-        # مجلد الإخراج
-        if self.output_dir.text():
-            cmd.extend(["--distpath", os.path.join(self.output_dir.text(), "dist")])
-            cmd.extend(["--workpath", os.path.join(self.output_dir.text(), "build")])
-            cmd.extend(["--specpath", self.output_dir.text()])
-        
-        # الملفات الإضافية
-        sep = ";" if sys.platform == "win32" else ":"
-        for i in range(self.extra_files_list.count()):
-            path = self.extra_files_list.item(i).text()
-            if os.path.exists(path):
-                dest = os.path.basename(path)
-                cmd.extend(["--add-data", f"{path}{sep}{dest}"])
-        
-        # المكتبات المخفية
-        for i in range(self.hidden_imports_list.count()):
-            imp = self.hidden_imports_list.item(i).text()
-            cmd.extend(["--hidden-import", imp])
-        
-        # مستوى التحسين
-        opt_level = self.optimize_combo.currentIndex()
-        if opt_level > 0:
-            cmd.append(f"-O{opt_level}")
-        
-        # UPX
-        if self.upx_check.isChecked():
-            cmd.append("--upx-dir=upx")
-            if self.upx_level.value() > 0:
-                cmd.append(f"--upx-level={self.upx_level.value()}")
-        else:
-            cmd.append("--noupx")
-        
-        # أوامر إضافية
-        if self.extra_args.text():
-            cmd.extend(self.extra_args.text().split())
-        
-        # ملف المصدر
-        cmd.append(source)
-        
-        return cmd, None
+        return build_command_from_config(self.get_config())
     
     def start_conversion(self):
         """بدء عملية التحويل"""
-        cmd, error = self.build_command()
+        config, matched = resolve_profiles(self.get_config(), self.profiles)
+        cmd, error = build_command_from_config(config)
         
         if error:
             QMessageBox.warning(self, "تنبيه", error)
             return
         
-        # تحقق من تثبيت PyInstaller
-        try:
-            subprocess.run(
-                [sys.executable, "-m", "PyInstaller", "--version"],
-                capture_output=True, check=True
-            )
-        except:
-            self.log_output.append("📦 جاري تثبيت PyInstaller...")
-            try:
-                subprocess.run(
-                    [sys.executable, "-m", "pip", "install", "pyinstaller"],
-                    capture_output=True, check=True
-                )
-                self.log_output.append("✅ تم تثبيت PyInstaller بنجاح!")
-            except Exception as e:
-                QMessageBox.critical(self, "خطأ", f"فشل تثبيت PyInstaller:\n{str(e)}")
-                return
+        if matched:
+            self.log_output.append(f"📋 قوالب مطابقة لمكتبات المشروع: {', '.join(matched)}")
         
+        # تثبيت أداة التجميد في الخلفية عند غيابها أو اختلاف إصدارها عن المثبت للمشروع
+        # (وفحص إصدارها في الخلفية أيضاً إن لم يُعرف بعد)
+        backend = get_backend(config)
+        if is_bootstrap_needed(config, self.backend_versions.get(backend.name)):
+            self.pending_conversion = (config, cmd)
+            self.start_bootstrap(config)
+            return
+        self.continue_conversion(config, cmd)
+    
+    def continue_conversion(self, config, cmd):
+        """التحقق ثم تشغيل البناء (بعد التأكد من تثبيت أداة التجميد)"""
+        # التحقق قبل البناء في الخلفية
+        if config.get("validate", True):
+            self.convert_btn.setEnabled(False)
+            self.start_validation(
+                config,
+                lambda ok: self.start_build(config, cmd) if ok else self.convert_btn.setEnabled(True)
+            )
+            return
+        self.start_build(config, cmd)
+    
+    def start_build(self, config, cmd):
+        """تشغيل خيط البناء"""
         # تحديد مجلد العمل
-        work_dir = self.output_dir.text() or os.path.dirname(self.source_input.text())
+        work_dir = get_work_dir(config)
         
         # بدء التحويل
         self.convert_btn.setEnabled(False)
@@ -1150,17 +8249,104 @@ class MainWindow(QMainWindow):
         self.progress_bar.setValue(0)
         self.progress_bar.setFormat("%p% - جاري التحويل...")
         
-        self.conversion_thread = ConversionThread(cmd, work_dir)
+        self.clear_telemetry()
+        self.conversion_thread = ConversionThread(cmd, work_dir, config)
         self.conversion_thread.log_signal.connect(self.log_output.append)
         self.conversion_thread.progress_signal.connect(self.progress_bar.setValue)
+        self.conversion_thread.telemetry_signal.connect(self.on_telemetry)
         self.conversion_thread.finished_signal.connect(self.on_conversion_finished)
         self.conversion_thread.start()
     
+    def start_bootstrap(self, config):
+        """تثبيت أداة التجميد في الخلفية ثم متابعة التحويل"""
+        self.convert_btn.setEnabled(False)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setFormat(f"جاري تثبيت {get_backend(config).label}...")
+        
+        self.bootstrap_thread = BootstrapThread(config)
+        self.bootstrap_thread.log_signal.connect(self.log_output.append)
+        self.bootstrap_thread.finished_signal.connect(self.on_bootstrap_finished)
+        self.bootstrap_thread.start()
+    
+    def on_bootstrap_finished(self, success, message):
+        """بعد انتهاء التثبيت"""
+        self.convert_btn.setEnabled(True)
+        self.progress_bar.setFormat("%p%")
+        config, cmd = self.pending_conversion
+        self.pending_conversion = None
+        if not success:
+            QMessageBox.critical(
+                self, "خطأ", f"فشل تثبيت {get_backend(self.bootstrap_thread.config).label}:\n{message}"
+            )
+            return
+        self.backend_versions[get_backend(config).name] = message
+        self.continue_conversion(config, cmd)
+    
+    def start_validation(self, config, on_result):
+        """تشغيل التحقق قبل البناء في الخلفية ثم on_result(True/False) حسب وجود أخطاء"""
+        self.log_output.append("🔎 جاري التحقق من الإعدادات...")
+        thread = ValidationThread(config)
+        thread.finished_signal.connect(
+            lambda problems, timings: self.on_validation_finished(thread, problems, timings, on_result)
+        )
+        self.validation_threads.append(thread)
+        thread.start()
+    
+    def on_validation_finished(self, thread, problems, timings, on_result):
+        """عرض نتيجة التحقق"""
+        self.validation_threads.remove(thread)
+        errors = [msg for level, msg in problems if level == "error"]
+        for level, msg in problems:
+            self.log_output.append(f"{'❌' if level == 'error' else '⚠️'} {msg}")
+        self.log_output.append(
+            f"✅ اكتمل التحقق في {timings.get('total', 0):.2f} ث "
+            f"(فحص مفسر البناء {timings.get('probe', 0):.2f} ث، "
+            f"فحص الاستيراد الديناميكي {timings.get('scan', 0):.2f} ث) - "
+            f"{len(errors)} خطأ، {len(problems) - len(errors)} تحذير"
+        )
+        
+        if errors:
+            QMessageBox.critical(
+                self, "أخطاء في الإعدادات",
+                "تم إيقاف البناء بسبب الأخطاء التالية:\n\n" + "\n".join(f"• {e}" for e in errors)
+            )
+        on_result(not errors)
+    
     def cancel_conversion(self):
         """إلغاء عملية التحويل"""
-        if self.conversion_thread and self.conversion_thread.isRunning():
-            self.conversion_thread.cancel()
-            self.log_output.append("⚠️ جاري إلغاء العملية...")
+        for thread in (self.conversion_thread, self.compare_thread):
+            if thread and thread.isRunning():
+                thread.cancel()
+                self.log_output.append("⚠️ جاري إلغاء العملية...")
+    
+    def start_backend_compare(self):
+        """بناء المشروع بالأدوات المختارة ومقارنتها"""
+        config, matched = resolve_profiles(self.get_config(), self.profiles)
+        backends = config["compare_backends"]
+        if not config.get("source") or not os.path.isfile(config["source"]):
+            QMessageBox.warning(self, "تنبيه", "اختر ملف المصدر أولاً!")
+            return
+        if not backends:
+            QMessageBox.warning(self, "تنبيه", "اختر أداة واحدة على الأقل للمقارنة")
+            return
+        
+        self.convert_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(True)
+        self.progress_bar.setFormat("جاري مقارنة أدوات التجميد...")
+        
+        self.compare_thread = BackendCompareThread(
+            config, backends, config["benchmark_command"], config["benchmark_runs"],
+            config["compare_archive_modes"], [False, True] if config["compare_prune"] else None
+        )
+        self.compare_thread.log_signal.connect(self.log_output.append)
+        self.compare_thread.finished_signal.connect(self.on_compare_finished)
+        self.compare_thread.start()
+    
+    def on_compare_finished(self, success, message):
+        """عند انتهاء المقارنة"""
+        self.convert_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(False)
+        self.progress_bar.setFormat(("✅ " if success else "⚠️ ") + message)
     
     def on_conversion_finished(self, success, message):
         """عند انتهاء التحويل"""
@@ -1169,12 +8355,257 @@ class MainWindow(QMainWindow):
         
         if success:
             self.progress_bar.setFormat("✅ تم التحويل بنجاح!")
+            # اعتماد الإصدار لمرة واحدة فقط
+            self.release_check.setChecked(False)
             QMessageBox.information(self, "نجاح", message)
         else:
             self.progress_bar.setFormat("❌ فشل التحويل")
             if "إلغاء" not in message:
                 QMessageBox.critical(self, "خطأ", message)
     
+    def enqueue_config(self, config, name=None):
+        """إضافة إعدادات إلى الطابور بعد التحقق منها"""
+        config, matched = resolve_profiles(config, self.profiles)
+        cmd, error = build_command_from_config(config)
+        if error:
+            QMessageBox.warning(self, "تنبيه", error)
+            return
+        if config.get("validate", True):
+            self.start_validation(config, lambda ok: ok and self.add_queue_job(config, name))
+            return
+        self.add_queue_job(config, name)
+    
+    def add_queue_job(self, config, name=None):
+        """إضافة إعدادات تم التحقق منها إلى الطابور"""
+        job = self.build_queue.add(name or get_app_name(config), config, self.queue_priority.value())
+        self.log_output.append(f"🗂️ أُضيفت إلى الطابور: {job.name} (الأولوية {job.priority})")
+        self.refresh_queue_table()
+        self.schedule_queue()
+        return job
+    
+    def enqueue_current_config(self):
+        """إضافة الإعدادات الحالية إلى الطابور"""
+        self.enqueue_config(self.get_config())
+    
+    def enqueue_config_files(self):
+        """إضافة ملفات إعدادات محفوظة إلى الطابور"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "اختر ملفات الإعدادات", "", "JSON Files (*.json)"
+        )
+        for path in file_paths:
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            except (OSError, ValueError) as e:
+                self.log_output.append(f"❌ تعذر قراءة {path}: {str(e)}")
+                continue
+            self.enqueue_config(config, os.path.splitext(os.path.basename(path))[0])
+    
+    def start_repo_scan(self):
+        """فحص مستودع في الخلفية ثم عرض إضافة الإعدادات المولدة إلى الطابور"""
+        root = QFileDialog.getExistingDirectory(self, "اختر جذر المستودع", self.settings.get("last_scan_root", ""))
+        if not root:
+            return
+        out_dir = QFileDialog.getExistingDirectory(
+            self, "اختر مجلد ملفات الإعدادات المولدة", self.settings.get("last_scan_out", "")
+        )
+        if not out_dir:
+            return
+        self.settings["last_scan_root"] = root
+        self.settings["last_scan_out"] = out_dir
+        
+        self.log_output.append(f"🔎 جاري فحص {root}...")
+        self.scan_thread = RepoScanThread(root, out_dir, self.onefile_check.isChecked())
+        self.scan_thread.log_signal.connect(self.log_output.append)
+        self.scan_thread.finished_signal.connect(self.on_repo_scan_finished)
+        self.scan_thread.start()
+    
+    def on_repo_scan_finished(self, success, message):
+        summary = self.scan_thread.summary
+        if not success or not summary["configs"]:
+            return
+        answer = QMessageBox.question(
+            self, "فحص المستودع",
+            f"وُجدت {summary['entries']} نقطة دخول. إضافتها كلها إلى الطابور؟"
+        )
+        if answer != QMessageBox.Yes:
+            return
+        for name in summary["configs"]:
+            path = os.path.join(self.scan_thread.out_dir, f"{name}.json")
+            with open(path, 'r', encoding='utf-8') as f:
+                self.enqueue_config(json.load(f), name)
+    
+    def selected_queue_job(self):
+        """المهمة المحددة في الجدول"""
+        row = self.queue_table.currentRow()
+        if 0 <= row < len(self.build_queue.jobs):
+            return self.build_queue.jobs[row]
+        return None
+    
+    def move_queue_job(self, offset):
+        job = self.selected_queue_job()
+        if job:
+            self.build_queue.move(job, offset)
+            self.refresh_queue_table()
+            self.queue_table.selectRow(self.build_queue.jobs.index(job))
+            self.schedule_queue()
+    
+    def make_queue_job_urgent(self):
+        """رفع أولوية المهمة فوق كل المهام (تُزيح الأقل أولوية إن لزم)"""
+        job = self.selected_queue_job()
+        if job:
+            job.priority = max(j.priority for j in self.build_queue.jobs) + 1
+            job.held = False
+            self.refresh_queue_table()
+            self.schedule_queue()
+    
+    def hold_queue_job(self):
+        """إيقاف مهمة مؤقتاً بطلب المستخدم"""
+        job = self.selected_queue_job()
+        if job and job.status in ("queued", "running", "paused"):
+            job.held = True
+            if job.status == "running":
+                self.pause_queue_job(job)
+            self.refresh_queue_table()
+            self.schedule_queue()
+    
+    def release_queue_job(self):
+        """السماح للمجدول باستئناف المهمة"""
+        job = self.selected_queue_job()
+        if job and job.held:
+            job.held = False
+            self.refresh_queue_table()
+            self.schedule_queue()
+    
+    def cancel_queue_job(self):
+        job = self.selected_queue_job()
+        if not job:
+            return
+        if job.thread and job.thread.isRunning():
+            job.thread.cancel()
+        elif job.status in ("queued", "paused"):
+            job.status = "cancelled"
+            self.refresh_queue_table()
+    
+    def remove_queue_job(self):
+        job = self.selected_queue_job()
+        if not job:
+            return
+        if job.thread and job.thread.isRunning():
+            QMessageBox.warning(self, "تنبيه", "ألغِ المهمة الجارية أولاً")
+            return
+        self.build_queue.remove(job)
+        self.refresh_queue_table()
+    
+    def toggle_queue(self, running):
+        """تشغيل الطابور أو إيقاف بدء مهام جديدة (المهام الجارية تكمل)"""
+        self.queue_run_btn.setText("⏹ إيقاف الطابور" if running else "▶️ تشغيل الطابور")
+        self.schedule_queue()
+    
+    def schedule_queue(self):
+        """تطبيق قرارات المجدول"""
+        if not self.queue_run_btn.isChecked():
+            return
+        actions = self.build_queue.schedule(
+            self.queue_concurrency.value(), self.queue_preempt_check.isChecked()
+        )
+        for action, job in actions:
+            if action == "start":
+                self.start_queue_job(job)
+            elif action == "pause":
+                self.pause_queue_job(job)
+            elif action == "resume":
+                if job.thread.resume():
+                    job.status = "running"
+                else:
+                    # الذاكرة ما زالت محجوزة لبناء آخر: إعادة المحاولة لاحقاً
+                    self.log_output.append(f"[{job.name}] ⏳ لا تتوفر ذاكرة لاستئناف البناء بعد")
+                    QTimer.singleShot(ADMISSION_POLL_SECONDS * 1000, self.schedule_queue)
+        self.refresh_queue_table()
+    
+    def start_queue_job(self, job):
+        """بدء مهمة من الطابور في خيط مستقل"""
+        cmd, error = build_command_from_config(job.config)
+        if error:
+            job.status = "failed"
+            self.log_output.append(f"[{job.name}] ❌ {error}")
+            return
+        
+        job.status = "running"
+        job.started = time.perf_counter()
+        job.thread = ConversionThread(cmd, get_work_dir(job.config), job.config)
+        job.thread.preemptible = True
+        job.thread.log_signal.connect(lambda line, job=job: self.log_output.append(f"[{job.name}] {line}"))
+        job.thread.progress_signal.connect(lambda value, job=job: self.on_queue_job_progress(job, value))
+        job.thread.telemetry_signal.connect(self.on_telemetry)
+        job.thread.finished_signal.connect(
+            lambda success, message, job=job: self.on_queue_job_finished(job, success, message)
+        )
+        job.thread.start()
+    
+    def pause_queue_job(self, job):
+        try:
+            job.thread.suspend()
+        except OSError as e:
+            self.log_output.append(f"[{job.name}] ⚠️ تعذر الإيقاف المؤقت: {str(e)}")
+            return
+        job.status = "paused"
+    
+    def on_queue_job_progress(self, job, value):
+        job.progress = value
+        self.refresh_queue_table()
+    
+    def on_queue_job_finished(self, job, success, message):
+        job.seconds = time.perf_counter() - job.started
+        if success:
+            job.status = "done"
+            job.progress = 100
+        else:
+            job.status = "cancelled" if job.thread.is_cancelled else "failed"
+        self.refresh_queue_table()
+        self.schedule_queue()
+    
+    def refresh_queue_table(self):
+        """تحديث جدول الطابور"""
+        self.queue_table.setRowCount(len(self.build_queue.jobs))
+        for row, job in enumerate(self.build_queue.jobs):
+            status = JOB_STATUS_LABELS[job.status]
+            if job.held and job.status in ("queued", "paused"):
+                status += " (بطلبك)"
+            if job.seconds is not None:
+                duration = f"{job.seconds:.0f} ث"
+            elif job.started is not None:
+                duration = f"{time.perf_counter() - job.started:.0f} ث"
+            else:
+                duration = ""
+            for column, text in enumerate(
+                (f"#{job.id} {job.name}", str(job.priority), status, f"{job.progress}%", duration)
+            ):
+                self.queue_table.setItem(row, column, QTableWidgetItem(text))
+    
+    def running_queue_jobs(self):
+        return [job for job in self.build_queue.jobs if job.thread and job.thread.isRunning()]
+    
+    def clear_telemetry(self):
+        """مسح الرسوم المصغرة قبل بناء جديد"""
+        for key, line in self.telemetry_lines.items():
+            line.clear()
+            self.telemetry_labels[key].setText(f"{self.telemetry_labels[key].property('title')}: -")
+    
+    def on_telemetry(self, sample):
+        """عرض عينة قياس جديدة"""
+        mb = 1024 * 1024
+        io_rate = (sample["read_rate"] + sample["write_rate"]) / mb
+        values = {
+            "cpu": (sample["cpu_percent"], f"{sample['cpu_percent']:.0f}%"),
+            "memory": (sample["rss_bytes"] / mb, f"{sample['rss_bytes'] / mb:.0f} MB"),
+            "io": (io_rate, f"{io_rate:.1f} MB/s"),
+            "files": (sample["open_files"], str(sample["open_files"])),
+        }
+        for key, (value, text) in values.items():
+            self.telemetry_lines[key].add_value(value)
+            self.telemetry_labels[key].setText(f"{self.telemetry_labels[key].property('title')}: {text}")
+    
     def open_output_folder(self):
         """فتح مجلد الإخراج"""
         output_dir = self.output_dir.text() or os.path.dirname(self.source_input.text())
@@ -1188,25 +8619,26 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "تنبيه", "مجلد الإخراج غير موجود!")
             return
         
-        if sys.platform == "win32":
-            os.startfile(target)
-        elif sys.platform == "darwin":
-            subprocess.run(["open", target])
-        else:
-            subprocess.run(["xdg-open", target])
+        self.open_path(target)
     
     def closeEvent(self, event):
         """عند إغلاق النافذة"""
         self.save_settings()
-        if self.conversion_thread and self.conversion_thread.isRunning():
+        threads = [job.thread for job in self.running_queue_jobs()]
+        for thread in (self.conversion_thread, self.compare_thread):
+            if thread and thread.isRunning():
+                threads.append(thread)
+        if threads:
             reply = QMessageBox.question(
                 self, "تأكيد",
                 "هناك عملية تحويل جارية. هل تريد الإلغاء والخروج؟",
                 QMessageBox.Yes | QMessageBox.No
             )
             if reply == QMessageBox.Yes:
-                self.conversion_thread.cancel()
-                self.conversion_thread.wait()
+                for thread in threads:
+                    thread.cancel()
+                for thread in threads:
+                    thread.wait()
                 event.accept()
             else:
                 event.ignore()
@@ -1214,11 +8646,396 @@ class MainWindow(QMainWindow):
             event.accept()
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# سطر الأوامر
+# ═══════════════════════════════════════════════════════════════════════════════
+
+CLI_COMMANDS = (
+    "build", "compare", "import-profile", "bench", "bench-compare", "scan",
+    "prefetch", "scan-binaries", "apply-delta", "link-runtime"
+)
+
+
+def cli_build(args):
+    """بناء من ملف إعدادات محفوظ بدون واجهة"""
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    
+    if args.memory_limit is not None:
+        config["memory_limit_mb"] = args.memory_limit
+    if args.cpu_limit is not None:
+        config["cpu_limit_seconds"] = args.cpu_limit
+    if args.memory_budget is not None:
+        config["memory_budget_mb"] = args.memory_budget
+    if args.no_admission:
+        config["admission_control"] = False
+    if args.metrics_file:
+        config["metrics_file"] = args.metrics_file
+    if args.metrics_port:
+        config["metrics_port"] = args.metrics_port
+    if args.backend:
+        config["backend"] = args.backend
+    if args.archive_mode:
+        config["archive_mode"] = args.archive_mode
+    if args.scratch is not None:
+        config["scratch_build"] = True
+        config["scratch_dir"] = args.scratch
+    if args.release:
+        config["release"] = True
+    if args.prune or args.prune_trace:
+        config["prune_payload"] = True
+    if args.prune_languages:
+        config["prune_languages"] = args.prune_languages.split(",")
+    if args.prune_trace:
+        script = config.get("trace_entry") or config.get("source", "")
+        timeout = config.get("trace_timeout", 20)
+        print(f"🧪 جاري تشغيل {os.path.basename(script)} تحت التتبع (المهلة {timeout} ث)...")
+        try:
+            modules, files = trace_imports(sys.executable, script, timeout)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"❌ خطأ في التتبع: {str(e)}")
+            return 1
+        config["payload_usage"] = {"modules": sorted(modules), "files": sorted(files)}
+        print(f"   وحدات محمّلة: {len(modules)} - ملفات بيانات وإضافات: {len(files)}")
+    
+    config, matched = resolve_profiles(config)
+    if matched:
+        print(f"📋 قوالب مطابقة لمكتبات المشروع: {', '.join(matched)}")
+    
+    result = {}
+    bootstrap = BootstrapThread(config)
+    bootstrap.log_signal.connect(print)
+    bootstrap.finished_signal.connect(lambda success, message: result.update(success=success))
+    bootstrap.run()
+    if not result.get("success"):
+        return 1
+    
+    if config.get("validate", True):
+        problems = validate_config(config)
+        for level, msg in problems:
+            print(f"{'❌' if level == 'error' else '⚠️'} {msg}")
+        if any(level == "error" for level, msg in problems):
+            return 1
+    
+    cmd, error = build_command_from_config(config)
+    if error:
+        print(f"❌ {error}")
+        return 1
+    
+    result = {}
+    thread = ConversionThread(cmd, get_work_dir(config), config)
+    thread.log_signal.connect(print)
+    thread.finished_signal.connect(lambda success, message: result.update(success=success))
+    # التشغيل في الخيط الحالي مباشرة
+    thread.run()
+    return 0 if result.get("success") else 1
+
+
+def cli_compare(args):
+    """بناء المشروع بعدة أدوات تجميد ومقارنة مدة البناء والحجم وزمن التشغيل"""
+    with open(args.config, 'r', encoding='utf-8') as f:
+        config, matched = resolve_profiles(json.load(f))
+    
+    backends = args.backends.split(",") if args.backends else config.get("compare_backends") or list(BACKENDS)
+    unknown = [name for name in backends if name not in BACKENDS]
+    if unknown:
+        print(f"❌ أدوات غير معروفة: {', '.join(unknown)} (المتاح: {', '.join(BACKENDS)})")
+        return 1
+    
+    archive_modes = args.archive_modes.split(",") if args.archive_modes else config.get("compare_archive_modes")
+    unknown = [mode for mode in archive_modes or [] if mode not in ARCHIVE_MODES]
+    if unknown:
+        print(f"❌ أوضاع أرشيف غير معروفة: {', '.join(unknown)} (المتاح: {', '.join(ARCHIVE_MODES)})")
+        return 1
+    
+    thread = BackendCompareThread(
+        config, backends,
+        args.bench if args.bench is not None else config.get("benchmark_command", ""),
+        args.runs or config.get("benchmark_runs", 3),
+        archive_modes,
+        [False, True] if args.prune_variants or config.get("compare_prune") else None
+    )
+    thread.log_signal.connect(print)
+    thread.run()
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(thread.results, f, ensure_ascii=False, indent=2)
+    return 0 if thread.results and not any(r.get("error") for r in thread.results) else 1
+
+
+def cli_import_profile(args):
+    """تحليل تقرير زمن الاستيراد واقتراح الوحدات المؤجلة (وتوليد خطافها)"""
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    try:
+        report = load_import_profile(args.report)
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return 1
+    
+    styles = get_import_styles(config) if config.get("source") else {}
+    suggestions = suggest_lazy_modules(report, styles, args.threshold)
+    for line in format_import_profile(report, suggestions):
+        print(line)
+    lazy = [module for module, ms, lazy_ok in suggestions if lazy_ok]
+    
+    if args.hook and lazy:
+        with open(args.hook, 'w', encoding='utf-8') as f:
+            f.write(LAZY_IMPORT_HOOK.lstrip() % sorted(lazy))
+        print(f"📝 خطاف التأجيل: {args.hook} (أضفه بـ --runtime-hook)")
+    if args.apply and lazy and args.config:
+        config["lazy_modules"] = sorted(set(config.get("lazy_modules", [])) | set(lazy))
+        write_json_atomic(os.path.abspath(args.config), config)
+        print(f"✅ أُضيفت إلى lazy_modules في {args.config}")
+    return 0
+
+
+def cli_bench(args):
+    """قياس أداء مراحل المحوّل على مشاريع اصطناعية وحفظ النتائج"""
+    try:
+        sizes = [int(size) for size in args.sizes.split(",")]
+    except ValueError:
+        print(f"❌ أحجام غير صالحة: {args.sizes}")
+        return 1
+    variants = args.variants.split(",")
+    unknown = [name for name in variants if name not in BENCH_VARIANTS]
+    if unknown:
+        print(f"❌ حالات غير معروفة: {', '.join(unknown)} (المتاح: {', '.join(BENCH_VARIANTS)})")
+        return 1
+    
+    document = run_bench_suite(
+        sizes, variants, args.repeat, -1 if args.no_build else args.build_max,
+        os.path.abspath(args.workdir) if args.workdir else None, args.keep
+    )
+    output = os.path.abspath(args.output or f"bench-{datetime.now():%Y%m%d-%H%M%S}.json")
+    write_json_atomic(output, document)
+    print(f"💾 النتائج: {output}")
+    return 1 if any(result.get("error") for result in document["results"]) else 0
+
+
+def cli_bench_compare(args):
+    """مقارنة نتائج القياس بخط أساس محفوظ (رمز الخروج 1 عند التراجع)"""
+    baseline = read_json_file(args.baseline, None)
+    current = read_json_file(args.current, None)
+    if baseline is None or current is None:
+        print("❌ تعذرت قراءة ملفي النتائج")
+        return 1
+    
+    rows = compare_bench_results(baseline, current, args.tolerance, args.min_delta)
+    for line in format_bench_comparison(baseline, current, rows):
+        print(line)
+    return 1 if any(row[4] for row in rows) else 0
+
+
+def cli_scan(args):
+    """اكتشاف نقاط الدخول في مستودع وتوليد ملف إعدادات لكل منها"""
+    if not os.path.isdir(args.root):
+        print(f"❌ المجلد غير موجود: {args.root}")
+        return 1
+    summary = scan_repository(args.root, args.out, args.workers, not args.onedir)
+    for line in format_scan_report(summary, os.path.abspath(args.out)):
+        print(line)
+    return 0
+
+
+def cli_prefetch(args):
+    """ملء مخزن الحزم مسبقاً (للأجهزة الجديدة والأجهزة دون شبكة)"""
+    config = {}
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    
+    packages = get_pinned_packages(config) + list(args.packages)
+    if config.get("source"):
+        config, matched = resolve_profiles(config)
+        packages = apply_pins(
+            packages + resolve_requirements(config, sys.executable)["requirements"],
+            config.get("pinned_packages", "").split()
+        )
+    
+    print(f"📥 تنزيل {len(packages)} حزمة إلى {args.wheelhouse}")
+    code = prefetch_wheels(sys.executable, packages, print, wheelhouse=args.wheelhouse)
+    print("✅ اكتمل ملء مخزن الحزم" if code == 0 else "❌ فشل تنزيل بعض الحزم")
+    return code
+
+
+def cli_scan_binaries(args):
+    """فحص المكتبات الثنائية لمشروع أو لمجلدات محددة"""
+    started = time.perf_counter()
+    scanner = BinaryDependencyScanner()
+    if args.config:
+        with open(args.config, 'r', encoding='utf-8') as f:
+            config, matched = resolve_profiles(json.load(f))
+        roots = get_binary_scan_roots(config, sys.executable)
+    else:
+        roots = []
+    report = scanner.scan(roots + list(args.paths))
+    scanner.save()
+    
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        for line in format_binary_report(report, scanner, time.perf_counter() - started):
+            print(line)
+    return 1 if report["missing"] else 0
+
+
+def cli_apply_delta(args):
+    """تطبيق حزمة تحديث تفاضلية على مجلد تطبيق"""
+    try:
+        updated, removed = apply_delta(args.app_dir, args.delta)
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        print(f"❌ {e}")
+        return 1
+    print(f"✅ تم التحديث: {updated} ملف معدل، {removed} ملف محذوف")
+    return 0
+
+
+def cli_link_runtime(args):
+    """تركيب مجلد تطبيق من طبقة التشغيل المشتركة"""
+    linked, missing = link_runtime_layer(args.app_dir, args.layers_dir)
+    print(f"✅ تم ربط {linked} ملف من طبقة التشغيل")
+    for rel in missing:
+        print(f"❌ ملف مفقود من الطبقة: {rel}")
+    return 1 if missing else 0
+
+
+def run_cli(argv):
+    """تشغيل أوامر سطر الأوامر (بدون واجهة)"""
+    parser = argparse.ArgumentParser(prog="python_to_exe", description=APP_NAME)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    build_parser = subparsers.add_parser("build", help="بناء من ملف إعدادات محفوظ")
+    build_parser.add_argument("config", help="ملف الإعدادات (JSON)")
+    build_parser.add_argument("--memory-limit", type=int, default=None, help="حد الذاكرة المقيمة (RSS) لعمليات البناء بالميغابايت")
+    build_parser.add_argument("--cpu-limit", type=int, default=None, help="حد وقت المعالج بالثواني")
+    build_parser.add_argument("--memory-budget", type=int, default=None,
+                              help="ميزانية ذاكرة الجهاز لكل البناءات المتزامنة")
+    build_parser.add_argument("--no-admission", action="store_true", help="البدء فوراً دون انتظار الذاكرة")
+    build_parser.add_argument("--metrics-file", default=None,
+                              help="ملف مقاييس بصيغة Prometheus يُحدَّث أثناء البناء")
+    build_parser.add_argument("--metrics-port", type=int, default=None,
+                              help="نقطة HTTP للمقاييس على 127.0.0.1:<المنفذ>/metrics")
+    build_parser.add_argument("--backend", choices=list(BACKENDS), default=None, help="أداة التجميد")
+    build_parser.add_argument("--archive-mode", choices=list(ARCHIVE_MODES), default=None,
+                              help="طريقة تخزين الوحدات: ضغط للحجم أو دون ضغط لسرعة البدء")
+    build_parser.add_argument("--scratch", nargs="?", const="", default=None, metavar="DIR",
+                              help="البناء في مجلد تجهيز محلي (tmpfs افتراضياً) ثم نقل الناتج")
+    build_parser.add_argument("--release", action="store_true",
+                              help="اعتماد الناتج إصداراً منشوراً تُبنى منه حزم التحديث التالية")
+    build_parser.add_argument("--prune", action="store_true",
+                              help="حذف إضافات Qt والترجمات وملفات البيانات غير المستخدمة")
+    build_parser.add_argument("--prune-languages", default=None,
+                              help="لغات ترجمات Qt التي تبقى (مفصولة بفواصل، افتراضياً ar,en)")
+    build_parser.add_argument("--prune-trace", action="store_true",
+                              help="تشغيل البرنامج تحت التتبع أولاً وإبقاء كل ما يستخدمه (يتضمن --prune)")
+    build_parser.set_defaults(func=cli_build)
+    
+    compare_parser = subparsers.add_parser(
+        "compare", help="مقارنة أدوات التجميد (مدة البناء، الحجم، زمن التشغيل)"
+    )
+    compare_parser.add_argument("config", help="ملف الإعدادات (JSON)")
+    compare_parser.add_argument("--backends", default=None,
+                                help=f"قائمة مفصولة بفواصل من: {','.join(BACKENDS)}")
+    compare_parser.add_argument("--bench", default=None,
+                                help="معاملات للبرنامج الناتج، أو أمر يحتوي {exe}")
+    compare_parser.add_argument("--archive-modes", default=None,
+                                help=f"مقارنة أوضاع الأرشيف أيضاً (مفصولة بفواصل من: {','.join(ARCHIVE_MODES)})")
+    compare_parser.add_argument("--prune-variants", action="store_true",
+                                help="بناء كل تركيبة مع تقليم الملحقات ودونه")
+    compare_parser.add_argument("--runs", type=int, default=None, help="عدد مرات قياس التشغيل")
+    compare_parser.add_argument("--json", default=None, help="حفظ النتائج في ملف JSON")
+    compare_parser.set_defaults(func=cli_compare)
+    
+    profile_parser = subparsers.add_parser(
+        "import-profile", help="تحليل تقرير زمن الاستيراد من بناء تشخيصي"
+    )
+    profile_parser.add_argument("report", help="ملف .importtime.json")
+    profile_parser.add_argument("--config", default=None, help="ملف إعدادات المشروع (لمعرفة طريقة الاستيراد)")
+    profile_parser.add_argument("--threshold", type=float, default=LAZY_SUGGEST_THRESHOLD_MS,
+                                help="أقل زمن تراكمي (ms) لاقتراح التأجيل")
+    profile_parser.add_argument("--hook", default=None, help="كتابة خطاف تشغيل مستقل يؤجل الوحدات المقترحة")
+    profile_parser.add_argument("--apply", action="store_true", help="إضافة الوحدات المقترحة إلى ملف الإعدادات")
+    profile_parser.set_defaults(func=cli_import_profile)
+    
+    bench_parser = subparsers.add_parser(
+        "bench", help="قياس أداء مراحل المحوّل على مشاريع اصطناعية (دون شبكة)"
+    )
+    bench_parser.add_argument("--sizes", default=",".join(str(size) for size in BENCH_SIZES),
+                              help="أعداد الوحدات المحلية مفصولة بفواصل")
+    bench_parser.add_argument("--variants", default=",".join(BENCH_VARIANTS),
+                              help=f"قائمة مفصولة بفواصل من: {','.join(BENCH_VARIANTS)}")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="تكرار المراحل السريعة (يؤخذ الأقل)")
+    bench_parser.add_argument("--build-max", type=int, default=1000,
+                              help="أكبر عدد وحدات يُقاس له البناء الكامل")
+    bench_parser.add_argument("--no-build", action="store_true", help="دون بناء بارد ودافئ")
+    bench_parser.add_argument("--workdir", default=None, help="مجلد المشاريع الاصطناعية (يُحتفظ به)")
+    bench_parser.add_argument("--keep", action="store_true", help="عدم حذف المجلد المؤقت")
+    bench_parser.add_argument("--output", default=None, help="ملف النتائج (JSON)")
+    bench_parser.set_defaults(func=cli_bench)
+    
+    bench_compare_parser = subparsers.add_parser(
+        "bench-compare", help="مقارنة نتائج القياس بخط أساس وكشف التراجع"
+    )
+    bench_compare_parser.add_argument("baseline", help="نتائج خط الأساس (JSON)")
+    bench_compare_parser.add_argument("current", help="النتائج الحالية (JSON)")
+    bench_compare_parser.add_argument("--tolerance", type=float, default=0.2,
+                                      help="الزيادة النسبية المسموحة (0.2 = 20%%)")
+    bench_compare_parser.add_argument("--min-delta", type=float, default=BENCH_MIN_DELTA_SECONDS,
+                                      help="أقل فرق بالثواني يُعد تراجعاً")
+    bench_compare_parser.set_defaults(func=cli_bench_compare)
+    
+    repo_parser = subparsers.add_parser(
+        "scan", help="اكتشاف نقاط الدخول في مستودع وتوليد ملف إعدادات لكل منها"
+    )
+    repo_parser.add_argument("root", help="جذر المستودع")
+    repo_parser.add_argument("--out", required=True, help="مجلد ملفات الإعدادات المولدة")
+    repo_parser.add_argument("--workers", type=int, default=None, help="عدد خيوط الفحص")
+    repo_parser.add_argument("--onedir", action="store_true", help="مجلد بدل ملف واحد")
+    repo_parser.set_defaults(func=cli_scan)
+    
+    prefetch_parser = subparsers.add_parser(
+        "prefetch", help="تنزيل PyInstaller ومتطلبات المشروع إلى مخزن الحزم المحلي"
+    )
+    prefetch_parser.add_argument("packages", nargs="*", help="حزم إضافية")
+    prefetch_parser.add_argument("--config", default=None, help="ملف إعدادات مشروع (لإصداراته ومتطلباته)")
+    prefetch_parser.add_argument("--wheelhouse", default=WHEELHOUSE_DIR, help="مجلد مخزن الحزم")
+    prefetch_parser.set_defaults(func=cli_prefetch)
+    
+    scan_parser = subparsers.add_parser(
+        "scan-binaries", help="فحص الاعتماديات الثنائية (المكتبات المفقودة والمكررة)"
+    )
+    scan_parser.add_argument("paths", nargs="*", help="مجلدات أو ملفات ثنائية")
+    scan_parser.add_argument("--config", default=None, help="ملف إعدادات مشروع (لفحص حزمه الخارجية)")
+    scan_parser.add_argument("--json", action="store_true", help="طباعة التقرير والرسم بصيغة JSON")
+    scan_parser.set_defaults(func=cli_scan_binaries)
+    
+    delta_parser = subparsers.add_parser("apply-delta", help="تطبيق حزمة تحديث تفاضلية")
+    delta_parser.add_argument("app_dir", help="مجلد التطبيق")
+    delta_parser.add_argument("delta", help="حزمة التحديث (.zip)")
+    delta_parser.set_defaults(func=cli_apply_delta)
+    
+    link_parser = subparsers.add_parser(
+        "link-runtime", help="تركيب مجلد تطبيق من طبقة التشغيل المشتركة"
+    )
+    link_parser.add_argument("app_dir", help="مجلد التطبيق الذي يحتوي البيان")
+    link_parser.add_argument("--layers-dir", default=None, help="مجلد الطبقات")
+    link_parser.set_defaults(func=cli_link_runtime)
+    
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # نقطة البداية
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] in CLI_COMMANDS:
+        sys.exit(run_cli(sys.argv[1:]))
+    
     # ═══ دعم الشاشات عالية الدقة ═══
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)